@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: custo por avaliação de uma atribuição usando `subs` do sympy
+versus a função gerada por `src.sti.compiler`.
+
+Uso: python -m scripts.bench_compiler
+"""
+import timeit
+from itertools import product
+
+from src.sti.parser import parse_raw
+from src.sti.compiler import compile_expr
+from src.sti.bitparallel import get_variables
+
+EXPRESSOES = [
+    'A*B + ~A*C + B*C',
+    '~( (A+B) * C )',
+    'A*~B*~C + ~A*~B*~C + ~A*B*~C + ~A*~B*C',
+    'A*B*C + A*B*D + A*C*D + B*C*D',
+]
+
+def medir(expr, repeticoes=5):
+    variables = get_variables(expr)
+    linhas = list(product((False, True), repeat=len(variables)))
+    contextos = [dict(zip(variables, bits)) for bits in linhas]
+    f_tupla = compile_expr(expr, variables)
+    f_int = compile_expr(expr, variables, mode='int')
+    indices = range(len(linhas))
+
+    t_subs = min(timeit.repeat(lambda: [bool(expr.subs(c)) for c in contextos], number=1, repeat=repeticoes))
+    t_tupla = min(timeit.repeat(lambda: [f_tupla(b) for b in linhas], number=200, repeat=repeticoes)) / 200
+    t_int = min(timeit.repeat(lambda: [f_int(i) for i in indices], number=200, repeat=repeticoes)) / 200
+
+    n = len(linhas)
+    return t_subs / n, t_tupla / n, t_int / n
+
+def main():
+    print(f"{'expressão':<45} {'subs (µs)':>10} {'tupla (µs)':>11} {'int (µs)':>9} {'ganho':>8}")
+    for s in EXPRESSOES:
+        expr = parse_raw(s)
+        t_subs, t_tupla, t_int = medir(expr)
+        ganho = t_subs / min(t_tupla, t_int)
+        print(f"{s:<45} {t_subs * 1e6:>10.2f} {t_tupla * 1e6:>11.3f} {t_int * 1e6:>9.3f} {ganho:>7.0f}x")
+
+if __name__ == '__main__':
+    main()
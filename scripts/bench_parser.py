@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parser próprio (`parse_raw`) versus o caminho antigo via
+`parse_expr` do sympy (`parse_raw_sympy`), nas expressões do banco de questões.
+
+Mede a análise até a árvore sympy e, separadamente, só até a árvore leve.
+
+Uso: python -m scripts.bench_parser
+"""
+import time
+import warnings
+
+from src.sti.parser import parse, parse_raw, parse_raw_sympy
+from src.sti.tutor import QUESTOES_CALIBRACAO
+
+REPETICOES = 20
+
+# Mesmas formas do banco de questões, com a notação alternativa do projeto
+EXPRESSOES = [q[k] for q in QUESTOES_CALIBRACAO for k in ("expressao", "solucao")] + [
+    "A*B + A*~C + B*C",
+    "A*~B*~C + ~A*~B*~C + ~A*B*~C + ~A*~B*C",
+    "(A+B)*(A+C)*(B+C) + ~A*~B*~C",
+    "~(A+B) + ~(A+~B)",
+    "A·B + ¬A·C + B·C",
+    "A.B.C.D + A.B.C.ˉD",
+    "AB + ~AC + BC",
+    "(A+B)(A+C)",
+]
+
+def cronometrar(func, entradas):
+    t0 = time.perf_counter()
+    for _ in range(REPETICOES):
+        for s in entradas:
+            func(s)
+    return (time.perf_counter() - t0) / (REPETICOES * len(entradas))
+
+def main():
+    warnings.filterwarnings("ignore")
+    antigas = []
+    for s in EXPRESSOES:
+        try:
+            parse_raw_sympy(s)
+            antigas.append(s)
+        except Exception:
+            pass
+
+    print(f"{len(EXPRESSOES)} expressões ({len(antigas)} aceitas pelo caminho antigo), {REPETICOES} repetições")
+    t_antigo = cronometrar(parse_raw_sympy, antigas)
+    # `parse` guarda as árvores recentes e a conversão fica memoizada no nó,
+    # então a 1ª passada (cache vazio) mede o custo sem reaproveitamento
+    parse.cache_clear()
+    t0 = time.perf_counter()
+    for s in antigas:
+        parse(s).to_sympy()
+    t_frio = (time.perf_counter() - t0) / len(antigas)
+    t_novo = cronometrar(parse_raw, antigas)
+    t_arvore = cronometrar(lambda s: parse.__wrapped__(s), antigas)
+
+    print(f"{'caminho':<28} {'µs/expr':>10} {'ganho':>8}")
+    for nome, t in (("parse_expr (sympy)", t_antigo), ("parse_raw (1ª vez)", t_frio),
+                    ("parse_raw (repetida)", t_novo), ("parse (só árvore leve)", t_arvore)):
+        print(f"{nome:<28} {t * 1e6:>10.1f} {t_antigo / t:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: verificação de equivalência por busca exaustiva (máscara de bits)
+versus o solver SAT (Tseitin + CDCL) de `src.sti.sat`.
+
+Cada instância tem k blocos  a_i + b_i*c_i  (3k variáveis) e compara o produto
+dos blocos com sua forma distribuída (a_i + b_i)*(a_i + c_i). A versão "erro"
+troca um c_i por ~c_i, tornando as expressões diferentes.
+
+Uso: python -m scripts.bench_sat
+"""
+import time
+
+from sympy import symbols, And, Or, Not
+
+from src.sti.counterexample import find_counterexample
+
+# A busca exaustiva fica impraticável depressa; acima disso só o SAT é medido
+LIMITE_EXAUSTIVO = 24
+
+def instancia(k, com_erro=False):
+    a = symbols(f'a0:{k}')
+    b = symbols(f'b0:{k}')
+    c = symbols(f'c0:{k}')
+    e1 = And(*[Or(a[i], And(b[i], c[i])) for i in range(k)])
+    c_troca = [Not(c[i]) if com_erro and i == k - 1 else c[i] for i in range(k)]
+    e2 = And(*[And(Or(a[i], b[i]), Or(a[i], c_troca[i])) for i in range(k)])
+    return e1, e2
+
+def cronometrar(func):
+    t0 = time.perf_counter()
+    res = func()
+    return res, time.perf_counter() - t0
+
+def main():
+    print(f"{'vars':>5} {'caso':<12} {'exaustivo (s)':>14} {'SAT (s)':>9}")
+    for k in (3, 5, 7, 8, 10, 15, 20):
+        for com_erro in (False, True):
+            e1, e2 = instancia(k, com_erro)
+            n = 3 * k
+            ce_sat, t_sat = cronometrar(lambda: find_counterexample(e1, e2, backend='sat'))
+            if n <= LIMITE_EXAUSTIVO:
+                ce_ex, t_ex = cronometrar(lambda: find_counterexample(e1, e2, backend='bitmask'))
+                assert (ce_ex is None) == (ce_sat is None)
+                t_ex_str = f"{t_ex:.4f}"
+            else:
+                t_ex_str = "-"
+            caso = "diferentes" if com_erro else "equivalentes"
+            print(f"{n:>5} {caso:<12} {t_ex_str:>14} {t_sat:>9.4f}")
+
+if __name__ == '__main__':
+    main()
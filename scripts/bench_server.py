@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark do serviço HTTP (`src.sti.server`) com clientes locais concorrentes.
+
+Sobe o servidor numa porta livre do loopback, com um banco temporário, e
+dispara requisições de várias conexões ao mesmo tempo: parse, simplify,
+equivalence e truth_table (todas começam pela mesma expressão pesada, para
+exercitar a coalescência) e uma rodada do tutor por cliente. No fim imprime a
+vazão e a tabela de latências de /metrics.
+
+Uso: python -m scripts.bench_server [--clientes 16] [--requisicoes 40] [--workers N]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from src.sti import database
+from src.sti.server import Cliente, Servidor
+
+VARIAVEIS = "ABCDEFGH"
+# Mesma expressão para todos no início: os cálculos simultâneos viram um só
+PESADA = " + ".join(f"{a}*~{b}*{c}" for a, b, c in zip(VARIAVEIS, VARIAVEIS[1:] + "A", VARIAVEIS[2:] + "AB"))
+
+def expressao_aleatoria(rng):
+    termos = []
+    for _ in range(rng.randint(2, 6)):
+        literais = rng.sample(VARIAVEIS[:6], rng.randint(2, 4))
+        termos.append("*".join(rng.choice(["", "~"]) + v for v in literais))
+    return " + ".join(termos)
+
+async def cliente(servidor, numero, requisicoes, contagem):
+    rng = random.Random(numero)
+    async with Cliente(servidor.host, servidor.porta) as c:
+        status, _ = await c.post("/simplify", {"expr": PESADA})
+        contagem[status] = contagem.get(status, 0) + 1
+        for i in range(requisicoes):
+            rota = ("/parse", "/simplify", "/equivalence", "/truth_table")[i % 4]
+            corpo = {"expr": expressao_aleatoria(rng)}
+            if rota == "/equivalence":
+                corpo["expr2"] = expressao_aleatoria(rng)
+            status, _ = await c.post(rota, corpo)
+            contagem[status] = contagem.get(status, 0) + 1
+
+        # Uma questão do tutor: pede, dá um passo qualquer e desiste
+        usuario = f"bench-{numero}"
+        status, proxima = await c.post("/tutor/proxima", {"usuario": usuario})
+        contagem[status] = contagem.get(status, 0) + 1
+        questao = proxima.get("questao")
+        if questao:
+            for passo in (questao["expressao"], "desisto"):
+                status, _ = await c.post("/tutor/passo", {"usuario": usuario, "questao_id": questao["id"],
+                                                          "passo": passo})
+                contagem[status] = contagem.get(status, 0) + 1
+
+async def executar(clientes, requisicoes, workers):
+    servidor = Servidor(porta=0, workers=workers)
+    await servidor.iniciar()
+    try:
+        contagem = {}
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente(servidor, n, requisicoes, contagem) for n in range(clientes)))
+        segundos = time.perf_counter() - inicio
+        async with Cliente(servidor.host, servidor.porta) as c:
+            _, metricas = await c.get("/metrics")
+    finally:
+        await servidor.encerrar()
+
+    total = sum(contagem.values())
+    print(f"{total} requisições de {clientes} clientes em {segundos:.2f}s ({total / segundos:.1f} req/s); "
+          f"status: {dict(sorted(contagem.items()))}")
+    print(f"\n{'rota':<16}{'total':>7}{'erros':>7}{'coalesc.':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for rota, m in metricas["rotas"].items():
+        print(f"{rota:<16}{m['total']:>7}{m['erros']:>7}{m['coalescidas']:>10}"
+              f"{m['p50_ms']:>10.1f}{m['p90_ms']:>10.1f}{m['p99_ms']:>10.1f}{m['max_ms']:>10.1f}")
+    print(f"\npool: {metricas['pool']}")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--clientes", type=int, default=16)
+    ap.add_argument("--requisicoes", type=int, default=40, help="requisições do motor por cliente")
+    ap.add_argument("-w", "--workers", type=int, help="processos do motor (padrão: um por núcleo)")
+    args = ap.parse_args()
+
+    # Banco temporário: os usuários do benchmark não entram no histórico real
+    with tempfile.TemporaryDirectory() as pasta:
+        database.DB_NAME = os.path.join(pasta, "bench_server.db")
+        asyncio.run(executar(args.clientes, args.requisicoes, args.workers))
+
+if __name__ == "__main__":
+    main()
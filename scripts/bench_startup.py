@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização da CLI: tempo de `import src.sti.tutor` medido com
+`python -X importtime`, em processos novos.
+
+Serve também de guarda contra regressões: termina com código 1 se algum módulo
+pesado (sympy, numpy, pandas, sklearn, joblib) voltar a ser importado na carga
+do tutor ou se o tempo passar do limite.
+
+Uso: python -m scripts.bench_startup [--limite-ms 250]
+"""
+import argparse
+import subprocess
+import sys
+
+MODULO = "src.sti.tutor"
+PESADOS = ("sympy", "numpy", "pandas", "sklearn", "joblib")
+EXECUCOES = 5
+LIMITE_MS = 250
+
+def medir_importacao(modulo):
+    """Retorna (tempo cumulativo em µs por módulo de topo, conjunto de módulos importados)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True, check=True,
+    )
+    tempos, modulos = {}, set()
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        campos = linha[len("import time:"):].split("|")
+        cumulativo, nome = int(campos[1]), campos[2].rstrip()
+        modulos.add(nome.strip())
+        # Os submódulos vêm indentados sob quem os importou
+        if not nome.startswith("   "):
+            tempos[nome.strip()] = cumulativo
+    return tempos, modulos
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--limite-ms", type=float, default=LIMITE_MS)
+    args = ap.parse_args()
+
+    medidas = []
+    for _ in range(EXECUCOES):
+        tempos, modulos = medir_importacao(MODULO)
+        medidas.append(tempos[MODULO] / 1000)
+    melhor = min(medidas)
+
+    # Referência: o custo de carregar o motor de uma vez (o que a CLI pagava antes)
+    motor, _ = medir_importacao("src.sti.result_cache")
+    print(f"import {MODULO}: melhor {melhor:.1f} ms, pior {max(medidas):.1f} ms ({EXECUCOES} execuções)")
+    print(f"import do motor (src.sti.result_cache): {motor['src.sti.result_cache'] / 1000:.1f} ms")
+
+    falhas = []
+    carregados = sorted(p for p in PESADOS if any(m == p or m.startswith(p + ".") for m in modulos))
+    if carregados:
+        falhas.append(f"módulos pesados importados na inicialização: {', '.join(carregados)}")
+    if melhor > args.limite_ms:
+        falhas.append(f"{melhor:.1f} ms acima do limite de {args.limite_ms:.0f} ms")
+    for falha in falhas:
+        print(f"REGRESSÃO: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Gera src/sti/sop_table.bin: a soma de produtos mínima e o log de combinações de
+todas as funções booleanas de 1 a 4 variáveis, consultada pelo `simplify`.
+
+Uso: python -m scripts.build_sop_table
+"""
+import os
+import time
+
+from src.sti.sop_table import build_table, TABLE_PATH
+
+def main():
+    t0 = time.perf_counter()
+    build_table()
+    print(f"Tabela gravada em {TABLE_PATH} ({os.path.getsize(TABLE_PATH)} bytes) "
+          f"em {time.perf_counter() - t0:.1f} s.")
+
+if __name__ == '__main__':
+    main()
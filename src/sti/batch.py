@@ -0,0 +1,244 @@
+# Arquivo: src/sti/batch.py
+# Modo em lote, sem interação: lê jobs JSONL (arquivo ou stdin) e escreve um
+# resultado JSONL por job, na mesma ordem, conforme vão ficando prontos.
+#
+# Um job por linha:
+#   {"id": 1, "op": "simplify", "expr": "A*B + A*~B"}
+#   {"id": 2, "op": "equivalence", "expr": "A + A*B", "expr2": "A"}
+#   {"id": 3, "op": "truth_table", "expr": "A*~B + ~A*B"}      (expr2 opcional)
+#   {"id": 4, "op": "parse", "expr": "A(B + ~C)"}              (forma canônica)
+# A entrada é lida linha a linha e nunca inteira na memória. Ao final, o total
+# de jobs e a vazão (expressões por segundo) vão para stderr. Com --workers ou
+# --timeout os jobs rodam em paralelo (ver executor.py).
+#
+# Uso: python -m src.sti.batch [entrada.jsonl] [-o saida.jsonl] [--cache]
+#          [--workers N] [--timeout S] [--chunk N] [--ordem entrada|conclusao]
+
+import argparse
+import json
+import sys
+import time
+
+OPERACOES = ('parse', 'simplify', 'equivalence', 'truth_table')
+
+# Tabelas-verdade: máscaras até TABELA_MAX_VARS variáveis, linhas explícitas até TABELA_LINHAS_MAX_VARS
+TABELA_MAX_VARS = 20
+TABELA_LINHAS_MAX_VARS = 10
+
+
+class JobError(ValueError):
+    """Job mal formado (JSON inválido, operação desconhecida, campo faltando)."""
+
+
+def _ms(inicio):
+    return round((time.perf_counter() - inicio) * 1000, 3)
+
+
+def _parse_job(job):
+    from .parser import parse_raw
+
+    op = job.get('op')
+    if op not in OPERACOES:
+        raise JobError(f"Operação desconhecida: {op!r} (use {', '.join(OPERACOES)}).")
+    if not isinstance(job.get('expr'), str):
+        raise JobError("Campo 'expr' ausente.")
+    if op == 'equivalence' and not isinstance(job.get('expr2'), str):
+        raise JobError("Campo 'expr2' ausente.")
+    exprs = [parse_raw(job['expr'])]
+    if isinstance(job.get('expr2'), str):
+        exprs.append(parse_raw(job['expr2']))
+    return op, exprs
+
+
+def _parse(expr):
+    from .formatter import format_expr
+    from .bitparallel import get_variables
+    return {"expressao": format_expr(expr), "variaveis": [str(v) for v in get_variables(expr)]}
+
+
+def _simplify(expr, usar_cache):
+    from .formatter import format_expr
+    if usar_cache:
+        from .result_cache import simplify_cached
+        result = simplify_cached(expr)
+    else:
+        from .simplifier import simplify
+        result = simplify(expr)
+    if "steps" in result:
+        return {"final_sop": format_expr(result["final_sop"]), "metodo": "constante", "exato": True}
+    return {"final_sop": format_expr(result["final_sop"]), "metodo": result["method"],
+            "exato": result["exact"], "variaveis": [str(v) for v in result["variables"]]}
+
+
+def _equivalence(e1, e2, usar_cache):
+    if usar_cache:
+        from .result_cache import find_counterexample_cached as buscar
+    else:
+        from .counterexample import find_counterexample as buscar
+    ce = buscar(e1, e2)
+    contraexemplo = None if ce is None else {str(v): int(bool(val)) for v, val in sorted(ce.items(), key=lambda kv: str(kv[0]))}
+    return {"equivalentes": ce is None, "contraexemplo": contraexemplo}
+
+
+def _truth_table(exprs):
+    from .truth_table import truth_table_masks, iter_truth_table
+    from .bitparallel import get_variables
+
+    num_vars = len(get_variables(*exprs))
+    if num_vars > TABELA_MAX_VARS:
+        raise JobError(f"Tabela-verdade com {num_vars} variáveis (máximo {TABELA_MAX_VARS}).")
+    variables, header, masks = truth_table_masks(*exprs)
+    res = {"colunas": header, "variaveis": [str(v) for v in variables],
+           "mascaras": [hex(m) for m in masks]}
+    if num_vars <= TABELA_LINHAS_MAX_VARS:
+        # Mesma ordem da tabela impressa (V antes de F)
+        res["linhas"] = [[int(v) for v in row] for row in iter_truth_table(*exprs)]
+    return res
+
+
+def carregar_motor(usar_cache=False):
+    """Importa o motor antes de medir: a carga do sympy não entra na vazão nem no 1º job."""
+    from . import parser, formatter, simplifier, counterexample, truth_table  # noqa: F401
+    if usar_cache:
+        from . import result_cache  # noqa: F401
+
+
+def run_job(job, usar_cache=False):
+    """
+    Executa um job (dict já decodificado) e retorna o dict de resultado. Erros do
+    job viram {"ok": false, "erro": ...}; nunca levanta para o chamador.
+    """
+    inicio = time.perf_counter()
+    saida = {"id": job.get('id') if isinstance(job, dict) else None}
+    try:
+        if not isinstance(job, dict):
+            raise JobError("O job deve ser um objeto JSON.")
+        op, exprs = _parse_job(job)
+        saida["op"] = op
+        t_parse = _ms(inicio)
+        inicio_calc = time.perf_counter()
+        if op == 'parse':
+            saida.update(_parse(exprs[0]))
+        elif op == 'simplify':
+            saida.update(_simplify(exprs[0], usar_cache))
+        elif op == 'equivalence':
+            saida.update(_equivalence(exprs[0], exprs[1], usar_cache))
+        else:
+            saida.update(_truth_table(exprs))
+        saida["ok"] = True
+        saida["tempo_ms"] = {"parse": t_parse, "calculo": _ms(inicio_calc), "total": _ms(inicio)}
+    except Exception as e:
+        saida["ok"] = False
+        saida["erro"] = f"{type(e).__name__}: {e}"
+        saida["tempo_ms"] = {"total": _ms(inicio)}
+    return saida
+
+
+def num_expressoes(job):
+    """Quantas expressões o job analisa (para a vazão)."""
+    if not isinstance(job, dict):
+        return 0
+    return sum(isinstance(job.get(k), str) for k in ('expr', 'expr2'))
+
+
+def iter_jobs(linhas):
+    """
+    Decodifica as linhas JSONL uma a uma, pulando as vazias. Uma linha inválida
+    vira um job de erro (dict com '_erro'), para sair no resultado na mesma posição.
+    """
+    for numero, linha in enumerate(linhas, start=1):
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            yield json.loads(linha)
+        except json.JSONDecodeError as e:
+            yield {"_erro": f"JSON inválido na linha {numero}: {e}"}
+
+
+def resultado_job(job, usar_cache=False):
+    """`run_job` para os jobs de `iter_jobs`, incluindo as linhas inválidas."""
+    if isinstance(job, dict) and "_erro" in job:
+        return {"id": None, "ok": False, "erro": f"JobError: {job['_erro']}"}
+    return run_job(job, usar_cache)
+
+
+def _contar(jobs, stats):
+    for job in jobs:
+        if not (isinstance(job, dict) and "_erro" in job):
+            stats["expressoes"] += num_expressoes(job)
+        yield job
+
+
+def run_stream(linhas, saida, usar_cache=False, workers=1, timeout=None, chunk=None, ordem='entrada'):
+    """
+    Processa as linhas de entrada escrevendo cada resultado; retorna as
+    estatísticas. Com mais de um worker, ou com `timeout`, os jobs vão para um
+    `executor.JobExecutor`.
+    """
+    stats = {"jobs": 0, "erros": 0, "expressoes": 0}
+    jobs = _contar(iter_jobs(linhas), stats)
+    executor = None
+    if workers != 1 or timeout:
+        from .executor import JobExecutor, CHUNK_SIZE
+        executor = JobExecutor(workers=workers or None, timeout=timeout, chunk=chunk or CHUNK_SIZE,
+                               ordem=ordem, usar_cache=usar_cache)
+        resultados = executor.map(jobs)
+    else:
+        carregar_motor(usar_cache)
+        resultados = (resultado_job(job, usar_cache) for job in jobs)
+
+    inicio = time.perf_counter()
+    try:
+        for res in resultados:
+            stats["jobs"] += 1
+            stats["erros"] += not res["ok"]
+            saida.write(json.dumps(res, ensure_ascii=False) + "\n")
+            saida.flush()
+    finally:
+        if executor is not None:
+            executor.close()
+            stats["timeouts"] = executor.stats["timeouts"]
+            stats["reinicios"] = executor.stats["reinicios"]
+    stats["segundos"] = time.perf_counter() - inicio
+    return stats
+
+
+def imprimir_resumo(stats, out=None):
+    out = out or sys.stderr
+    segundos = stats["segundos"]
+    vazao = stats["expressoes"] / segundos if segundos > 0 else 0.0
+    print(f"{stats['jobs']} job(s), {stats['erros']} erro(s), {stats['expressoes']} expressão(ões) "
+          f"em {segundos:.2f}s ({vazao:.1f} expr/s)", file=out)
+    if "timeouts" in stats:
+        print(f"{stats['timeouts']} job(s) com prazo esgotado, {stats['reinicios']} reinício(s) do pool", file=out)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simplificação, equivalência e tabela-verdade em lote (JSONL).")
+    ap.add_argument("entrada", nargs="?", help="arquivo JSONL (padrão: stdin)")
+    ap.add_argument("-o", "--saida", help="arquivo de saída JSONL (padrão: stdout)")
+    ap.add_argument("--cache", action="store_true", help="usa o cache persistente de resultados")
+    ap.add_argument("-w", "--workers", type=int, default=1, help="processos (0 = um por núcleo; padrão: 1)")
+    ap.add_argument("--timeout", type=float, help="prazo por job, em segundos")
+    ap.add_argument("--chunk", type=int, help="jobs por envio ao pool")
+    ap.add_argument("--ordem", choices=("entrada", "conclusao"), default="entrada",
+                    help="ordem dos resultados com vários workers")
+    args = ap.parse_args(argv)
+
+    entrada = open(args.entrada, encoding="utf-8") if args.entrada else sys.stdin
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        stats = run_stream(entrada, saida, usar_cache=args.cache, workers=args.workers,
+                           timeout=args.timeout, chunk=args.chunk, ordem=args.ordem)
+    finally:
+        if args.entrada:
+            entrada.close()
+        if args.saida:
+            saida.close()
+    imprimir_resumo(stats)
+    return 0 if stats["erros"] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,478 @@
+# Arquivo: src/sti/bdd.py
+# Diagramas de decisão binária reduzidos e ordenados (ROBDD).
+#
+# Cada função booleana tem exatamente um nó para uma dada ordem de variáveis, então
+# verificar equivalência é comparar dois inteiros. Os nós são "hash-consed" numa
+# tabela única, o ITE usa uma cache de operações e nós mortos são recolhidos por
+# `collect_garbage`. `sift` reordena as variáveis (sifting de Rudell) trocando
+# níveis adjacentes no próprio lugar, sem mudar os identificadores das raízes.
+#
+# Os nós são inteiros: 0 é Falso, 1 é Verdadeiro e os demais são internos.
+
+from collections import Counter
+
+from sympy import Integer, true, false
+from sympy.logic.boolalg import (
+    And, Or, Not, Xor, Nand, Nor, Implies, Equivalent, ITE,
+    BooleanTrue, BooleanFalse,
+)
+from sympy.core.mul import Mul
+
+from .bitparallel import get_variables
+
+FALSE = 0
+TRUE = 1
+_TERMINAL_LEVEL = float('inf')
+_FREE = -1
+
+# Acima deste número de nós o gerenciador compartilhado é limpo antes de uma consulta
+SHARED_GC_THRESHOLD = 200_000
+
+
+class BDD:
+    """Gerenciador de ROBDDs: tabela única, cache de ITE, coleta de lixo e sifting."""
+
+    def __init__(self, variables=()):
+        self._var = [None, None]     # índice da variável de cada nó (None nos terminais)
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique = {}            # (var, low, high) -> nó
+        self._by_var = []            # var -> conjunto de nós com essa variável
+        self._free = []
+        self._ite_cache = {}
+        self._refs = Counter()
+
+        self._symbols = []           # var -> símbolo sympy
+        self._var_index = {}         # símbolo -> var
+        self._level = []             # var -> nível na ordem atual
+        self._var_at_level = []      # nível -> var
+        for sym in variables:
+            self.add_var(sym)
+
+    # --- VARIÁVEIS E ORDEM ---
+
+    def add_var(self, sym):
+        """Registra `sym` no fim da ordem (se ainda não existir) e retorna seu índice."""
+        if sym in self._var_index:
+            return self._var_index[sym]
+        index = len(self._symbols)
+        self._symbols.append(sym)
+        self._var_index[sym] = index
+        self._level.append(len(self._var_at_level))
+        self._var_at_level.append(index)
+        self._by_var.append(set())
+        return index
+
+    def var(self, sym):
+        """Nó da função que vale exatamente a variável `sym`."""
+        return self._mk(self.add_var(sym), FALSE, TRUE)
+
+    @property
+    def order(self):
+        """Símbolos da raiz para as folhas, na ordem atual."""
+        return [self._symbols[v] for v in self._var_at_level]
+
+    @property
+    def node_count(self):
+        """Nós internos vivos na tabela única (inclui os ainda não recolhidos)."""
+        return len(self._unique)
+
+    # --- NÚCLEO: MK E ITE ---
+
+    def _lvl(self, u):
+        var = self._var[u]
+        return _TERMINAL_LEVEL if var is None else self._level[var]
+
+    def _mk(self, var, low, high):
+        if low == high:
+            return low
+        key = (var, low, high)
+        u = self._unique.get(key)
+        if u is not None:
+            return u
+        if self._free:
+            u = self._free.pop()
+            self._var[u], self._low[u], self._high[u] = var, low, high
+        else:
+            u = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+        self._unique[key] = u
+        self._by_var[var].add(u)
+        return u
+
+    def _cofactors(self, u, level):
+        if self._lvl(u) == level:
+            return self._low[u], self._high[u]
+        return u, u
+
+    def ite(self, f, g, h):
+        """if f then g else h."""
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        key = (f, g, h)
+        r = self._ite_cache.get(key)
+        if r is not None:
+            return r
+
+        level = min(self._lvl(f), self._lvl(g), self._lvl(h))
+        f0, f1 = self._cofactors(f, level)
+        g0, g1 = self._cofactors(g, level)
+        h0, h1 = self._cofactors(h, level)
+        r = self._mk(self._var_at_level[level], self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self._ite_cache[key] = r
+        return r
+
+    def negate(self, f):
+        return self.ite(f, FALSE, TRUE)
+
+    def apply_and(self, f, g):
+        return self.ite(f, g, FALSE)
+
+    def apply_or(self, f, g):
+        return self.ite(f, TRUE, g)
+
+    def apply_xor(self, f, g):
+        return self.ite(f, self.negate(g), g)
+
+    # --- CONSTRUÇÃO A PARTIR DO SYMPY ---
+
+    def from_expr(self, expr):
+        """Constrói o BDD de uma árvore sympy (como as produzidas por `parse_raw`)."""
+        # Variáveis novas entram em ordem alfabética, como no resto do pacote
+        for sym in get_variables(expr):
+            self.add_var(sym)
+        memo = {}
+
+        def build(node):
+            if node in memo:
+                return memo[node]
+            if node.is_Symbol:
+                r = self.var(node)
+            elif isinstance(node, BooleanTrue):
+                r = TRUE
+            elif isinstance(node, BooleanFalse):
+                r = FALSE
+            elif isinstance(node, Integer):
+                r = TRUE if node != 0 else FALSE
+            elif isinstance(node, Not):
+                r = self.negate(build(node.args[0]))
+            elif isinstance(node, (And, Mul, Nand)):
+                r = TRUE
+                for arg in node.args:
+                    r = self.apply_and(r, build(arg))
+                if isinstance(node, Nand):
+                    r = self.negate(r)
+            elif isinstance(node, (Or, Nor)):
+                r = FALSE
+                for arg in node.args:
+                    r = self.apply_or(r, build(arg))
+                if isinstance(node, Nor):
+                    r = self.negate(r)
+            elif isinstance(node, Xor):
+                r = FALSE
+                for arg in node.args:
+                    r = self.apply_xor(r, build(arg))
+            elif isinstance(node, Implies):
+                r = self.ite(build(node.args[0]), build(node.args[1]), TRUE)
+            elif isinstance(node, Equivalent):
+                args = [build(a) for a in node.args]
+                all_true, all_false = TRUE, TRUE
+                for a in args:
+                    all_true = self.apply_and(all_true, a)
+                    all_false = self.apply_and(all_false, self.negate(a))
+                r = self.apply_or(all_true, all_false)
+            elif isinstance(node, ITE):
+                r = self.ite(*(build(a) for a in node.args))
+            else:
+                raise TypeError(f"Operador não suportado pelo BDD: {type(node).__name__}")
+            memo[node] = r
+            return r
+
+        return build(expr)
+
+    def equivalent(self, f, g):
+        """Com BDDs canônicos, equivalência é identidade de nós."""
+        return f == g
+
+    # --- LEITURA: CUBOS, MINTERMS E SOP ---
+
+    def iter_cubes(self, u):
+        """Gera os caminhos até 1 como dicionários {símbolo: bool} (cobertura disjunta)."""
+        path = {}
+
+        def walk(node):
+            if node == TRUE:
+                yield dict(path)
+                return
+            if node == FALSE:
+                return
+            sym = self._symbols[self._var[node]]
+            for value, child in ((False, self._low[node]), (True, self._high[node])):
+                path[sym] = value
+                yield from walk(child)
+                del path[sym]
+
+        yield from walk(u)
+
+    def pick_cube(self, u):
+        """Um caminho até 1 (preferindo o ramo Falso), ou None se `u` for Falso."""
+        if u == FALSE:
+            return None
+        cube = {}
+        while u != TRUE:
+            sym = self._symbols[self._var[u]]
+            if self._low[u] != FALSE:
+                cube[sym] = False
+                u = self._low[u]
+            else:
+                cube[sym] = True
+                u = self._high[u]
+        return cube
+
+    def sat_count(self, u, num_vars=None):
+        """
+        Número de atribuições que satisfazem `u`. Por padrão conta sobre todas as
+        variáveis do gerenciador; `num_vars` desconta as que não pertencem à função.
+        """
+        n = len(self._symbols)
+        memo = {}
+
+        def level(node):
+            lvl = self._lvl(node)
+            return n if lvl == _TERMINAL_LEVEL else lvl
+
+        def count(node):
+            # Atribuições das variáveis dos níveis level(node) .. n-1
+            if node <= TRUE:
+                return node
+            if node not in memo:
+                lo, hi = self._low[node], self._high[node]
+                memo[node] = ((count(lo) << (level(lo) - level(node) - 1)) +
+                              (count(hi) << (level(hi) - level(node) - 1)))
+            return memo[node]
+
+        total = count(u) << level(u)
+        if num_vars is not None:
+            total >>= n - num_vars
+        return total
+
+    def minterms(self, u, variables):
+        """Minterms de `u` em ordem crescente, numerados como no resto do pacote."""
+        position = {sym: len(variables) - 1 - i for i, sym in enumerate(variables)}
+        result = set()
+        for cube in self.iter_cubes(u):
+            base = 0
+            free = []
+            for sym in variables:
+                if sym in cube:
+                    if cube[sym]:
+                        base |= 1 << position[sym]
+                else:
+                    free.append(1 << position[sym])
+            # Expande as variáveis ausentes do caminho
+            values = [base]
+            for bit in free:
+                values += [v | bit for v in values]
+            result.update(values)
+        return sorted(result)
+
+    def isop(self, u):
+        """
+        Cobertura SOP irredundante de `u` (algoritmo de Minato-Morreale), como
+        lista de cubos {símbolo: bool}.
+        """
+        memo = {}
+
+        def rec(lower, upper):
+            if lower == FALSE:
+                return [], FALSE
+            if upper == TRUE:
+                return [{}], TRUE
+            key = (lower, upper)
+            if key in memo:
+                return memo[key]
+            level = min(self._lvl(lower), self._lvl(upper))
+            var = self._var_at_level[level]
+            sym = self._symbols[var]
+            l0, l1 = self._cofactors(lower, level)
+            u0, u1 = self._cofactors(upper, level)
+
+            c0, r0 = rec(self.apply_and(l0, self.negate(u1)), u0)
+            c1, r1 = rec(self.apply_and(l1, self.negate(u0)), u1)
+            rest = self.apply_or(self.apply_and(l0, self.negate(r0)),
+                                 self.apply_and(l1, self.negate(r1)))
+            cs, rs = rec(rest, self.apply_and(u0, u1))
+
+            cubes = ([{**c, sym: False} for c in c0] +
+                     [{**c, sym: True} for c in c1] + cs)
+            cover = self.apply_or(self._mk(var, r0, r1), rs)
+            memo[key] = (cubes, cover)
+            return cubes, cover
+
+        return rec(u, u)[0]
+
+    def to_sop(self, u):
+        """Expressão sympy da cobertura irredundante de `u`."""
+        if u == FALSE:
+            return false
+        if u == TRUE:
+            return true
+        terms = []
+        for cube in self.isop(u):
+            lits = [sym if value else Not(sym)
+                    for sym, value in sorted(cube.items(), key=lambda kv: str(kv[0]))]
+            terms.append(And(*lits) if len(lits) > 1 else lits[0])
+        return Or(*terms) if len(terms) > 1 else terms[0]
+
+    # --- REFERÊNCIAS E COLETA DE LIXO ---
+
+    def incref(self, u):
+        """Marca `u` como raiz externa (sobrevive a `collect_garbage` e `sift`)."""
+        self._refs[u] += 1
+        return u
+
+    def decref(self, u):
+        self._refs[u] -= 1
+        if self._refs[u] <= 0:
+            del self._refs[u]
+
+    def _reachable(self, roots):
+        seen = set()
+        stack = [u for u in roots if u > TRUE]
+        while stack:
+            u = stack.pop()
+            if u in seen:
+                continue
+            seen.add(u)
+            for child in (self._low[u], self._high[u]):
+                if child > TRUE and child not in seen:
+                    stack.append(child)
+        return seen
+
+    def size(self, roots=None):
+        """Número de nós internos alcançáveis a partir das raízes."""
+        if roots is None:
+            roots = list(self._refs)
+        return len(self._reachable(roots))
+
+    def collect_garbage(self, roots=()):
+        """
+        Libera os nós que não são alcançáveis das raízes referenciadas (`incref`)
+        nem de `roots`. Limpa a cache de ITE e retorna quantos nós foram liberados.
+        """
+        live = self._reachable(list(self._refs) + list(roots))
+        dead = [u for u in self._unique.values() if u not in live]
+        for u in dead:
+            var = self._var[u]
+            del self._unique[(var, self._low[u], self._high[u])]
+            self._by_var[var].discard(u)
+            self._var[u] = _FREE
+            self._free.append(u)
+        self._ite_cache.clear()
+        return len(dead)
+
+    # --- REORDENAÇÃO ---
+
+    def swap_levels(self, level):
+        """
+        Troca as variáveis dos níveis `level` e `level + 1` no próprio lugar.
+        Os nós continuam representando as mesmas funções (identificadores preservados).
+        """
+        x = self._var_at_level[level]
+        y = self._var_at_level[level + 1]
+        self._var_at_level[level], self._var_at_level[level + 1] = y, x
+        self._level[x], self._level[y] = level + 1, level
+
+        for u in list(self._by_var[x]):
+            f0, f1 = self._low[u], self._high[u]
+            f0_is_y = self._var[f0] == y
+            f1_is_y = self._var[f1] == y
+            if not f0_is_y and not f1_is_y:
+                continue  # não depende de y: só desce um nível
+            f00, f01 = (self._low[f0], self._high[f0]) if f0_is_y else (f0, f0)
+            f10, f11 = (self._low[f1], self._high[f1]) if f1_is_y else (f1, f1)
+            new_low = self._mk(x, f00, f10)
+            new_high = self._mk(x, f01, f11)
+
+            del self._unique[(x, f0, f1)]
+            self._by_var[x].discard(u)
+            self._var[u], self._low[u], self._high[u] = y, new_low, new_high
+            self._unique[(y, new_low, new_high)] = u
+            self._by_var[y].add(u)
+
+    def _move_var(self, var, target):
+        while self._level[var] < target:
+            self.swap_levels(self._level[var])
+        while self._level[var] > target:
+            self.swap_levels(self._level[var] - 1)
+
+    def sift(self, roots=None, max_growth=1.2):
+        """
+        Sifting de Rudell: cada variável (das mais populosas para as menos) é
+        levada por todas as posições e deixada onde o BDD das raízes fica menor.
+        Retorna o tamanho final.
+        """
+        if roots is None:
+            roots = list(self._refs)
+        roots = list(roots)
+        self.collect_garbage(roots)
+        n = len(self._var_at_level)
+        by_population = sorted(range(n), key=lambda v: -len(self._by_var[v]))
+
+        for var in by_population:
+            start_size = self.size(roots)
+            best = [start_size, self._level[var]]
+            # Desce até o fim e depois sobe até o topo, parando se crescer demais
+            while self._level[var] < n - 1:
+                self.swap_levels(self._level[var])
+                s = self.size(roots)
+                if s < best[0]:
+                    best = [s, self._level[var]]
+                if s > max_growth * start_size:
+                    break
+            while self._level[var] > 0:
+                self.swap_levels(self._level[var] - 1)
+                s = self.size(roots)
+                if s < best[0]:
+                    best = [s, self._level[var]]
+                if s > max_growth * start_size:
+                    break
+            self._move_var(var, best[1])
+            self.collect_garbage(roots)
+        return self.size(roots)
+
+
+# --- GERENCIADOR COMPARTILHADO ---
+
+_shared = None
+
+def shared_manager():
+    """Gerenciador único do processo, para que consultas repetidas reaproveitem nós."""
+    global _shared
+    if _shared is None:
+        _shared = BDD()
+    elif _shared.node_count > SHARED_GC_THRESHOLD:
+        _shared.collect_garbage()
+    return _shared
+
+
+def find_counterexample_bdd(e1, e2, manager=None):
+    """
+    Compara as expressões pelo BDD: nós iguais significam equivalência. Caso
+    contrário devolve uma atribuição de Xor(e1, e2), com Falso nas variáveis livres.
+    """
+    bdd = manager or shared_manager()
+    f = bdd.from_expr(e1)
+    g = bdd.from_expr(e2)
+    if bdd.equivalent(f, g):
+        return None
+    cube = bdd.pick_cube(bdd.apply_xor(f, g))
+    return {sym: cube.get(sym, False) for sym in get_variables(e1, e2)}
@@ -0,0 +1,167 @@
+# Arquivo: src/sti/bitparallel.py
+# Motor bit-paralelo: avalia a tabela-verdade inteira de uma expressão de uma vez.
+#
+# Convenção usada em todo o pacote: com as variáveis ordenadas por nome, a
+# primeira variável é o bit MAIS significativo do índice da linha. Assim o bit
+# `i` da máscara é o valor da expressão no minterm `i`, exatamente a mesma
+# numeração que o Quine-McCluskey do `simplifier` sempre usou.
+
+from sympy import Integer
+from sympy.logic.boolalg import (
+    And, Or, Not, Xor, Nand, Nor, Implies, Equivalent, ITE,
+    BooleanTrue, BooleanFalse,
+)
+from sympy.core.mul import Mul
+
+# A partir deste número de variáveis a máscara inteira (2^n bits) fica grande
+# demais e o backend em blocos do `numpy_backend` passa a ser usado.
+NUMPY_MIN_VARS = 20
+
+
+def get_variables(*expressions):
+    """Retorna as variáveis livres de todas as expressões, ordenadas pelo nome."""
+    variables_set = set()
+    for expr in expressions:
+        variables_set.update(expr.free_symbols)
+    return sorted(variables_set, key=str)
+
+
+def choose_backend(num_vars, backend='auto'):
+    """Resolve backend='auto' para 'bitmask' ou 'numpy' conforme o número de variáveis."""
+    if backend == 'auto':
+        return 'numpy' if num_vars >= NUMPY_MIN_VARS else 'bitmask'
+    if backend not in ('bitmask', 'numpy'):
+        raise ValueError(f"Backend desconhecido: {backend!r}")
+    return backend
+
+
+def full_mask(num_vars):
+    """Máscara com todas as 2^n linhas ligadas."""
+    return (1 << (1 << num_vars)) - 1
+
+
+def variable_pattern(position, num_vars):
+    """
+    Padrão de 2^n bits da variável na posição `position` (0 = mais significativa).
+    Ex.: para 2 variáveis, A -> 0b1100 e B -> 0b1010.
+    """
+    half = 1 << (num_vars - 1 - position)
+    # Um bloco de `half` zeros seguido de `half` uns, repetido por toda a tabela
+    # dobrando o padrão (deslocamentos são lineares; divisão de inteiros enormes não)
+    pattern = ((1 << half) - 1) << half
+    period = 2 * half
+    total = 1 << num_vars
+    while period < total:
+        pattern |= pattern << period
+        period *= 2
+    return pattern
+
+
+def evaluate_mask(expr, variables):
+    """Avalia `expr` sobre todas as atribuições de `variables` e retorna a máscara."""
+    num_vars = len(variables)
+    full = full_mask(num_vars)
+    patterns = {var: variable_pattern(i, num_vars) for i, var in enumerate(variables)}
+    cache = {}
+
+    def ev(node):
+        if node in cache:
+            return cache[node]
+
+        if node in patterns:
+            res = patterns[node]
+        elif isinstance(node, BooleanTrue):
+            res = full
+        elif isinstance(node, BooleanFalse):
+            res = 0
+        elif isinstance(node, Integer):
+            res = full if node != 0 else 0
+        elif isinstance(node, Not):
+            res = full ^ ev(node.args[0])
+        elif isinstance(node, (And, Mul)):
+            # `Mul` aparece quando a multiplicação implícita ("A B") vira produto
+            res = full
+            for arg in node.args:
+                res &= ev(arg)
+        elif isinstance(node, Or):
+            res = 0
+            for arg in node.args:
+                res |= ev(arg)
+        elif isinstance(node, Xor):
+            res = 0
+            for arg in node.args:
+                res ^= ev(arg)
+        elif isinstance(node, Nand):
+            res = full
+            for arg in node.args:
+                res &= ev(arg)
+            res ^= full
+        elif isinstance(node, Nor):
+            res = 0
+            for arg in node.args:
+                res |= ev(arg)
+            res ^= full
+        elif isinstance(node, Implies):
+            res = (full ^ ev(node.args[0])) | ev(node.args[1])
+        elif isinstance(node, Equivalent):
+            masks = [ev(arg) for arg in node.args]
+            all_true, all_false = full, full
+            for m in masks:
+                all_true &= m
+                all_false &= full ^ m
+            res = all_true | all_false
+        elif isinstance(node, ITE):
+            c, t, f = (ev(arg) for arg in node.args)
+            res = (c & t) | ((full ^ c) & f)
+        else:
+            res = _evaluate_mask_by_rows(node, variables)
+
+        cache[node] = res
+        return res
+
+    return ev(expr)
+
+
+def _evaluate_mask_by_rows(node, variables):
+    """Fallback linha a linha (via `subs`) para nós que o motor não conhece."""
+    num_vars = len(variables)
+    res = 0
+    for i in range(1 << num_vars):
+        assign = {var: bool((i >> (num_vars - 1 - j)) & 1) for j, var in enumerate(variables)}
+        if bool(node.subs(assign)):
+            res |= 1 << i
+    return res
+
+
+def truth_mask(expr, variables=None):
+    """Retorna `(variables, mask)` com a tabela-verdade completa de `expr`."""
+    if variables is None:
+        variables = get_variables(expr)
+    return variables, evaluate_mask(expr, variables)
+
+
+def iter_set_bits(mask):
+    """Percorre os índices dos bits ligados em ordem crescente."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def mask_to_minterms(mask):
+    """Lista de minterms (índices dos bits ligados) em ordem crescente."""
+    # Varrer a string binária é linear no tamanho da máscara, mesmo quando densa
+    bits = bin(mask)[:1:-1]
+    return [i for i, bit in enumerate(bits) if bit == '1']
+
+
+def lowest_set_bit(mask):
+    """Índice do menor bit ligado, ou None se a máscara for zero."""
+    if not mask:
+        return None
+    return (mask & -mask).bit_length() - 1
+
+
+def row_values(index, num_vars):
+    """Valores (bool) das variáveis na linha `index`, da mais para a menos significativa."""
+    return tuple(bool((index >> (num_vars - 1 - j)) & 1) for j in range(num_vars))
@@ -0,0 +1,115 @@
+# Arquivo: src/sti/compiler.py
+# Compila uma expressão sympy (vinda de `parse_raw`) numa função Python "achatada"
+# para avaliar uma atribuição por vez sem o custo do `subs`.
+#
+# Dois formatos de entrada são suportados:
+#   - 'tuple': f((True, False, ...)) com os valores na ordem de `variables`;
+#   - 'int':   f(i) com i no formato de minterm (1ª variável = bit mais significativo),
+#              a mesma convenção do `bitparallel`.
+
+from functools import lru_cache
+
+from sympy import Integer
+from sympy.logic.boolalg import (
+    And, Or, Not, Xor, Nand, Nor, Implies, Equivalent, ITE,
+    BooleanTrue, BooleanFalse,
+)
+from sympy.core.mul import Mul
+
+from .bitparallel import get_variables
+
+MODES = ('tuple', 'int')
+
+
+def compile_expr(expr, variables=None, mode='tuple'):
+    """
+    Retorna uma função que avalia `expr` numa atribuição.
+    O código gerado é guardado em cache por (expressão, variáveis, formato).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Formato desconhecido: {mode!r} (use 'tuple' ou 'int').")
+    if variables is None:
+        variables = get_variables(expr)
+    return _compile_cached(expr, tuple(variables), mode)
+
+
+def expr_to_source(expr, variables=None, mode='tuple'):
+    """Código-fonte Python gerado para `expr` (útil para depuração)."""
+    if variables is None:
+        variables = get_variables(expr)
+    source, _ = _generate(expr, tuple(variables), mode)
+    return source
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(expr, variables, mode):
+    source, namespace = _generate(expr, variables, mode)
+    code = compile(source, f"<sti.compiler {expr}>", 'exec')
+    exec(code, namespace)
+    func = namespace['_avaliar']
+    func.source = source
+    return func
+
+
+def _generate(expr, variables, mode):
+    """Gera o código da função e o namespace com os objetos de fallback."""
+    num_vars = len(variables)
+    if mode == 'tuple':
+        names = {var: f"v{i}" for i, var in enumerate(variables)}
+    else:
+        names = {var: f"((i >> {num_vars - 1 - k}) & 1)" for k, var in enumerate(variables)}
+
+    namespace = {}
+    body = _emit(expr, names, variables, namespace)
+
+    if mode == 'tuple':
+        lines = ["def _avaliar(v):"]
+        if num_vars == 1:
+            lines.append("    v0, = v")
+        elif num_vars > 1:
+            lines.append(f"    {', '.join(names[var] for var in variables)} = v")
+    else:
+        lines = ["def _avaliar(i):"]
+    lines.append(f"    return bool({body})")
+    return "\n".join(lines) + "\n", namespace
+
+
+def _emit(node, names, variables, namespace):
+    """Traduz um nó sympy numa expressão Python sobre as variáveis locais."""
+    def rec(n):
+        return _emit(n, names, variables, namespace)
+
+    if node in names:
+        return names[node]
+    if isinstance(node, BooleanTrue):
+        return "True"
+    if isinstance(node, BooleanFalse):
+        return "False"
+    if isinstance(node, Integer):
+        return "True" if node != 0 else "False"
+    if isinstance(node, Not):
+        return f"(not {rec(node.args[0])})"
+    if isinstance(node, (And, Mul)):
+        return "(" + " and ".join(rec(a) for a in node.args) + ")"
+    if isinstance(node, Or):
+        return "(" + " or ".join(rec(a) for a in node.args) + ")"
+    if isinstance(node, Xor):
+        return "(" + " ^ ".join(f"bool({rec(a)})" for a in node.args) + ")"
+    if isinstance(node, Nand):
+        return "(not (" + " and ".join(rec(a) for a in node.args) + "))"
+    if isinstance(node, Nor):
+        return "(not (" + " or ".join(rec(a) for a in node.args) + "))"
+    if isinstance(node, Implies):
+        return f"((not {rec(node.args[0])}) or {rec(node.args[1])})"
+    if isinstance(node, Equivalent):
+        return "(" + " == ".join(f"bool({rec(a)})" for a in node.args) + ")"
+    if isinstance(node, ITE):
+        c, t, f = (rec(a) for a in node.args)
+        return f"({t} if {c} else {f})"
+
+    # Nó desconhecido: delega ao sympy só para essa subárvore
+    key = f"_no{len(namespace)}"
+    namespace[key] = node
+    namespace.setdefault('_syms', variables)
+    values = "".join(f"bool({names[var]}), " for var in variables)
+    return f"bool({key}.subs(dict(zip(_syms, ({values})))))"
@@ -0,0 +1,188 @@
+# Arquivo: src/sti/consensus.py
+# Implicantes primos direto da expressão, sem expandir minterms.
+#
+# A expressão vira uma cobertura de cubos (value, mask) — a mesma representação
+# do `simplifier` — empurrando as negações pelas leis de De Morgan e
+# distribuindo os produtos sobre as somas. Os primos saem do consenso iterado
+# com absorção, e a redundância de um cubo é testada por tautologia do cofator.
+# O custo cresce com o tamanho da cobertura, não com 2^n.
+
+from sympy import Integer
+from sympy.logic.boolalg import And, Or, Not, BooleanTrue, BooleanFalse, BooleanFunction
+from sympy.core.mul import Mul
+
+# Limite de cubos em qualquer etapa; acima disso a cobertura é abandonada
+MAX_CUBES = 1000
+
+
+class CoverTooLarge(Exception):
+    """A cobertura passou de `max_cubes` durante a conversão ou o consenso."""
+
+
+def _popcount(x):
+    return bin(x).count('1')
+
+
+def contains(a, b):
+    """O cubo `a` contém o cubo `b`?"""
+    return b[1] & ~a[1] == 0 and (a[0] ^ b[0]) & ~a[1] == 0
+
+
+def intersect(a, b):
+    """Interseção de dois cubos, ou None se forem disjuntos."""
+    if (a[0] ^ b[0]) & ~a[1] & ~b[1]:
+        return None
+    return a[0] | b[0], a[1] & b[1]
+
+
+def consensus(a, b):
+    """Consenso de dois cubos que conflitam em exatamente uma variável, senão None."""
+    conflict = (a[0] ^ b[0]) & ~a[1] & ~b[1]
+    if not conflict or conflict & (conflict - 1):
+        return None
+    return (a[0] | b[0]) & ~conflict, (a[1] & b[1]) | conflict
+
+
+def absorb(cubes):
+    """Remove os cubos contidos em outros (e as repetições)."""
+    kept = []
+    for cube in sorted(set(cubes), key=lambda c: -_popcount(c[1])):
+        if not any(contains(k, cube) for k in kept):
+            kept.append(cube)
+    return kept
+
+
+# --- EXPRESSÃO -> COBERTURA ---
+
+def expr_to_cubes(expr, variables, max_cubes=MAX_CUBES):
+    """
+    Converte a expressão numa soma de produtos como lista de cubos. Levanta
+    `CoverTooLarge` se a distribuição passar de `max_cubes` cubos.
+    """
+    num_vars = len(variables)
+    full = (1 << num_vars) - 1
+    bits = {var: 1 << (num_vars - 1 - i) for i, var in enumerate(variables)}
+
+    def check(cubes):
+        if len(cubes) > max_cubes:
+            raise CoverTooLarge(f"Mais de {max_cubes} cubos na cobertura.")
+        return cubes
+
+    def product(factors):
+        res = [(0, full)]
+        for cover in factors:
+            res = [c for a in res for b in cover for c in (intersect(a, b),) if c is not None]
+            res = check(absorb(res))
+            if not res:
+                break
+        return res
+
+    def union(terms):
+        return check(absorb([c for cover in terms for c in cover]))
+
+    def cover(node, negate=False):
+        if node in bits:
+            bit = bits[node]
+            return [(0 if negate else bit, full & ~bit)]
+        if isinstance(node, (BooleanTrue, BooleanFalse, Integer)):
+            value = bool(node) if isinstance(node, Integer) else isinstance(node, BooleanTrue)
+            return [(0, full)] if value != negate else []
+        if isinstance(node, Not):
+            return cover(node.args[0], not negate)
+        if isinstance(node, (And, Mul)):
+            # `Mul` aparece quando a multiplicação implícita ("A B") vira produto
+            parts = [cover(arg, negate) for arg in node.args]
+            return union(parts) if negate else product(parts)
+        if isinstance(node, Or):
+            parts = [cover(arg, negate) for arg in node.args]
+            return product(parts) if negate else union(parts)
+        if isinstance(node, BooleanFunction):
+            # Xor, Implies, Equivalent, ITE, Nand, Nor: reescritos só com E/OU/NÃO
+            return cover(node.to_nnf(), negate)
+        raise ValueError(f"Nó não suportado na conversão para cubos: {node!r}")
+
+    return cover(expr)
+
+
+# --- CONSENSO E TAUTOLOGIA ---
+
+def prime_implicants_by_consensus(cubes, max_cubes=MAX_CUBES):
+    """Todos os implicantes primos da cobertura, por consenso iterado com absorção."""
+    primes = set(absorb(cubes))
+    pending = list(primes)
+    while pending:
+        cube = pending.pop()
+        for other in list(primes):
+            if cube not in primes:
+                break
+            if other not in primes:
+                continue
+            new = consensus(cube, other)
+            if new is None or any(contains(p, new) for p in primes):
+                continue
+            primes.difference_update([p for p in primes if contains(new, p)])
+            primes.add(new)
+            pending.append(new)
+            if len(primes) > max_cubes:
+                raise CoverTooLarge(f"Mais de {max_cubes} implicantes primos.")
+    return primes
+
+
+def is_tautology(cubes, full):
+    """A cobertura vale 1 em todo o espaço? (paradigma unate recursivo)"""
+    if not cubes:
+        return False
+    if any(mask == full for _, mask in cubes):
+        return True
+    # Variável binata mais frequente; se não houver, a cobertura é unate e,
+    # sem o cubo universal, não é tautologia
+    pos = neg = 0
+    best, best_count = 0, 0
+    counts = {}
+    for value, mask in cubes:
+        fixed = full & ~mask
+        pos |= fixed & value
+        neg |= fixed & ~value
+        while fixed:
+            bit = fixed & -fixed
+            fixed ^= bit
+            counts[bit] = counts.get(bit, 0) + 1
+    binate = pos & neg
+    if not binate:
+        return False
+    for bit, count in counts.items():
+        if bit & binate and count > best_count:
+            best, best_count = bit, count
+    return (is_tautology(cofactor(cubes, (best, full & ~best), full), full)
+            and is_tautology(cofactor(cubes, (0, full & ~best), full), full))
+
+
+def cofactor(cubes, cube, full):
+    """Cofator da cobertura em relação a `cube`: as posições fixas de `cube` viram livres."""
+    value, mask = cube
+    fixed = full & ~mask
+    return [(v & mask, m | fixed) for v, m in cubes if not (v ^ value) & fixed & ~m]
+
+
+def is_covered(cube, cubes, full):
+    """O cubo está contido na união de `cubes`?"""
+    return is_tautology(cofactor(cubes, cube, full), full)
+
+
+def irredundant_cover(primes, num_vars):
+    """
+    Retorna (cobertura irredundante, essenciais). Os essenciais são os primos que
+    não estão cobertos pelos demais; os outros são retirados gulosamente, menores
+    primeiro, enquanto a união continuar a mesma.
+    """
+    full = (1 << num_vars) - 1
+    primes = sorted(primes, key=lambda c: (-_popcount(c[1]), c))
+    essentials = [p for p in primes if not is_covered(p, [q for q in primes if q != p], full)]
+    cover = list(primes)
+    for p in reversed(primes):
+        if p in essentials:
+            continue
+        others = [q for q in cover if q != p]
+        if is_covered(p, others, full):
+            cover = others
+    return cover, essentials
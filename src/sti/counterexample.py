@@ -1,9 +1,60 @@
 from itertools import product
 
-def find_counterexample(e1, e2):
-    syms = sorted(list(e1.free_symbols | e2.free_symbols), key=str)
-    for bits in product([False, True], repeat=len(syms)):
-        assign = dict(zip(syms, bits))
-        if bool(e1.subs(assign)) != bool(e2.subs(assign)):
-            return assign
-    return None
\ No newline at end of file
+from .bitparallel import get_variables, evaluate_mask, lowest_set_bit, row_values
+from .compiler import compile_expr
+from .sat import find_counterexample_sat
+from .bdd import find_counterexample_bdd
+
+BACKENDS = ('auto', 'bitmask', 'compiled', 'sympy', 'sat', 'bdd')
+
+# Acima deste número de variáveis o backend 'auto' troca a enumeração pelo SAT
+SAT_MIN_VARS = 18
+
+def find_counterexample(e1, e2, backend='auto', sat_min_vars=None):
+    """
+    Retorna uma atribuição em que as expressões diferem, ou None se forem equivalentes.
+
+    backend: 'bitmask' (tabela inteira de uma vez), 'compiled' (funções Python
+    geradas, com saída antecipada), 'sympy' (avaliação via `subs`), 'sat'
+    (CDCL sobre a codificação de Tseitin de Xor(e1, e2)) ou 'bdd' (comparação
+    de nós canônicos no gerenciador compartilhado). Os três primeiros
+    devolvem o menor minterm em que elas diferem. 'auto' usa 'bitmask' e passa
+    para 'sat' quando há mais de `sat_min_vars` (padrão: SAT_MIN_VARS) variáveis.
+    """
+    syms = get_variables(e1, e2)
+
+    if backend == 'auto':
+        limit = SAT_MIN_VARS if sat_min_vars is None else sat_min_vars
+        backend = 'sat' if len(syms) > limit else 'bitmask'
+
+    if backend == 'sat':
+        return find_counterexample_sat(e1, e2)
+
+    if backend == 'bdd':
+        return find_counterexample_bdd(e1, e2)
+
+    if backend == 'bitmask':
+        # As linhas em que as tabelas diferem são os bits ligados do XOR das máscaras;
+        # o menor deles é o mesmo contraexemplo que a enumeração em ordem encontraria.
+        diff = evaluate_mask(e1, syms) ^ evaluate_mask(e2, syms)
+        index = lowest_set_bit(diff)
+        if index is None:
+            return None
+        return dict(zip(syms, row_values(index, len(syms))))
+
+    if backend == 'compiled':
+        f1 = compile_expr(e1, syms)
+        f2 = compile_expr(e2, syms)
+        for bits in product((False, True), repeat=len(syms)):
+            if f1(bits) != f2(bits):
+                return dict(zip(syms, bits))
+        return None
+
+    if backend == 'sympy':
+        for bits in product([False, True], repeat=len(syms)):
+            assign = dict(zip(syms, bits))
+            if bool(e1.subs(assign)) != bool(e2.subs(assign)):
+                return assign
+        return None
+
+    raise ValueError(f"Backend desconhecido: {backend!r}")
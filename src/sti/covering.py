@@ -0,0 +1,203 @@
+# Arquivo: src/sti/covering.py
+# Cobertura exata mínima (passo 5 do Quine-McCluskey) por branch-and-bound.
+#
+# A tabela de cobertura é dada por colunas em bitset: `columns[j]` tem o bit i
+# ligado se o implicante j cobre a linha (minterm) i. O custo de uma solução é
+# (número de implicantes, número de literais), comparado lexicograficamente: o
+# mínimo de implicantes é garantido e, entre os empates, fica o de menos literais.
+
+import time
+
+
+def _popcount(x):
+    return bin(x).count('1')
+
+
+def _bits(x):
+    """Índices dos bits ligados, do menor para o maior."""
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+
+class _CoverSearch:
+
+    def __init__(self, columns, costs, time_budget):
+        self.columns = columns
+        self.costs = costs
+        self.row_cols = {}
+        for j, col in enumerate(columns):
+            for i in _bits(col):
+                self.row_cols[i] = self.row_cols.get(i, 0) | (1 << j)
+        self.deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.best = None
+        self.best_cost = (float('inf'), float('inf'))
+        self.timed_out = False
+        self.stats = {
+            "nodes": 0, "essential_columns": 0, "dominated_rows": 0,
+            "dominated_columns": 0, "cyclic_core_rows": 0, "cyclic_core_columns": 0,
+            "root_lower_bound": 0, "optimal": True, "elapsed": 0.0,
+        }
+
+    def _cost(self, chosen):
+        return len(chosen), sum(self.costs[c] for c in chosen)
+
+    def _record(self, chosen):
+        cost = self._cost(chosen)
+        if cost < self.best_cost:
+            self.best, self.best_cost = list(chosen), cost
+
+    # --- REDUÇÕES ---
+
+    def reduce(self, rows, cols, chosen):
+        """
+        Aplica até estabilizar: colunas essenciais, dominância de linhas e de
+        colunas. Retorna (rows, cols) reduzidos ou None se alguma linha ficou sem
+        cobertura possível. `chosen` recebe as colunas essenciais.
+        """
+        columns, costs, row_cols, stats = self.columns, self.costs, self.row_cols, self.stats
+        changed = True
+        while changed and rows:
+            changed = False
+
+            # Colunas essenciais: linhas com um único candidato
+            for r in list(_bits(rows)):
+                if not (rows >> r) & 1:
+                    continue
+                cand = row_cols[r] & cols
+                if cand == 0:
+                    return None
+                if cand & (cand - 1) == 0:
+                    c = cand.bit_length() - 1
+                    chosen.append(c)
+                    rows &= ~columns[c]
+                    cols &= ~cand
+                    stats["essential_columns"] += 1
+                    changed = True
+            if changed:
+                continue
+
+            # Dominância de linhas: se cand(r2) ⊆ cand(r1), cobrir r2 já cobre r1
+            entries = sorted(((row_cols[r] & cols, r) for r in _bits(rows)),
+                             key=lambda e: _popcount(e[0]))
+            for i, (c2, r2) in enumerate(entries):
+                if not (rows >> r2) & 1:
+                    continue
+                for c1, r1 in entries[i + 1:]:
+                    if (rows >> r1) & 1 and c2 & ~c1 == 0:
+                        rows &= ~(1 << r1)
+                        stats["dominated_rows"] += 1
+                        changed = True
+
+            # Dominância de colunas: b é dispensável se a cobre tudo que b cobre por custo <=
+            live = [(columns[c] & rows, c) for c in _bits(cols)]
+            for cov, c in live:
+                if cov == 0:
+                    cols &= ~(1 << c)
+                    changed = True
+            live = sorted((e for e in live if e[0]),
+                          key=lambda e: (-_popcount(e[0]), costs[e[1]], e[1]))
+            for i, (cov_a, a) in enumerate(live):
+                if not (cols >> a) & 1:
+                    continue
+                for cov_b, b in live[i + 1:]:
+                    if (cols >> b) & 1 and cov_b & ~cov_a == 0 and costs[a] <= costs[b]:
+                        cols &= ~(1 << b)
+                        stats["dominated_columns"] += 1
+                        changed = True
+        return rows, cols
+
+    def lower_bound(self, rows, cols):
+        """Linhas duas a duas sem candidato em comum exigem colunas distintas."""
+        used = 0
+        bound = 0
+        for cand in sorted((self.row_cols[r] & cols for r in _bits(rows)), key=_popcount):
+            if cand & used == 0:
+                used |= cand
+                bound += 1
+        return bound
+
+    def greedy(self, rows, cols, chosen):
+        """Completa `chosen` gulosamente (maior cobertura, depois menor custo)."""
+        chosen = list(chosen)
+        while rows:
+            c = max(_bits(cols), key=lambda c: (_popcount(self.columns[c] & rows), -self.costs[c], -c))
+            chosen.append(c)
+            rows &= ~self.columns[c]
+            cols &= ~(1 << c)
+        return chosen
+
+    # --- BUSCA ---
+
+    def search(self, rows, cols, chosen, root=False):
+        self.stats["nodes"] += 1
+        # A raiz sempre roda até a solução gulosa: sem ela não há cobertura a devolver
+        if not root and self.deadline is not None and time.perf_counter() > self.deadline:
+            self.timed_out = True
+            return
+
+        chosen = list(chosen)
+        reduced = self.reduce(rows, cols, chosen)
+        if reduced is None:
+            return
+        rows, cols = reduced
+
+        if root:
+            self.stats["cyclic_core_rows"] = _popcount(rows)
+            self.stats["cyclic_core_columns"] = _popcount(cols)
+            if rows:
+                # Solução gulosa inicial: limite superior e reserva se o tempo acabar
+                self._record(self.greedy(rows, cols, chosen))
+
+        if not rows:
+            self._record(chosen)
+            return
+
+        count, literals = self._cost(chosen)
+        bound = self.lower_bound(rows, cols)
+        if root:
+            self.stats["root_lower_bound"] = count + bound
+        if (count + bound, literals) >= self.best_cost:
+            return
+
+        # Ramifica na linha com menos candidatos; cada coluna já tentada fica
+        # excluída dos ramos seguintes (essas soluções já foram exploradas)
+        r = min(_bits(rows), key=lambda r: (_popcount(self.row_cols[r] & cols), r))
+        cand = self.row_cols[r] & cols
+        order = sorted(_bits(cand), key=lambda c: (-_popcount(self.columns[c] & rows), self.costs[c], c))
+        excluded = 0
+        for c in order:
+            self.search(rows & ~self.columns[c], cols & ~(1 << c) & ~excluded, chosen + [c])
+            excluded |= 1 << c
+            if self.timed_out:
+                return
+
+
+def solve_cover(columns, costs, rows=None, time_budget=None):
+    """
+    Cobertura mínima das linhas em `rows` (bitset; padrão: todas as cobertas por
+    alguma coluna) usando as colunas em bitset `columns` com custos `costs`.
+
+    Retorna (índices das colunas escolhidas, estatísticas). Com `time_budget`
+    (segundos), a busca para ao estourar o tempo e devolve a melhor cobertura
+    encontrada até então (no mínimo a gulosa); nesse caso `stats["optimal"]` é
+    False. A cobertura devolvida sempre cobre todas as linhas.
+    """
+    start = time.perf_counter()
+    if rows is None:
+        rows = 0
+        for col in columns:
+            rows |= col
+    search = _CoverSearch(columns, costs, time_budget)
+    search.search(rows, (1 << len(columns)) - 1, [], root=True)
+
+    chosen = sorted(search.best or [])
+    covered = 0
+    for c in chosen:
+        covered |= columns[c]
+    if rows & ~covered:
+        raise ValueError("Há linhas que nenhuma coluna cobre.")
+    search.stats["optimal"] = not search.timed_out
+    search.stats["elapsed"] = time.perf_counter() - start
+    return chosen, search.stats
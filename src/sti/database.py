@@ -1,14 +1,164 @@
 # Arquivo: src/sti/database.py (VERSÃO FINAL E CORRIGIDA)
 
+import atexit
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
 DB_NAME = 'tutor_history.db'
 
+# Espera (ms) por um lock de outra conexão antes de levantar "database is locked"
+BUSY_TIMEOUT_MS = 5000
+# Comandos compilados guardados por conexão (o sqlite3 reaproveita pelo texto do SQL)
+CACHED_STATEMENTS = 256
+
+# --- CONEXÕES ---
+
+_local = threading.local()
+_abertas = []
+_abertas_lock = threading.Lock()
+
+def abrir_conexao(path=None):
+    """
+    Abre uma conexão já configurada: WAL, synchronous=NORMAL e busy_timeout.
+    Fica em modo autocommit; para agrupar comandos, use `transacao`.
+    """
+    conn = sqlite3.connect(path or DB_NAME, isolation_level=None,
+                           cached_statements=CACHED_STATEMENTS)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+def get_connection():
+    """Conexão da thread atual com DB_NAME, aberta uma única vez e reaproveitada."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.path != DB_NAME:
+        if conn is not None:
+            fechar_conexao()
+        conn = abrir_conexao(DB_NAME)
+        _local.conn, _local.path = conn, DB_NAME
+        with _abertas_lock:
+            _abertas.append(conn)
+    return conn
+
+def fechar_conexao():
+    """Fecha a conexão da thread atual (a próxima chamada abre outra)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        _local.conn = None
+        with _abertas_lock:
+            _abertas.remove(conn)
+        conn.close()
+
+@atexit.register
+def _fechar_todas():
+    with _abertas_lock:
+        conexoes = _abertas[:]
+        _abertas.clear()
+    for conn in conexoes:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            # Conexão de outra thread: o sqlite3 não deixa fechar daqui
+            pass
+
+@contextmanager
+def transacao(conn=None, modo='IMMEDIATE'):
+    """
+    Agrupa os comandos do bloco numa transação: commit ao sair, rollback se
+    houver exceção. Dentro de outra transação, apenas participa dela. O modo
+    IMMEDIATE reserva a escrita já no início; DEFERRED serve para leituras.
+    """
+    conn = conn or get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute(f"BEGIN {modo}")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+# --- ESCRITA EM SEGUNDO PLANO ---
+
+_escritora = None
+_lote_local = threading.local()
+
+def iniciar_escrita_assincrona(**opcoes):
+    """
+    Passa o histórico e a habilidade a serem gravados por uma thread escritora
+    (ver `write_behind`), com flush na saída e nos sinais de término.
+    """
+    global _escritora
+    if _escritora is None or _escritora.fechada:
+        from .write_behind import WriteBehindQueue, instalar_sinais
+        _escritora = WriteBehindQueue(DB_NAME, **opcoes)
+        atexit.register(_escritora.close)
+        if threading.current_thread() is threading.main_thread():
+            instalar_sinais(_escritora)
+    return _escritora
+
+def aguardar_escritas():
+    """Bloqueia até as gravações enfileiradas chegarem ao banco."""
+    if _escritora is not None:
+        _escritora.flush()
+
+def metricas_escrita():
+    """Profundidade da fila e latência dos flushes, ou None sem escrita assíncrona."""
+    return _escritora.info() if _escritora is not None else None
+
+def _assincrona():
+    return _escritora is not None and not _escritora.fechada
+
+def executar_escrita(comandos, skills=None):
+    """Grava os comandos (sql, params): na fila, se houver escritora; senão, na hora."""
+    if _assincrona():
+        itens = getattr(_lote_local, 'itens', None)
+        if itens is not None:
+            itens.append((comandos, skills or {}))
+        else:
+            _escritora.put(comandos, skills)
+        return
+    with transacao() as conn:
+        for sql, params in comandos:
+            conn.execute(sql, params)
+
+@contextmanager
+def lote():
+    """
+    Grava juntas as escritas do bloco: com a escritora, viram um único item da
+    fila (mesma transação lá); sem ela, o bloco é uma transação comum.
+    """
+    if not _assincrona():
+        with transacao():
+            yield
+        return
+    if getattr(_lote_local, 'itens', None) is not None:
+        # Já dentro de um lote: as escritas entram no mesmo item, sem travar o banco
+        yield
+        return
+    _lote_local.itens = []
+    try:
+        yield
+        itens = _lote_local.itens
+    finally:
+        _lote_local.itens = None
+    if itens:
+        skills = {}
+        for _, s in itens:
+            skills.update(s)
+        _escritora.put([cmd for comandos, _ in itens for cmd in comandos], skills)
+
+# --- ESQUEMA ---
+
 def inicializar_banco():
     """Cria ou atualiza todas as tabelas necessárias."""
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     cursor = conn.cursor()
 
     # Tabela de usuários (sem mudanças)
@@ -40,11 +190,61 @@ def inicializar_banco():
         )
     ''')
 
-    conn.commit()
-    conn.close()
+    aplicar_migracoes(conn)
     # Popula o banco de questões se ele estiver vazio
     seed_question_bank()
 
+# Migrações do esquema, em ordem; PRAGMA user_version guarda quantas já rodaram
+MIGRACOES = [
+    # 1: o histórico do tutor passa a apontar para a questão (antes, só pelo texto)
+    (
+        "ALTER TABLE historico ADD COLUMN questao_id INTEGER REFERENCES banco_de_questoes (id)",
+        """UPDATE historico SET questao_id = (
+               SELECT q.id FROM banco_de_questoes q WHERE q.expressao = historico.expressao_inicial
+           ) WHERE operacao = 'Tutor Inteligente'""",
+    ),
+    # 2: índices da seleção de questões (anti-join por questão e faixa de dificuldade)
+    (
+        "CREATE INDEX IF NOT EXISTS idx_historico_usuario_op_questao ON historico (usuario_id, operacao, questao_id)",
+        "CREATE INDEX IF NOT EXISTS idx_questoes_dificuldade ON banco_de_questoes (dificuldade)",
+    ),
+    # 3: registro das execuções do treinamento incremental (treinar_modelo)
+    (
+        """CREATE TABLE IF NOT EXISTS treinamentos_modelo (
+               id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL,
+               watermark_inicial INTEGER NOT NULL, watermark_final INTEGER NOT NULL,
+               linhas INTEGER NOT NULL, blocos INTEGER NOT NULL, segundos REAL NOT NULL,
+               modelo_novo INTEGER NOT NULL
+           )""",
+    ),
+    # 4: recomendações pré-calculadas (recommendations), lidas em ordem de posição
+    (
+        """CREATE TABLE IF NOT EXISTS recomendacoes (
+               usuario_id INTEGER NOT NULL, posicao INTEGER NOT NULL,
+               questao_id INTEGER NOT NULL, pontuacao REAL NOT NULL,
+               fonte TEXT NOT NULL, atualizado TEXT NOT NULL,
+               PRIMARY KEY (usuario_id, posicao)
+           ) WITHOUT ROWID""",
+    ),
+]
+
+def aplicar_migracoes(conn=None):
+    """
+    Aplica, cada uma em sua transação, as migrações que o banco ainda não tem.
+    A versão é relida dentro da transação (que já tem o lock de escrita): outro
+    processo iniciando junto pode ter acabado de aplicar a mesma migração.
+    """
+    conn = conn or get_connection()
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRACOES):
+        return
+    for numero, comandos in enumerate(MIGRACOES, start=1):
+        with transacao(conn):
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= numero:
+                continue
+            for sql in comandos:
+                conn.execute(sql)
+            conn.execute(f"PRAGMA user_version = {numero}")
+
 def seed_question_bank():
     """Popula o banco de questões com exemplos iniciais se estiver vazio."""
     questoes = [
@@ -108,81 +308,73 @@ def seed_question_bank():
         ('A*B*C + A*B*D + A*C*D + B*C*D', 'A*B*C + A*B*D + A*C*D', 10, 'Consenso (4 vars)')
     ]
     
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM banco_de_questoes")
-    if cursor.fetchone()[0] == 0:
-        print("Populando o banco de questões pela primeira vez...")
-        cursor.executemany("INSERT INTO banco_de_questoes (expressao, solucao_simplificada, dificuldade, lei_principal) VALUES (?, ?, ?, ?)", questoes)
-        conn.commit()
-    conn.close()
+    with transacao() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM banco_de_questoes")
+        if cursor.fetchone()[0] == 0:
+            print("Populando o banco de questões pela primeira vez...")
+            cursor.executemany("INSERT INTO banco_de_questoes (expressao, solucao_simplificada, dificuldade, lei_principal) VALUES (?, ?, ?, ?)", questoes)
 
 def get_or_create_user(nome):
     """
     Busca um usuário pelo nome. Se não existir, cria um novo.
     Retorna o ID do usuário e um booleano indicando se é um novo usuário.
     """
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    
-    # Busca o usuário
-    cursor.execute("SELECT id FROM usuarios WHERE nome = ?", (nome,))
-    user = cursor.fetchone()
-    
-    if user:
-        # Usuário encontrado
-        conn.close()
-        return user[0], False # Retorna ID e is_new = False
-    else:
-        # Usuário novo, vamos criar
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cursor.execute("INSERT INTO usuarios (nome, data_criacao) VALUES (?, ?)", (nome, timestamp))
-        new_user_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return new_user_id, True # Retorna novo ID e is_new = True
+    with transacao() as conn:
+        cursor = conn.cursor()
+
+        # Busca o usuário
+        cursor.execute("SELECT id FROM usuarios WHERE nome = ?", (nome,))
+        user = cursor.fetchone()
+
+        if user:
+            # Usuário encontrado
+            return user[0], False # Retorna ID e is_new = False
+        else:
+            # Usuário novo, vamos criar
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            cursor.execute("INSERT INTO usuarios (nome, data_criacao) VALUES (?, ?)", (nome, timestamp))
+            return cursor.lastrowid, True # Retorna novo ID e is_new = True
     
 def get_user_skill(usuario_id):
     """Busca o nível de habilidade atual de um usuário."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT nivel_habilidade FROM usuarios WHERE id = ?", (usuario_id,))
-    skill = cursor.fetchone()
-    conn.close()
+    # Atualizações ainda na fila (ou no lote aberto) valem mais que o banco
+    for _, skills in reversed(getattr(_lote_local, 'itens', None) or []):
+        if usuario_id in skills:
+            return skills[usuario_id]
+    if _escritora is not None:
+        pendente = _escritora.skill_pendente(usuario_id)
+        if pendente is not None:
+            return pendente
+    skill = get_connection().execute(
+        "SELECT nivel_habilidade FROM usuarios WHERE id = ?", (usuario_id,)).fetchone()
     return skill[0] if skill else 5.0 # Retorna 5.0 como padrão
 
 def update_user_skill(usuario_id, acertou, dificuldade_questao):
-    """Atualiza o nível de habilidade do usuário com base no desempenho."""
-    skill_atual = get_user_skill(usuario_id)
-    if acertou:
-        # Ganha mais pontos por questões difíceis
-        novo_skill = skill_atual + (dificuldade_questao / 10.0)
-    else:
-        # Perde mais pontos por errar questões fáceis
-        novo_skill = skill_atual - ((11 - dificuldade_questao) / 10.0)
-    
-    # Garante que o nível fique entre 1 e 10
-    novo_skill = max(1.0, min(10.0, novo_skill))
-    
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("UPDATE usuarios SET nivel_habilidade = ? WHERE id = ?", (novo_skill, usuario_id))
-    conn.commit()
-    conn.close()
-    print(f"(Nível de habilidade atualizado para: {novo_skill:.2f})")
-
-def salvar_interacao(usuario_id, operacao, expressao_inicial, resultado_final, dificuldade, passos, detalhes_dict):
-    """Salva uma nova interação, agora associada a um usuário."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    
+    """Atualiza o nível de habilidade do usuário com base no desempenho e retorna o novo nível."""
+    # Leitura e escrita juntas: outra sessão não intercala a sua
+    with lote():
+        skill_atual = get_user_skill(usuario_id)
+        if acertou:
+            # Ganha mais pontos por questões difíceis
+            novo_skill = skill_atual + (dificuldade_questao / 10.0)
+        else:
+            # Perde mais pontos por errar questões fáceis
+            novo_skill = skill_atual - ((11 - dificuldade_questao) / 10.0)
+
+        # Garante que o nível fique entre 1 e 10
+        novo_skill = max(1.0, min(10.0, novo_skill))
+
+        executar_escrita([("UPDATE usuarios SET nivel_habilidade = ? WHERE id = ?", (novo_skill, usuario_id))],
+                         skills={usuario_id: novo_skill})
+    return novo_skill
+
+def salvar_interacao(usuario_id, operacao, expressao_inicial, resultado_final, dificuldade, passos, detalhes_dict, questao_id=None):
+    """Salva uma nova interação, agora associada a um usuário (e à questão, no tutor)."""
     detalhes_json_str = json.dumps(detalhes_dict, ensure_ascii=False)
     timestamp_atual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    cursor.execute('''
-        INSERT INTO historico (usuario_id, timestamp, operacao, expressao_inicial, resultado_final, dificuldade, passos, detalhes_json)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (usuario_id, timestamp_atual, operacao, expressao_inicial, resultado_final, dificuldade, passos, detalhes_json_str))
-
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    executar_escrita([('''
+        INSERT INTO historico (usuario_id, timestamp, operacao, expressao_inicial, resultado_final, dificuldade, passos, detalhes_json, questao_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (usuario_id, timestamp_atual, operacao, expressao_inicial, resultado_final, dificuldade, passos, detalhes_json_str, questao_id))])
@@ -0,0 +1,242 @@
+# Arquivo: src/sti/espresso.py
+# Minimização heurística no estilo Espresso (expandir / irredundante / reduzir).
+#
+# Os cubos são pares (value, mask) como no `simplifier`. A função é dada pela
+# máscara da tabela-verdade (bit i = minterm i), e cada cubo também tem o seu
+# conjunto de pontos como máscara: estender um cubo numa variável é um único
+# deslocamento da máscara, e testar se ele continua implicante é um AND com o
+# conjunto OFF. A multiplicidade de cobertura de cada ponto fica num contador
+# fatiado em bits, para que irredundante e reduzir não recalculem uniões.
+
+from .bitparallel import full_mask, variable_pattern
+
+
+def _popcount(x):
+    return bin(x).count('1')
+
+
+class _CoverCount:
+    """Quantos cubos cobrem cada ponto, como contador binário fatiado em máscaras."""
+
+    def __init__(self):
+        self.slices = []
+
+    def add(self, points):
+        carry = points
+        for i, s in enumerate(self.slices):
+            if not carry:
+                return
+            self.slices[i] = s ^ carry
+            carry &= s
+        if carry:
+            self.slices.append(carry)
+
+    def remove(self, points):
+        borrow = points
+        for i, s in enumerate(self.slices):
+            if not borrow:
+                return
+            self.slices[i] = s ^ borrow
+            borrow &= ~s
+
+    def covered(self):
+        res = 0
+        for s in self.slices:
+            res |= s
+        return res
+
+    def exactly_once(self):
+        if not self.slices:
+            return 0
+        higher = 0
+        for s in self.slices[1:]:
+            higher |= s
+        return self.slices[0] & ~higher
+
+
+class _CubeIndex:
+    """Cubos indexados pelo menor ponto, para achar os contidos num cubo dado."""
+
+    def __init__(self, cubes=()):
+        self.by_low = {}
+        self.size = 0
+        for cube in cubes:
+            self.add(cube)
+
+    def add(self, cube):
+        self.by_low.setdefault(cube[0], set()).add(cube)
+        self.size += 1
+
+    def discard(self, cube):
+        """Remove o cubo; retorna False se ele não estava no índice."""
+        bucket = self.by_low.get(cube[0])
+        if not bucket or cube not in bucket:
+            return False
+        bucket.remove(cube)
+        if not bucket:
+            del self.by_low[cube[0]]
+        self.size -= 1
+        return True
+
+    def contained_in(self, cube):
+        value, mask = cube
+        if (1 << _popcount(mask)) <= len(self.by_low):
+            # Percorre os pontos do cubo (subconjuntos das posições livres)
+            lows = []
+            sub = mask
+            while True:
+                if value | sub in self.by_low:
+                    lows.append(value | sub)
+                if sub == 0:
+                    break
+                sub = (sub - 1) & mask
+        else:
+            lows = [low for low in self.by_low if (low ^ value) & ~mask == 0]
+        return [c for low in lows for c in self.by_low[low] if c[1] & ~mask == 0]
+
+
+class _Espresso:
+
+    def __init__(self, on_mask, num_vars):
+        self.num_vars = num_vars
+        self.full = full_mask(num_vars)
+        self.on = on_mask
+        self.off = self.full & ~on_mask
+        # patterns[p]: pontos com o bit p do minterm ligado
+        self.patterns = [variable_pattern(num_vars - 1 - p, num_vars) for p in range(num_vars)]
+
+    def points(self, cube):
+        value, mask = cube
+        res = self.full
+        for p in range(self.num_vars):
+            if not (mask >> p) & 1:
+                res &= self.patterns[p] if (value >> p) & 1 else ~self.patterns[p]
+        return res
+
+    def expand(self, cube, pts, attract):
+        """
+        Estende o cubo até ele ser primo. As variáveis são liberadas primeiro na
+        direção que mais cobre pontos de `attract` (pontos de outros cubos ou
+        ainda descobertos).
+        """
+        value, mask = cube
+        order = []
+        for p in range(self.num_vars):
+            if (mask >> p) & 1:
+                continue
+            mirror = pts >> (1 << p) if (value >> p) & 1 else pts << (1 << p)
+            if not mirror & self.off:
+                order.append((-_popcount(mirror & attract), p))
+        for _, p in sorted(order):
+            bit = 1 << p
+            mirror = pts >> bit if value & bit else pts << bit
+            if not mirror & self.off:
+                pts |= mirror
+                value &= ~bit
+                mask |= bit
+        return (value, mask), pts
+
+    def supercube(self, pts):
+        """Menor cubo que contém todos os pontos de `pts` (não vazio)."""
+        value = mask = 0
+        for p in range(self.num_vars):
+            ones = pts & self.patterns[p]
+            if ones == pts:
+                value |= 1 << p
+            elif ones:
+                mask |= 1 << p
+        return value, mask
+
+    def initial_cover(self):
+        """Cobertura prima: expande o menor minterm descoberto até acabar."""
+        cover = {}
+        count = _CoverCount()
+        uncovered = self.on
+        while uncovered:
+            mt = (uncovered & -uncovered).bit_length() - 1
+            cube, pts = self.expand((mt, 0), 1 << mt, uncovered)
+            cover[cube] = pts
+            count.add(pts)
+            uncovered &= ~pts
+        return cover, count
+
+    def irredundant(self, cover, count):
+        """Remove cubos cujos pontos todos são cobertos por outros (menores primeiro)."""
+        for cube in sorted(cover, key=lambda c: (_popcount(c[1]), c)):
+            pts = cover[cube]
+            if not pts & count.exactly_once():
+                count.remove(pts)
+                del cover[cube]
+
+    def reduce(self, cover, count):
+        """Encolhe cada cubo (maiores primeiro) ao supercubo dos seus pontos exclusivos."""
+        reduced = {}
+        for cube in sorted(cover, key=lambda c: (-_popcount(c[1]), c)):
+            pts = cover[cube]
+            unique = pts & count.exactly_once()
+            count.remove(pts)
+            if not unique:
+                continue
+            new_cube = self.supercube(unique)
+            if new_cube not in reduced:
+                new_pts = self.points(new_cube)
+                count.add(new_pts)
+                reduced[new_cube] = new_pts
+        return reduced
+
+    def expand_cover(self, cover, count):
+        """Expande todos os cubos (menores primeiro) e descarta os que ficarem contidos."""
+        pending = sorted(cover, key=lambda c: (_popcount(c[1]), c))
+        # Índices pelo menor ponto do cubo (o próprio `value`): um cubo só pode
+        # estar contido no expandido se esse ponto estiver nele
+        pending_index = _CubeIndex(pending)
+        expanded = {}
+        expanded_index = _CubeIndex()
+        for cube in pending:
+            if not pending_index.discard(cube):
+                continue
+            pts = cover[cube]
+            count.remove(pts)
+            new_cube, new_pts = self.expand(cube, pts, count.covered())
+
+            for other in pending_index.contained_in(new_cube):
+                pending_index.discard(other)
+                count.remove(cover[other])
+            for other in expanded_index.contained_in(new_cube):
+                expanded_index.discard(other)
+                count.remove(expanded.pop(other))
+            count.add(new_pts)
+            expanded[new_cube] = new_pts
+            expanded_index.add(new_cube)
+        return expanded
+
+
+def _cost(cover, num_vars):
+    return len(cover), sum(num_vars - _popcount(mask) for _, mask in cover)
+
+
+def espresso(on_mask, num_vars, max_iterations=20):
+    """
+    Minimiza heuristicamente a função cuja tabela-verdade é `on_mask`.
+    Retorna (lista de cubos (value, mask), estatísticas). O resultado é uma
+    cobertura prima e irredundante, mas não necessariamente mínima.
+    """
+    esp = _Espresso(on_mask, num_vars)
+    cover, count = esp.initial_cover()
+    esp.irredundant(cover, count)
+
+    best = dict(cover)
+    best_cost = _cost(best, num_vars)
+    iterations = 0
+    while iterations < max_iterations:
+        iterations += 1
+        cover = esp.reduce(cover, count)
+        cover = esp.expand_cover(cover, count)
+        esp.irredundant(cover, count)
+        cost = _cost(cover, num_vars)
+        if cost >= best_cost:
+            break
+        best, best_cost = dict(cover), cost
+
+    stats = {"iterations": iterations, "cubes": best_cost[0], "literals": best_cost[1]}
+    return sorted(best), stats
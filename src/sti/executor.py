@@ -0,0 +1,279 @@
+# Arquivo: src/sti/executor.py
+# Execução paralela dos jobs do modo em lote (simplify, equivalence,
+# truth_table) num ProcessPoolExecutor.
+#
+# - Os jobs são enviados em blocos de `chunk` para amortizar a troca de
+#   mensagens entre processos.
+# - Prazo por job: dentro do worker, um alarme (SIGALRM) interrompe o job que
+#   passar de `timeout` segundos, e só aquele job vira erro. Como garantia, o
+#   processo principal também mede cada bloco; se um worker não responder (preso
+#   em código C, por exemplo), os workers são mortos, o pool é recriado e os
+#   blocos que estavam em andamento são reenviados.
+# - Se um worker morrer (falta de memória, sinal externo), ou um bloco estourar
+#   o prazo, os jobs suspeitos voltam um a um, sozinhos no pool: só o job que
+#   derruba o worker de novo recebe o erro.
+# - Ordem: 'entrada' (a mesma dos jobs) ou 'conclusao' (conforme terminam).
+# - Contrapressão: no máximo `max_pendentes` blocos entre o envio e a saída
+#   (inclusive os que aguardam a vez na ordem de entrada), e a entrada só é
+#   lida quando há vaga. A memória fica constante, qualquer que seja a entrada.
+
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+from . import batch
+
+ORDENS = ('entrada', 'conclusao')
+CHUNK_SIZE = 16
+# Folga do prazo do bloco medido no processo principal, além do tempo dos jobs
+FOLGA_BLOCO = 1.0
+# Intervalo máximo entre verificações de prazo no processo principal
+INTERVALO_VERIFICACAO = 0.05
+
+_TEM_ALARME = hasattr(signal, 'setitimer')
+
+
+class JobTimeout(BaseException):
+    """Prazo do job esgotado. BaseException para não ser engolida por `except Exception` do motor."""
+
+
+# --- WORKER ---
+
+def _alarme(signum, frame):
+    raise JobTimeout()
+
+
+def iniciar_worker(usar_cache):
+    """Inicializador dos processos do pool: carrega o motor e arma o alarme de prazo."""
+    batch.carregar_motor(usar_cache)
+    if _TEM_ALARME:
+        signal.signal(signal.SIGALRM, _alarme)
+
+
+def _resultado_timeout(job, timeout, inicio=None):
+    res = {"id": job.get('id') if isinstance(job, dict) else None, "ok": False,
+           "erro": f"JobTimeout: job excedeu o prazo de {timeout:g}s."}
+    if inicio is not None:
+        res["tempo_ms"] = {"total": batch._ms(inicio)}
+    return res
+
+
+def executar_job(job, usar_cache, timeout):
+    """`batch.resultado_job` com prazo; roda num processo iniciado por `iniciar_worker`."""
+    inicio = time.perf_counter()
+    res = None
+    try:
+        if timeout and _TEM_ALARME:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            res = batch.resultado_job(job, usar_cache)
+        finally:
+            if timeout and _TEM_ALARME:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    except JobTimeout:
+        # Alarme entre o fim do job e o desarme: o resultado já existe e vale
+        pass
+    return res if res is not None else _resultado_timeout(job, timeout, inicio)
+
+
+def _executar_bloco(jobs, usar_cache, timeout):
+    resultados = [executar_job(job, usar_cache, timeout) for job in jobs]
+    if usar_cache:
+        # Workers saem sem rodar o atexit: grava o que o cache deixou pendente
+        from .result_cache import RESULT_CACHE
+        RESULT_CACHE.flush()
+    return resultados
+
+
+# --- PROCESSO PRINCIPAL ---
+
+class _Tarefa:
+    """Um envio ao pool: `jobs` do bloco `bloco`, a partir da posição `inicio` dele."""
+
+    __slots__ = ('bloco', 'inicio', 'jobs', 'suspeita', 'rodando_desde')
+
+    def __init__(self, bloco, inicio, jobs, suspeita=False):
+        self.bloco = bloco
+        self.inicio = inicio
+        self.jobs = jobs
+        self.suspeita = suspeita
+        self.rodando_desde = None
+
+
+class JobExecutor:
+    """
+    Pool de processos para jobs do modo em lote. `map(jobs)` consome um
+    iterável de jobs (dicts, como os de `batch.iter_jobs`) e gera os
+    resultados de `batch.run_job`.
+    """
+
+    def __init__(self, workers=None, timeout=None, chunk=CHUNK_SIZE, max_pendentes=None,
+                 ordem='entrada', usar_cache=False):
+        if ordem not in ORDENS:
+            raise ValueError(f"Ordem desconhecida: {ordem!r} (use {', '.join(ORDENS)}).")
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.chunk = max(1, chunk)
+        self.max_pendentes = max_pendentes or 2 * self.workers
+        self.ordem = ordem
+        self.usar_cache = usar_cache
+        self._pool = None
+        self.stats = {"jobs": 0, "blocos": 0, "timeouts": 0, "reinicios": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def info(self):
+        return dict(self.stats, workers=self.workers, chunk=self.chunk, max_pendentes=self.max_pendentes)
+
+    def _novo_pool(self):
+        self._pool = ProcessPoolExecutor(self.workers, initializer=iniciar_worker,
+                                         initargs=(self.usar_cache,))
+
+    def _matar_pool(self):
+        # O ProcessPoolExecutor não mata um worker isolado: derruba todos
+        processos = list((getattr(self._pool, '_processes', None) or {}).values())
+        for p in processos:
+            p.kill()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
+        self.stats["reinicios"] += 1
+
+    def _enviar(self, tarefa, pendentes):
+        if self._pool is None:
+            self._novo_pool()
+        futuro = self._pool.submit(_executar_bloco, tarefa.jobs, self.usar_cache, self.timeout)
+        pendentes[futuro] = tarefa
+
+    def _prazo(self, tarefa):
+        """
+        Prazo do bloco contado de quando o futuro passa a 'running'. Esse estado
+        inclui uma espera curta na fila interna do pool, por isso o tempo dobrado.
+        """
+        return tarefa.rodando_desde + 2 * self.timeout * len(tarefa.jobs) + FOLGA_BLOCO
+
+    def _vencidas(self, pendentes):
+        agora = time.monotonic()
+        vencidas = []
+        for futuro, tarefa in pendentes.items():
+            if tarefa.rodando_desde is None and futuro.running():
+                tarefa.rodando_desde = agora
+            if tarefa.rodando_desde is not None and not futuro.done() and agora > self._prazo(tarefa):
+                vencidas.append(futuro)
+        return vencidas
+
+    def _reenviar(self, pendentes, culpados, suspeitas, concluir):
+        """
+        Reenvia (a um pool novo) as tarefas interrompidas. As culpadas (ou todas,
+        se não se sabe qual derrubou o pool) vão job a job para `suspeitas`, que
+        rodam isoladas; um job sozinho culpado vira erro.
+        """
+        interrompidas = list(pendentes.items())
+        pendentes.clear()
+        for futuro, tarefa in interrompidas:
+            if futuro.done() and not futuro.cancelled() and futuro.exception() is None:
+                concluir(tarefa, futuro.result())
+                continue
+            if culpados is not None and futuro not in culpados:
+                self._enviar(tarefa, pendentes)
+                continue
+            # Job sozinho que estourou o prazo, ou suspeito isolado que derrubou o pool
+            if len(tarefa.jobs) == 1 and (culpados is not None or tarefa.suspeita):
+                concluir(tarefa, [self._erro_worker(tarefa.jobs[0], culpados is not None)])
+                continue
+            for i, job in enumerate(tarefa.jobs):
+                suspeitas.append(_Tarefa(tarefa.bloco, tarefa.inicio + i, [job], suspeita=True))
+
+    def _erro_worker(self, job, por_prazo):
+        if por_prazo:
+            return _resultado_timeout(job, self.timeout)
+        return {"id": job.get('id') if isinstance(job, dict) else None, "ok": False,
+                "erro": "BrokenProcessPool: o worker terminou inesperadamente neste job."}
+
+    def map(self, jobs):
+        """Gera os resultados na ordem escolhida, lendo a entrada só quando há vaga."""
+        entrada = iter(jobs)
+        pendentes = {}     # futuro -> _Tarefa
+        parciais = {}      # bloco -> [resultados, quantos faltam]
+        prontos = []       # resultados a emitir (ordem de conclusão)
+        suspeitas = deque()  # jobs a rodar sozinhos depois de uma falha
+        proximo_bloco = 0  # próximo bloco a ler da entrada
+        proximo_emitir = 0 # próximo bloco a emitir (ordem de entrada)
+        fim_entrada = False
+
+        def concluir(tarefa, resultados):
+            self.stats["timeouts"] += sum(not r["ok"] and r["erro"].startswith("JobTimeout") for r in resultados)
+            self.stats["jobs"] += len(resultados)
+            if self.ordem == 'conclusao':
+                prontos.extend(resultados)
+                parcial = parciais[tarefa.bloco]
+                parcial[1] -= len(resultados)
+                if parcial[1] == 0:
+                    del parciais[tarefa.bloco]
+                return
+            parcial = parciais[tarefa.bloco]
+            parcial[0][tarefa.inicio:tarefa.inicio + len(resultados)] = resultados
+            parcial[1] -= len(resultados)
+
+        try:
+            while True:
+                # Suspeitos rodam um por vez com o pool vazio; a entrada espera
+                if suspeitas and not pendentes:
+                    self._enviar(suspeitas.popleft(), pendentes)
+                isolando = suspeitas or any(t.suspeita for t in pendentes.values())
+                # Lê e envia enquanto houver vaga
+                while not isolando and not fim_entrada and len(parciais) < self.max_pendentes:
+                    bloco_jobs = list(islice(entrada, self.chunk))
+                    if not bloco_jobs:
+                        fim_entrada = True
+                        break
+                    espaco = [None] * len(bloco_jobs) if self.ordem == 'entrada' else None
+                    parciais[proximo_bloco] = [espaco, len(bloco_jobs)]
+                    self._enviar(_Tarefa(proximo_bloco, 0, bloco_jobs), pendentes)
+                    self.stats["blocos"] += 1
+                    proximo_bloco += 1
+
+                if self.ordem == 'entrada':
+                    while proximo_emitir in parciais and parciais[proximo_emitir][1] == 0:
+                        prontos.extend(parciais.pop(proximo_emitir)[0])
+                        proximo_emitir += 1
+                yield from prontos
+                prontos.clear()
+
+                if not pendentes:
+                    if fim_entrada and not parciais:
+                        return
+                    continue
+
+                espera = INTERVALO_VERIFICACAO if self.timeout else None
+                feitos, _ = wait(pendentes, timeout=espera, return_when=FIRST_COMPLETED)
+                try:
+                    for futuro in feitos:
+                        resultados = futuro.result()
+                        concluir(pendentes.pop(futuro), resultados)
+                except BrokenProcessPool:
+                    # Um worker morreu: fora do isolamento, não se sabe qual job
+                    self._matar_pool()
+                    self._reenviar(pendentes, None, suspeitas, concluir)
+                    continue
+                if self.timeout:
+                    vencidas = self._vencidas(pendentes)
+                    if vencidas:
+                        self._matar_pool()
+                        self._reenviar(pendentes, set(vencidas), suspeitas, concluir)
+        finally:
+            if pendentes and self._pool is not None:
+                # Consumidor parou no meio: não espera os blocos em andamento
+                self._matar_pool()
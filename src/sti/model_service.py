@@ -0,0 +1,100 @@
+# Arquivo: src/sti/model_service.py
+# Modelo de acerto do tutor carregado uma vez, com as probabilidades pré-calculadas.
+#
+# O modelo só usa (dificuldade, nivel_habilidade), e as dificuldades são
+# inteiras. Então, ao carregar, as probabilidades de acerto são calculadas numa
+# grade dificuldade × habilidade quantizada (passo SKILL_STEP), e a seleção de
+# questão vira consulta à grade. O arquivo é recarregado quando o mtime muda
+# (por exemplo, depois de um novo treinamento).
+
+import os
+import threading
+
+MODEL_PATH = 'modelo_tutor.pkl'
+SKILL_MIN = 1.0
+SKILL_MAX = 10.0
+SKILL_STEP = 0.05
+DIFICULDADE_MAX = 10
+FEATURES = ['dificuldade', 'nivel_habilidade']
+
+
+class ModelService:
+    """Modelo em `path` e a grade de probabilidades; sem arquivo, `disponivel()` é False."""
+
+    def __init__(self, path):
+        self.path = path
+        self.cargas = 0
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._modelo = None
+        self._grade = None
+
+    def _atualizar(self):
+        """Recarrega o modelo se o arquivo mudou; retorna False se não existir."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._mtime = self._modelo = self._grade = None
+            return False
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    import joblib
+                    modelo = joblib.load(self.path)
+                    self._grade = self._calcular_grade(modelo, DIFICULDADE_MAX)
+                    self._modelo, self._mtime = modelo, mtime
+                    self.cargas += 1
+        return True
+
+    @staticmethod
+    def _calcular_grade(modelo, dificuldade_max):
+        """grade[d, k] = P(acerto) na dificuldade d com habilidade SKILL_MIN + k·SKILL_STEP."""
+        import numpy as np
+        import pandas as pd
+
+        skills = np.round(np.arange(SKILL_MIN, SKILL_MAX + SKILL_STEP / 2, SKILL_STEP), 6)
+        difs = np.arange(dificuldade_max + 1)
+        d, s = np.meshgrid(difs, skills, indexing='ij')
+        # Mesmas colunas do treinamento, para o sklearn reconhecer as features
+        X = pd.DataFrame({FEATURES[0]: d.ravel(), FEATURES[1]: s.ravel()})
+        return modelo.predict_proba(X)[:, 1].reshape(d.shape)
+
+    def disponivel(self):
+        return self._atualizar()
+
+    def grade(self, dificuldade_max=DIFICULDADE_MAX):
+        """Grade de probabilidades cobrindo as dificuldades 0..dificuldade_max, ou None sem modelo."""
+        if not self._atualizar():
+            return None
+        grade = self._grade
+        if dificuldade_max >= grade.shape[0]:
+            # Dificuldade acima da grade (questões novas no banco): amplia uma vez
+            with self._lock:
+                self._grade = grade = self._calcular_grade(self._modelo, dificuldade_max)
+        return grade
+
+    @staticmethod
+    def indice_skill(nivel_habilidade):
+        """Coluna da grade para a habilidade (escalar ou array NumPy)."""
+        import numpy as np
+        skill = np.clip(nivel_habilidade, SKILL_MIN, SKILL_MAX)
+        return np.rint((skill - SKILL_MIN) / SKILL_STEP).astype(np.int64)
+
+    def probabilidades(self, nivel_habilidade, dificuldade_max=DIFICULDADE_MAX):
+        """
+        Vetor de P(acerto) por dificuldade (índice = dificuldade, 0..dificuldade_max)
+        para a habilidade dada, ou None sem modelo.
+        """
+        grade = self.grade(dificuldade_max)
+        if grade is None:
+            return None
+        return grade[:dificuldade_max + 1, self.indice_skill(nivel_habilidade)]
+
+    def info(self):
+        return {"carregado": self._modelo is not None, "cargas": self.cargas,
+                "grade": None if self._grade is None else self._grade.shape}
+
+
+# Instância compartilhada pelo tutor e pelas recomendações
+MODELO = ModelService(MODEL_PATH)
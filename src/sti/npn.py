@@ -0,0 +1,192 @@
+# Arquivo: src/sti/npn.py
+# Forma canônica por permutação e negação de entradas, e o cache LRU do `simplify`.
+#
+# Uma transformação T = (perm, phase) leva o minterm x para perm(x) ^ phase, onde
+# perm(x) move o bit p de x para a posição perm[p]. A forma canônica de uma
+# função é a menor máscara entre todas as transformadas; funções que diferem só
+# por renomear ou negar variáveis caem na mesma chave. A negação da SAÍDA não
+# entra: a SOP mínima de ~f não se obtém da SOP de f, então as duas fases ficam
+# em chaves separadas.
+
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import permutations
+from math import factorial, prod
+
+from .bitparallel import variable_pattern, iter_set_bits
+
+# A canonização fixa a fase e a ordem das variáveis pelas contagens dos
+# cofatores (invariantes) e só enumera as escolhas empatadas. Acima destes
+# limites (muitas variáveis, ou variáveis simétricas como na paridade, em que
+# tudo empata) a função fica sem chave e não passa pelo cache: a busca custaria
+# mais que a simplificação que ela evitaria.
+NPN_MAX_VARS = 8
+NPN_MAX_CANDIDATES = 64
+
+
+def permute_bits(x, perm):
+    """Move o bit p de `x` para a posição perm[p]."""
+    res = 0
+    for p, q in enumerate(perm):
+        res |= ((x >> p) & 1) << q
+    return res
+
+
+@lru_cache(maxsize=None)
+def _flip_patterns(num_vars):
+    """patterns[q]: minterms com o bit q ligado."""
+    return [variable_pattern(num_vars - 1 - q, num_vars) for q in range(num_vars)]
+
+
+def _popcount(x):
+    return bin(x).count('1')
+
+
+def _candidates(mask, num_vars):
+    """
+    Transformações (perm, phase) compatíveis com as assinaturas dos cofatores:
+    cada variável fica na fase em que o cofator positivo tem mais minterms e as
+    variáveis vão para as posições em ordem de contagem. Empates são enumerados;
+    se passarem de NPN_MAX_CANDIDATES, retorna None sem enumerar nada.
+    """
+    patterns = _flip_patterns(num_vars)
+    total = _popcount(mask)
+    pre_phase = 0
+    ambiguous = []
+    weights = []
+    for q in range(num_vars):
+        ones = _popcount(mask & patterns[q])
+        if ones < total - ones:
+            pre_phase |= 1 << q
+        elif 2 * ones == total:
+            ambiguous.append(q)
+        weights.append(max(ones, total - ones))
+
+    order = sorted(range(num_vars), key=lambda q: weights[q])
+    groups = []
+    for q in order:
+        if groups and weights[groups[-1][0]] == weights[q]:
+            groups[-1].append(q)
+        else:
+            groups.append([q])
+
+    if prod(factorial(len(g)) for g in groups) << len(ambiguous) > NPN_MAX_CANDIDATES:
+        return None
+
+    perms = [[0] * num_vars]
+    slot = 0
+    for group in groups:
+        slots = range(slot, slot + len(group))
+        slot += len(group)
+        expanded = []
+        for p in perms:
+            for assignment in permutations(slots):
+                new = p[:]
+                for q, target in zip(group, assignment):
+                    new[q] = target
+                expanded.append(new)
+        perms = expanded
+
+    phases = [pre_phase]
+    for q in ambiguous:
+        phases += [ph ^ (1 << q) for ph in phases]
+    return [(tuple(perm), permute_bits(ph, perm)) for perm in perms for ph in phases]
+
+
+def canonical_form(mask, num_vars):
+    """
+    Retorna (máscara canônica, perm, phase) tal que a canônica é a transformada
+    de `mask` por (perm, phase), ou None acima de NPN_MAX_VARS/NPN_MAX_CANDIDATES.
+    """
+    if num_vars > NPN_MAX_VARS:
+        return None
+    candidates = _candidates(mask, num_vars)
+    if candidates is None:
+        return None
+
+    points = list(iter_set_bits(mask))
+    best = None
+    for perm, phase in candidates:
+        cand = 0
+        for x in points:
+            cand |= 1 << (permute_bits(x, perm) ^ phase)
+        if best is None or cand < best[0]:
+            best = (cand, perm, phase)
+    return best
+
+
+def transform_cube(cube, perm, phase):
+    """Imagem do cubo (value, mask) pela transformação (perm, phase)."""
+    value, mask = cube
+    new_mask = permute_bits(mask, perm)
+    return (permute_bits(value, perm) ^ phase) & ~new_mask, new_mask
+
+
+def inverse_transform_cube(cube, perm, phase):
+    """Pré-imagem do cubo (value, mask) pela transformação (perm, phase)."""
+    value, mask = cube
+    inverse = [0] * len(perm)
+    for p, q in enumerate(perm):
+        inverse[q] = p
+    return permute_bits((value ^ phase) & ~mask, inverse), permute_bits(mask, inverse)
+
+
+class NPNCache:
+    """
+    Cache LRU de coberturas mínimas, indexado por (nº de variáveis, forma canônica,
+    método). Guarda a cobertura (e os pares de cubos do log de combinações) já
+    transformada para a canônica e a devolve transformada de volta para a função
+    consultada. Funções sem forma canônica têm chave None e ficam de fora.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self._data = OrderedDict()
+
+    def key(self, mask, num_vars, method):
+        """Retorna (chave, perm, phase) para consultar e gravar a função; chave None se não há forma canônica."""
+        canonical = canonical_form(mask, num_vars)
+        if canonical is None:
+            self.skipped += 1
+            return None, None, 0
+        canon, perm, phase = canonical
+        return (num_vars, canon, method), perm, phase
+
+    def get(self, key, perm, phase):
+        """(cubos, metadados, pares do log) da função consultada, ou None."""
+        if key is None:
+            return None
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        cubes, meta, log_pairs = entry
+        return ([inverse_transform_cube(c, perm, phase) for c in cubes], meta,
+                [tuple(inverse_transform_cube(c, perm, phase) for c in pair) for pair in log_pairs])
+
+    def put(self, key, perm, phase, cubes, meta=None, log_pairs=()):
+        if key is None or self.maxsize <= 0:
+            return
+        self._data[key] = ([transform_cube(c, perm, phase) for c in cubes], meta,
+                           [tuple(transform_cube(c, perm, phase) for c in pair) for pair in log_pairs])
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self._data) > max(maxsize, 0):
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = self.skipped = 0
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "skipped": self.skipped,
+                "size": len(self._data), "maxsize": self.maxsize}
@@ -0,0 +1,258 @@
+# Arquivo: src/sti/numpy_backend.py
+# Backend NumPy em blocos para tabelas-verdade grandes (20+ variáveis).
+#
+# O espaço de atribuições é dividido em blocos de `block_rows` linhas e cada bloco
+# é avaliado de forma vetorizada, como arrays booleanos (1 byte por linha) ou
+# empacotados em uint64 (64 linhas por palavra). A memória de pico depende só do
+# tamanho do bloco (e do número de blocos em voo no pool), nunca de 2^n.
+#
+# Numeração igual à do `bitparallel`: linha i = minterm i, primeira variável é o
+# bit mais significativo; no layout empacotado, o bit j da palavra w é a linha 64*w + j.
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sympy import Integer
+from sympy.logic.boolalg import (
+    And, Or, Not, Xor, Nand, Nor, Implies, Equivalent, ITE,
+    BooleanTrue, BooleanFalse,
+)
+from sympy.core.mul import Mul
+
+from .bitparallel import get_variables
+
+DEFAULT_BLOCK_ROWS = 1 << 20
+LAYOUTS = ('packed', 'bool')
+
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+# Padrão dentro de uma palavra de 64 linhas para as 6 variáveis menos significativas
+_WORD_PATTERNS = [
+    np.uint64(sum(1 << j for j in range(64) if (j >> s) & 1)) for s in range(6)
+]
+
+
+# --- COMPILAÇÃO DA EXPRESSÃO EM UM PROGRAMA LINEAR ---
+
+def build_program(expressions, variables):
+    """
+    Lineariza as árvores sympy numa lista de instruções sem subárvores repetidas.
+    Cada instrução é (op, operandos) com op em 'var', 'const', 'not', 'and', 'or', 'xor'.
+    O resultado é picklável, para ser enviado uma única vez a cada processo do pool.
+    """
+    positions = {var: i for i, var in enumerate(variables)}
+    instructions = []
+    memo = {}
+
+    def emit(op, operands):
+        key = (op, operands)
+        if key not in memo:
+            memo[key] = len(instructions)
+            instructions.append(key)
+        return memo[key]
+
+    def rec(node):
+        if node in positions:
+            return emit('var', positions[node])
+        if isinstance(node, BooleanTrue):
+            return emit('const', True)
+        if isinstance(node, BooleanFalse):
+            return emit('const', False)
+        if isinstance(node, Integer):
+            return emit('const', node != 0)
+        if isinstance(node, Not):
+            return emit('not', rec(node.args[0]))
+        if isinstance(node, (And, Mul)):
+            return emit('and', tuple(rec(a) for a in node.args))
+        if isinstance(node, Or):
+            return emit('or', tuple(rec(a) for a in node.args))
+        if isinstance(node, Xor):
+            return emit('xor', tuple(rec(a) for a in node.args))
+        if isinstance(node, Nand):
+            return emit('not', emit('and', tuple(rec(a) for a in node.args)))
+        if isinstance(node, Nor):
+            return emit('not', emit('or', tuple(rec(a) for a in node.args)))
+        if isinstance(node, Implies):
+            return emit('or', (emit('not', rec(node.args[0])), rec(node.args[1])))
+        if isinstance(node, Equivalent):
+            args = tuple(rec(a) for a in node.args)
+            all_true = emit('and', args)
+            all_false = emit('and', tuple(emit('not', a) for a in args))
+            return emit('or', (all_true, all_false))
+        if isinstance(node, ITE):
+            c, t, f = (rec(a) for a in node.args)
+            return emit('or', (emit('and', (c, t)), emit('and', (emit('not', c), f))))
+        raise TypeError(f"Operador não suportado pelo backend NumPy: {type(node).__name__}")
+
+    outputs = tuple(rec(e) for e in expressions)
+    return tuple(instructions), outputs
+
+
+def _run_program(program, num_vars, start, nrows, layout):
+    """Avalia o programa nas linhas [start, start + nrows) e empilha as saídas."""
+    instructions, outputs = program
+
+    if layout == 'packed':
+        nwords = (nrows + 63) // 64
+        words = np.arange(start // 64, start // 64 + nwords, dtype=np.uint64)
+        ones = np.full(nwords, _ALL_ONES, dtype=np.uint64)
+        zeros = np.zeros(nwords, dtype=np.uint64)
+
+        def var(k):
+            s = num_vars - 1 - k
+            if s < 6:
+                return np.full(nwords, _WORD_PATTERNS[s], dtype=np.uint64)
+            bit = (words >> np.uint64(s - 6)) & np.uint64(1)
+            return np.where(bit.astype(bool), _ALL_ONES, np.uint64(0))
+    else:
+        rows = np.arange(start, start + nrows, dtype=np.uint64)
+        ones = np.ones(nrows, dtype=bool)
+        zeros = np.zeros(nrows, dtype=bool)
+
+        def var(k):
+            s = num_vars - 1 - k
+            return ((rows >> np.uint64(s)) & np.uint64(1)).astype(bool)
+
+    values = []
+    for op, operands in instructions:
+        if op == 'var':
+            res = var(operands)
+        elif op == 'const':
+            res = ones if operands else zeros
+        elif op == 'not':
+            res = ~values[operands]
+        elif op == 'and':
+            res = values[operands[0]].copy()
+            for i in operands[1:]:
+                res &= values[i]
+        elif op == 'or':
+            res = values[operands[0]].copy()
+            for i in operands[1:]:
+                res |= values[i]
+        else:  # xor
+            res = values[operands[0]].copy()
+            for i in operands[1:]:
+                res ^= values[i]
+        values.append(res)
+
+    result = np.stack([values[o] for o in outputs])
+    if layout == 'packed' and nrows % 64:
+        # Zera os bits além da última linha válida (tabelas com menos de 64 linhas)
+        result[:, -1] &= np.uint64((1 << (nrows % 64)) - 1)
+    return result
+
+
+# --- EXECUÇÃO EM BLOCOS (SERIAL OU EM POOL DE PROCESSOS) ---
+
+_worker_state = {}
+
+def _init_worker(program, num_vars, layout):
+    _worker_state['args'] = (program, num_vars, layout)
+
+def _worker_block(start, nrows):
+    program, num_vars, layout = _worker_state['args']
+    return start, _run_program(program, num_vars, start, nrows, layout)
+
+
+def iter_blocks(expressions, variables, block_rows=DEFAULT_BLOCK_ROWS, workers=1,
+                layout='packed', reverse=False):
+    """
+    Gera `(start, array)` para cada bloco, em ordem (ou do fim para o início com
+    `reverse=True`). O array tem uma linha por expressão: palavras uint64 no layout
+    'packed' ou um bool por linha da tabela no layout 'bool'.
+
+    `workers` > 1 distribui os blocos num ProcessPoolExecutor (None = todos os núcleos);
+    no máximo 2 blocos por processo ficam em voo, o que limita a memória.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Layout desconhecido: {layout!r} (use 'packed' ou 'bool').")
+    if block_rows < 64 or block_rows & (block_rows - 1):
+        raise ValueError("block_rows deve ser uma potência de 2 maior ou igual a 64.")
+
+    num_vars = len(variables)
+    program = build_program(expressions, variables)
+    total = 1 << num_vars
+    block_rows = min(block_rows, total)
+    starts = range(0, total, block_rows)
+    if reverse:
+        starts = starts[::-1]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(starts))
+
+    if workers <= 1:
+        for start in starts:
+            yield start, _run_program(program, num_vars, start, block_rows, layout)
+        return
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker,
+        initargs=(program, num_vars, layout),
+    )
+    try:
+        pending = deque()
+        for start in starts:
+            pending.append(pool.submit(_worker_block, start, block_rows))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _unpack_rows(words, nrows):
+    """Desempacota palavras uint64 em um bool por linha, na ordem das linhas."""
+    as_bytes = words.astype('<u8', copy=False).view(np.uint8)
+    return np.unpackbits(as_bytes, bitorder='little')[:nrows].astype(bool)
+
+
+# --- CONSUMIDORES ---
+
+def iter_minterms(expr, variables=None, **options):
+    """Gera os minterms de `expr` em ordem crescente, bloco a bloco."""
+    if variables is None:
+        variables = get_variables(expr)
+    total = 1 << len(variables)
+    layout = options.get('layout', 'packed')
+    for start, block in iter_blocks([expr], variables, **options):
+        nrows = min(total - start, options.get('block_rows', DEFAULT_BLOCK_ROWS))
+        bits = _unpack_rows(block[0], nrows) if layout == 'packed' else block[0]
+        for i in np.flatnonzero(bits):
+            yield start + int(i)
+
+
+def get_vars_and_minterms(expr, **options):
+    """Equivalente ao `simplifier.get_vars_and_minterms`, calculado em blocos NumPy."""
+    variables = get_variables(expr)
+    return variables, list(iter_minterms(expr, variables, **options))
+
+
+def iter_truth_rows(expressions, variables, **options):
+    """
+    Gera `(index, saídas)` na ordem da tabela-verdade impressa (V antes de F, ou
+    seja, do minterm 2^n - 1 até o 0), com um bool por expressão em `saídas`.
+    """
+    total = 1 << len(variables)
+    block_rows = min(options.get('block_rows', DEFAULT_BLOCK_ROWS), total)
+    options = dict(options, reverse=True, layout='bool')
+    for start, block in iter_blocks(expressions, variables, **options):
+        columns = block[:, ::-1].T.tolist()
+        last = min(start + block_rows, total) - 1
+        for offset, outputs in enumerate(columns):
+            yield last - offset, outputs
+
+
+def iter_packed_bytes(expr, variables, **options):
+    """
+    Gera a coluna de `expr` empacotada em bytes (bit i = minterm i, little-endian),
+    bloco a bloco, totalizando ceil(2^n / 8) bytes.
+    """
+    remaining = ((1 << len(variables)) + 7) // 8
+    options = dict(options, layout='packed', reverse=False)
+    for _, block in iter_blocks([expr], variables, **options):
+        chunk = block[0].astype('<u8', copy=False).tobytes()[:remaining]
+        remaining -= len(chunk)
+        yield chunk
@@ -1,9 +1,230 @@
-from sympy.parsing.sympy_parser import (
-    parse_expr, standard_transformations,
-    implicit_multiplication_application
-)
+# Arquivo: src/sti/parser.py
+# Parser das expressões digitadas pelo aluno.
+#
+# Um parser de precedência (Pratt) próprio para os operadores do projeto,
+# do mais forte ao mais fraco:
+#   ~ ¬ ˉ      NÃO (prefixo)
+#   * . · ⋅ &  E (também implícito: "AB", "A(B+C)", "~A B")
+#   + |        OU
+# Cada letra é uma variável, com os dígitos que a seguem ("AB" = A·B, "x1" é a
+# variável x1); 0/1 (e true/false) são as constantes. O resultado é uma árvore
+# leve e compartilhada (nós iguais são o mesmo objeto), convertida para sympy
+# só quando necessário.
+
+import weakref
+from functools import lru_cache
+
+from sympy import Symbol, true, false
+from sympy.logic.boolalg import And, Or, Not
+
+
+class ParseError(ValueError):
+    """Expressão mal formada; `pos` é a posição do problema na string."""
+
+    def __init__(self, msg, pos):
+        super().__init__(f"{msg} (posição {pos})")
+        self.pos = pos
+
+
+# --- ÁRVORE ---
+
+class Node:
+    """
+    Nó imutável: op em {'var', 'const', 'not', 'and', 'or'}. Para 'var', `value`
+    é o nome; para 'const', 0 ou 1. E/OU guardam os filhos achatados.
+    """
+    __slots__ = ('op', 'args', 'value', '_sympy', '__weakref__')
+
+    def __repr__(self):
+        if self.op in ('var', 'const'):
+            return str(self.value)
+        if self.op == 'not':
+            return f"~{self.args[0]!r}"
+        sep = ' & ' if self.op == 'and' else ' | '
+        return f"({sep.join(map(repr, self.args))})"
+
+    def to_sympy(self):
+        """Árvore sympy equivalente (memoizada no próprio nó)."""
+        if self._sympy is None:
+            if self.op == 'var':
+                res = Symbol(self.value)
+            elif self.op == 'const':
+                res = true if self.value else false
+            elif self.op == 'not':
+                res = Not(self.args[0].to_sympy())
+            else:
+                cls = And if self.op == 'and' else Or
+                res = cls(*[a.to_sympy() for a in self.args], evaluate=False)
+            self._sympy = res
+        return self._sympy
+
+
+# Tabela de internação: a mesma (op, args, value) devolve o mesmo nó enquanto
+# houver alguma referência a ele
+_interned = weakref.WeakValueDictionary()
+
+
+def _node(op, args=(), value=None):
+    key = (op, args, value)
+    node = _interned.get(key)
+    if node is None:
+        node = Node()
+        node.op, node.args, node.value, node._sympy = op, args, value, None
+        _interned[key] = node
+    return node
+
+
+def var(name):
+    return _node('var', value=name)
+
+
+def const(value):
+    return _node('const', value=int(bool(value)))
+
+
+def neg(arg):
+    return _node('not', (arg,))
+
+
+def _nary(op, left, right):
+    args = []
+    for a in (left, right):
+        args.extend(a.args if a.op == op else (a,))
+    return _node(op, tuple(args))
+
+
+# --- TOKENS ---
+
+_NOT = frozenset('~¬ˉ')
+_AND = frozenset('*.·⋅&')
+_OR = frozenset('+|')
+_KEYWORDS = {'true': 1, 'True': 1, 'false': 0, 'False': 0}
+
+
+def tokenize(s):
+    """Lista de (tipo, valor, posição): tipo em {'var', 'const', 'not', 'and', 'or', '(', ')'}."""
+    tokens = []
+    i, n = 0, len(s)
+    while i < n:
+        c = s[i]
+        if c.isspace():
+            i += 1
+        elif c in _NOT:
+            # Antes das letras: 'ˉ' (mácron) conta como letra para o Python
+            tokens.append(('not', c, i))
+            i += 1
+        elif c.isalpha():
+            j = i + 1
+            while j < n and s[j].isalpha():
+                j += 1
+            word = s[i:j]
+            if word in _KEYWORDS:
+                tokens.append(('const', _KEYWORDS[word], i))
+                i = j
+                continue
+            # Palavra comum: uma variável por letra, com os dígitos seguintes
+            j = i + 1
+            while j < n and s[j].isdigit():
+                j += 1
+            tokens.append(('var', s[i:j], i))
+            i = j
+        elif c in '01':
+            tokens.append(('const', int(c), i))
+            i += 1
+        elif c in _AND:
+            tokens.append(('and', c, i))
+            i += 1
+        elif c in _OR:
+            tokens.append(('or', c, i))
+            i += 1
+        elif c in '()':
+            tokens.append((c, c, i))
+            i += 1
+        else:
+            raise ParseError(f"Caractere inválido {c!r}", i)
+    tokens.append(('fim', None, n))
+    return tokens
+
+
+# --- PARSER ---
+
+# Força de ligação dos operadores binários
+_BINDING = {'or': 1, 'and': 2}
+# Tokens que iniciam um operando: antes deles, sem operador, vale o E implícito
+_STARTS_OPERAND = frozenset(('var', 'const', 'not', '('))
+
+
+class _Parser:
+    def __init__(self, s):
+        self.tokens = tokenize(s)
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i]
+
+    def take(self):
+        tok = self.tokens[self.i]
+        self.i += 1
+        return tok
+
+    def expression(self, min_bp=0):
+        left = self.operand()
+        while True:
+            kind, _, _ = self.peek()
+            if kind in _BINDING:
+                op = kind
+            elif kind in _STARTS_OPERAND:
+                op = 'and'
+            else:
+                return left
+            if _BINDING[op] <= min_bp:
+                return left
+            if kind == op:
+                self.take()
+            left = _nary(op, left, self.expression(_BINDING[op]))
+
+    def operand(self):
+        kind, value, pos = self.take()
+        if kind == 'var':
+            return var(value)
+        if kind == 'const':
+            return const(value)
+        if kind == 'not':
+            return neg(self.operand())
+        if kind == '(':
+            inner = self.expression()
+            if self.take()[0] != ')':
+                raise ParseError("Faltou fechar o parêntese", self.tokens[self.i - 1][2])
+            return inner
+        if kind == 'fim':
+            raise ParseError("Expressão incompleta", pos)
+        raise ParseError(f"Operando esperado, encontrado {value!r}", pos)
+
+
+# As árvores das últimas strings ficam vivas, e com elas a conversão memoizada:
+# o aluno costuma repetir a mesma expressão entre passos
+@lru_cache(maxsize=1024)
+def parse(s: str):
+    """Analisa a string e devolve a árvore (`Node`)."""
+    p = _Parser(s)
+    tree = p.expression()
+    kind, value, pos = p.peek()
+    if kind != 'fim':
+        raise ParseError(f"Símbolo inesperado {value!r}", pos)
+    return tree
+
 
 def parse_raw(s: str):
+    """Analisa a string e devolve a expressão sympy."""
+    return parse(s).to_sympy()
+
+
+def parse_raw_sympy(s: str):
+    """Caminho antigo, via `parse_expr` do sympy (mantido para comparação)."""
+    from sympy.parsing.sympy_parser import (
+        parse_expr, standard_transformations,
+        implicit_multiplication_application
+    )
     s = (s.replace('⋅','&')
        .replace('·','&')
        .replace('.','&')
@@ -11,11 +232,10 @@ def parse_raw(s: str):
        .replace('+','|')
        .replace('¬','~')
        .replace('ˉ','~')
-       .replace(' ','')    
+       .replace(' ','')
     )
-    expr = parse_expr(
+    return parse_expr(
         s, evaluate=False,
         transformations=standard_transformations +
                         (implicit_multiplication_application,)
     )
-    return expr
\ No newline at end of file
@@ -0,0 +1,172 @@
+# Arquivo: src/sti/recommendations.py
+# Recomendações de questões pré-calculadas por usuário.
+#
+# Um job em lote pontua todos os pares (usuário, questão ainda não feita) de uma
+# vez, como matrizes NumPy, e grava as RECOMENDACOES_POR_USUARIO melhores de
+# cada usuário na tabela `recomendacoes`. Depois de cada resposta só as linhas
+# daquele usuário são recalculadas, e o tutor lê a próxima questão com uma
+# consulta indexada.
+#
+# Pontuação: com o modelo, questões na zona ideal (60% a 80% de acerto) vêm
+# primeiro, e dentro dela as mais próximas de 70%; sem o modelo, vale a faixa de
+# dificuldade de `select_ideal_question_algoritmica`. Um ruído pequeno sorteia
+# entre questões empatadas (mesma dificuldade).
+#
+# Uso: python -m src.sti.recommendations
+
+import time
+from datetime import datetime
+
+import numpy as np
+
+from . import database
+from .model_service import MODELO
+
+RECOMENDACOES_POR_USUARIO = 20
+# Usuários pontuados por vez no job em lote (limita a matriz usuários × questões).
+# `_respondidas` usa um `?` por usuário: o SQLite anterior à 3.32 aceita só 999.
+BLOCO_USUARIOS = 500
+ZONA_IDEAL = (0.60, 0.80)
+ALVO = 0.70
+
+_rng = np.random.default_rng()
+
+SQL_PROXIMA = """
+    SELECT q.id, q.expressao, q.solucao_simplificada, q.dificuldade, q.lei_principal, r.pontuacao
+    FROM recomendacoes r
+    JOIN banco_de_questoes q ON q.id = r.questao_id
+    WHERE r.usuario_id = ? AND NOT EXISTS (
+        SELECT 1 FROM historico h
+        WHERE h.usuario_id = r.usuario_id AND h.operacao = 'Tutor Inteligente' AND h.questao_id = r.questao_id
+    )
+    ORDER BY r.posicao LIMIT 1
+"""
+
+
+def pontuar(skills, dificuldades, respondidas):
+    """
+    Matriz (usuários × questões) de pontuações; maior é melhor e as questões já
+    respondidas ficam com -inf. Retorna também a fonte ('modelo' ou 'regra').
+    """
+    skills = np.asarray(skills, dtype=np.float64)
+    dificuldades = np.asarray(dificuldades, dtype=np.int64)
+    ruido = _rng.random((len(skills), len(dificuldades))) * 1e-3
+
+    grade = MODELO.grade(int(dificuldades.max())) if len(dificuldades) else None
+    if grade is not None:
+        prob = grade[dificuldades[None, :], MODELO.indice_skill(skills)[:, None]]
+        na_zona = (prob >= ZONA_IDEAL[0]) & (prob <= ZONA_IDEAL[1])
+        pontos = na_zona + (1.0 - np.abs(prob - ALVO)) + ruido
+        fonte = 'modelo'
+    else:
+        minimo = np.trunc(skills - 1).astype(np.int64)[:, None]
+        maximo = np.trunc(skills + 2).astype(np.int64)[:, None]
+        na_faixa = (dificuldades[None, :] >= minimo) & (dificuldades[None, :] <= maximo)
+        pontos = na_faixa + ruido
+        fonte = 'regra'
+    pontos[respondidas] = -np.inf
+    return pontos, fonte
+
+
+def _melhores(pontos, k):
+    """Índices das k maiores pontuações finitas de cada linha, em ordem decrescente."""
+    k = min(k, pontos.shape[1])
+    if k == 0:
+        return [[] for _ in range(pontos.shape[0])]
+    topo = np.argpartition(-pontos, k - 1, axis=1)[:, :k]
+    ordem = np.argsort(-np.take_along_axis(pontos, topo, axis=1), axis=1)
+    topo = np.take_along_axis(topo, ordem, axis=1)
+    return [[j for j in linha if np.isfinite(pontos[i, j])] for i, linha in enumerate(topo)]
+
+
+def _carregar_questoes(conn):
+    linhas = conn.execute("SELECT id, dificuldade FROM banco_de_questoes ORDER BY id").fetchall()
+    ids = np.array([l[0] for l in linhas], dtype=np.int64)
+    return ids, np.array([l[1] for l in linhas], dtype=np.int64)
+
+
+def _respondidas(conn, usuario_ids, questao_ids):
+    """Matriz booleana (usuários × questões) das questões já feitas no tutor."""
+    linha = {u: i for i, u in enumerate(usuario_ids)}
+    coluna = {q: j for j, q in enumerate(questao_ids)}
+    matriz = np.zeros((len(usuario_ids), len(questao_ids)), dtype=bool)
+    marcadores = ", ".join("?" * len(usuario_ids))
+    for u, q in conn.execute(
+            f"SELECT DISTINCT usuario_id, questao_id FROM historico WHERE operacao = 'Tutor Inteligente'"
+            f" AND questao_id IS NOT NULL AND usuario_id IN ({marcadores})", list(usuario_ids)):
+        if q in coluna:
+            matriz[linha[u], coluna[q]] = True
+    return matriz
+
+
+def _linhas_recomendacao(usuario_ids, questao_ids, pontos, fonte, k):
+    agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    linhas = []
+    for i, escolhidas in enumerate(_melhores(pontos, k)):
+        for posicao, j in enumerate(escolhidas):
+            linhas.append((int(usuario_ids[i]), posicao, int(questao_ids[j]), float(pontos[i, j]), fonte, agora))
+    return linhas
+
+
+SQL_INSERE = "INSERT INTO recomendacoes (usuario_id, posicao, questao_id, pontuacao, fonte, atualizado) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+def recalcular_todas(k=RECOMENDACOES_POR_USUARIO, db_path=None):
+    """Job em lote: refaz as recomendações de todos os usuários. Retorna estatísticas."""
+    inicio = time.perf_counter()
+    conn = database.abrir_conexao(db_path)
+    try:
+        database.aplicar_migracoes(conn)
+        questao_ids, dificuldades = _carregar_questoes(conn)
+        usuarios = conn.execute("SELECT id, nivel_habilidade FROM usuarios ORDER BY id").fetchall()
+        stats = {"usuarios": len(usuarios), "questoes": len(questao_ids), "linhas": 0, "fonte": None}
+        with database.transacao(conn):
+            conn.execute("DELETE FROM recomendacoes")
+            for a in range(0, len(usuarios), BLOCO_USUARIOS):
+                bloco = usuarios[a:a + BLOCO_USUARIOS]
+                usuario_ids = [u for u, _ in bloco]
+                skills = [s if s is not None else 5.0 for _, s in bloco]
+                pontos, stats["fonte"] = pontuar(skills, dificuldades, _respondidas(conn, usuario_ids, questao_ids))
+                linhas = _linhas_recomendacao(usuario_ids, questao_ids, pontos, stats["fonte"], k)
+                conn.executemany(SQL_INSERE, linhas)
+                stats["linhas"] += len(linhas)
+    finally:
+        conn.close()
+    stats["segundos"] = time.perf_counter() - inicio
+    return stats
+
+
+def atualizar_usuario(usuario_id, respondida=None, k=RECOMENDACOES_POR_USUARIO):
+    """
+    Recalcula as recomendações de um usuário depois de uma resposta. A questão
+    `respondida` e a habilidade nova podem ainda estar na fila de escrita, então
+    entram explicitamente; a gravação também passa pela fila.
+    """
+    conn = database.get_connection()
+    questao_ids, dificuldades = _carregar_questoes(conn)
+    respondidas = _respondidas(conn, [usuario_id], questao_ids)
+    if respondida is not None:
+        respondidas[0, questao_ids == respondida] = True
+    pontos, fonte = pontuar([database.get_user_skill(usuario_id)], dificuldades, respondidas)
+    linhas = _linhas_recomendacao([usuario_id], questao_ids, pontos, fonte, k)
+    database.executar_escrita(
+        [("DELETE FROM recomendacoes WHERE usuario_id = ?", (usuario_id,))] + [(SQL_INSERE, l) for l in linhas])
+
+
+def proxima_questao(usuario_id):
+    """A melhor questão recomendada ainda não feita, ou None se não houver recomendação."""
+    linha = database.get_connection().execute(SQL_PROXIMA, (usuario_id,)).fetchone()
+    if linha is None:
+        return None
+    return {"id": linha[0], "expressao": linha[1], "solucao": linha[2], "dificuldade": linha[3],
+            "lei": linha[4], "pontuacao": linha[5]}
+
+
+def main():
+    stats = recalcular_todas()
+    print(f"{stats['linhas']} recomendações para {stats['usuarios']} usuário(s) e "
+          f"{stats['questoes']} questões (fonte: {stats['fonte'] or '-'}) em {stats['segundos']:.2f}s.")
+
+
+if __name__ == '__main__':
+    main()
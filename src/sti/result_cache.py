@@ -0,0 +1,208 @@
+# Arquivo: src/sti/result_cache.py
+# Cache persistente (SQLite, no mesmo banco do tutor) dos resultados de
+# simplificação e equivalência, para que sobrevivam entre sessões.
+#
+# A chave é o tipo do resultado, o número de variáveis e a assinatura da
+# tabela-verdade (hash da máscara sobre as variáveis ordenadas), então
+# expressões diferentes da mesma função compartilham a entrada. Os cubos e o
+# log são posicionais e valem para quaisquer nomes de variáveis.
+
+import atexit
+import hashlib
+import json
+import time
+
+from sympy import true, false
+from sympy.logic.boolalg import Or
+
+from . import database
+from .bitparallel import get_variables, evaluate_mask, mask_to_minterms, row_values
+from .counterexample import find_counterexample
+from .simplifier import (
+    simplify, get_vars_and_mask, term_to_expr, cube_to_str, SIMPLIFIER_VERSION,
+)
+
+# Acima disso calcular a máscara só para gerar a chave não compensa
+RESULT_CACHE_MAX_VARS = 16
+CACHE_MAX_ENTRIES = 5000
+CACHE_BATCH_SIZE = 32
+
+
+def _signature(*masks, num_vars):
+    n_bytes = ((1 << num_vars) + 7) // 8
+    digest = hashlib.sha1()
+    for mask in masks:
+        digest.update(mask.to_bytes(n_bytes, 'little'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Entradas (tipo, nº de variáveis, assinatura) -> JSON do resultado. As
+    escritas e as atualizações de último acesso ficam pendentes e vão ao banco
+    em lote (a cada `batch_size` ou no `flush`). Entradas de outra versão do
+    simplificador são apagadas ao abrir, e acima de `max_entries` saem as
+    menos usadas recentemente.
+    """
+
+    def __init__(self, db_path=None, max_entries=CACHE_MAX_ENTRIES, batch_size=CACHE_BATCH_SIZE):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._pending = {}
+        self._touched = {}
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = database.abrir_conexao(self.db_path)
+            with database.transacao(self._conn) as conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS cache_resultados (
+                        chave TEXT PRIMARY KEY, tipo TEXT NOT NULL, num_vars INTEGER NOT NULL,
+                        versao INTEGER NOT NULL, resultado_json TEXT NOT NULL, ultimo_acesso REAL NOT NULL
+                    )
+                ''')
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_acesso ON cache_resultados (ultimo_acesso)")
+                conn.execute("DELETE FROM cache_resultados WHERE versao != ?", (SIMPLIFIER_VERSION,))
+        return self._conn
+
+    @staticmethod
+    def _key(tipo, num_vars, signature):
+        return f"{tipo}:{num_vars}:{signature}"
+
+    def get(self, tipo, num_vars, signature):
+        key = self._key(tipo, num_vars, signature)
+        if key in self._pending:
+            self.hits += 1
+            return self._pending[key][2]
+        row = self._connect().execute(
+            "SELECT resultado_json FROM cache_resultados WHERE chave = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        self._maybe_flush()
+        return json.loads(row[0])
+
+    def put(self, tipo, num_vars, signature, value):
+        key = self._key(tipo, num_vars, signature)
+        self._pending[key] = (tipo, num_vars, value)
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._pending) + len(self._touched) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Grava as entradas e os acessos pendentes e poda o excesso (LRU)."""
+        if not self._pending and not self._touched:
+            return
+        now = time.time()
+        with database.transacao(self._connect()) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_resultados VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, tipo, n, SIMPLIFIER_VERSION, json.dumps(value, ensure_ascii=False), now)
+                 for key, (tipo, n, value) in self._pending.items()])
+            conn.executemany(
+                "UPDATE cache_resultados SET ultimo_acesso = ? WHERE chave = ?",
+                [(ts, key) for key, ts in self._touched.items()])
+            conn.execute('''
+                DELETE FROM cache_resultados WHERE chave IN (
+                    SELECT chave FROM cache_resultados ORDER BY ultimo_acesso DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+        self._pending.clear()
+        self._touched.clear()
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "pending": len(self._pending)}
+
+
+RESULT_CACHE = ResultCache()
+atexit.register(RESULT_CACHE.close)
+
+
+# --- SIMPLIFICAÇÃO ---
+
+def _result_to_json(result):
+    if "steps" in result:
+        return {"constant": result["final_sop"] == true, "steps": result["steps"]}
+    value = {key: result[key] for key in ("combination_log", "method", "exact", "cover_stats")}
+    value["cubes"] = [list(c) for c in result["final_cubes"]]
+    value["has_minterms"] = result["has_minterms"]
+    for key in ("espresso_stats", "consensus_stats"):
+        if key in result:
+            value[key] = result[key]
+    return value
+
+
+def _result_from_json(value, expr, variables, mask):
+    value = dict(value)
+    if "constant" in value:
+        return {"final_sop": true if value["constant"] else false, "steps": value["steps"]}
+    num_vars = len(variables)
+    cubes = [tuple(c) for c in value.pop("cubes")]
+    terms = [term_to_expr(variables, cube_to_str(c, num_vars)) for c in cubes]
+    result = {
+        "initial_expr": expr,
+        "variables": variables,
+        "minterms": mask_to_minterms(mask) if value["has_minterms"] else [],
+        "final_sop": Or(*terms) if len(terms) > 1 else terms[0],
+        "final_cubes": cubes,
+    }
+    result.update(value)
+    return result
+
+
+def simplify_cached(expr, cache=None):
+    """`simplify` consultando antes o cache persistente."""
+    cache = cache or RESULT_CACHE
+    variables = get_variables(expr)
+    if len(variables) > RESULT_CACHE_MAX_VARS:
+        return simplify(expr)
+
+    variables, mask = get_vars_and_mask(expr)
+    signature = _signature(mask, num_vars=len(variables))
+    value = cache.get('simplificacao', len(variables), signature)
+    if value is not None:
+        return _result_from_json(value, expr, variables, mask)
+
+    result = simplify(expr)
+    cache.put('simplificacao', len(variables), signature, _result_to_json(result))
+    return result
+
+
+# --- EQUIVALÊNCIA ---
+
+def find_counterexample_cached(e1, e2, backend='auto', cache=None):
+    """`find_counterexample` consultando antes o cache persistente."""
+    cache = cache or RESULT_CACHE
+    variables = get_variables(e1, e2)
+    num_vars = len(variables)
+    if num_vars > RESULT_CACHE_MAX_VARS:
+        return find_counterexample(e1, e2, backend=backend)
+
+    signature = _signature(evaluate_mask(e1, variables), evaluate_mask(e2, variables), num_vars=num_vars)
+    value = cache.get('equivalencia', num_vars, signature)
+    if value is not None:
+        row = value["contraexemplo"]
+        return None if row is None else dict(zip(variables, row_values(row, num_vars)))
+
+    ce = find_counterexample(e1, e2, backend=backend)
+    row = None
+    if ce is not None:
+        row = 0
+        for var in variables:
+            row = (row << 1) | int(bool(ce.get(var, False)))
+    cache.put('equivalencia', num_vars, signature, {"contraexemplo": row})
+    return ce
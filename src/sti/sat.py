@@ -0,0 +1,387 @@
+# Arquivo: src/sti/sat.py
+# Verificação de equivalência por SAT: codificação de Tseitin + solver CDCL em Python puro.
+#
+# Para saber se e1 e e2 são equivalentes, codificamos Xor(e1, e2) em CNF e
+# perguntamos ao solver se existe atribuição que a satisfaça. Se existir, ela é
+# um contraexemplo; se a fórmula for UNSAT, as expressões são equivalentes.
+# Ao contrário da enumeração, o custo não cresce como 2^n para instâncias fáceis.
+#
+# Literais seguem a convenção DIMACS: a variável v é o inteiro v > 0 e sua
+# negação é -v.
+
+import heapq
+
+from sympy import Integer
+from sympy.logic.boolalg import (
+    And, Or, Not, Xor, Nand, Nor, Implies, Equivalent, ITE,
+    BooleanTrue, BooleanFalse,
+)
+from sympy.core.mul import Mul
+
+from .bitparallel import get_variables
+
+# --- CODIFICAÇÃO DE TSEITIN ---
+
+class TseitinEncoder:
+    """Converte árvores sympy em cláusulas CNF, com uma variável nova por porta."""
+
+    def __init__(self, variables=()):
+        self.clauses = []
+        self.num_vars = 0
+        self.var_map = {}
+        self._memo = {}
+        self._true = None
+        # As variáveis de entrada recebem os primeiros índices, na ordem dada
+        for var in variables:
+            self.var_map[var] = self._new_var()
+
+    def _new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def _true_lit(self):
+        if self._true is None:
+            self._true = self._new_var()
+            self.clauses.append([self._true])
+        return self._true
+
+    def _and_gate(self, lits):
+        g = self._new_var()
+        for a in lits:
+            self.clauses.append([-g, a])
+        self.clauses.append([g] + [-a for a in lits])
+        return g
+
+    def _or_gate(self, lits):
+        g = self._new_var()
+        for a in lits:
+            self.clauses.append([g, -a])
+        self.clauses.append([-g] + list(lits))
+        return g
+
+    def _xor_gate(self, a, b):
+        g = self._new_var()
+        self.clauses.extend([[-g, a, b], [-g, -a, -b], [g, -a, b], [g, a, -b]])
+        return g
+
+    def _ite_gate(self, c, t, f):
+        g = self._new_var()
+        self.clauses.extend([[-g, -c, t], [-g, c, f], [g, -c, -t], [g, c, -f]])
+        return g
+
+    def encode(self, node):
+        """Retorna o literal que representa `node`, gerando as cláusulas necessárias."""
+        if node in self._memo:
+            return self._memo[node]
+
+        if node.is_Symbol:
+            if node not in self.var_map:
+                self.var_map[node] = self._new_var()
+            lit = self.var_map[node]
+        elif isinstance(node, BooleanTrue):
+            lit = self._true_lit()
+        elif isinstance(node, BooleanFalse):
+            lit = -self._true_lit()
+        elif isinstance(node, Integer):
+            lit = self._true_lit() if node != 0 else -self._true_lit()
+        elif isinstance(node, Not):
+            lit = -self.encode(node.args[0])
+        elif isinstance(node, (And, Mul)):
+            lit = self._and_gate([self.encode(a) for a in node.args])
+        elif isinstance(node, Or):
+            lit = self._or_gate([self.encode(a) for a in node.args])
+        elif isinstance(node, Nand):
+            lit = -self._and_gate([self.encode(a) for a in node.args])
+        elif isinstance(node, Nor):
+            lit = -self._or_gate([self.encode(a) for a in node.args])
+        elif isinstance(node, Xor):
+            args = [self.encode(a) for a in node.args]
+            lit = args[0]
+            for a in args[1:]:
+                lit = self._xor_gate(lit, a)
+        elif isinstance(node, Implies):
+            lit = self._or_gate([-self.encode(node.args[0]), self.encode(node.args[1])])
+        elif isinstance(node, Equivalent):
+            args = [self.encode(a) for a in node.args]
+            lit = self._or_gate([self._and_gate(args), self._and_gate([-a for a in args])])
+        elif isinstance(node, ITE):
+            lit = self._ite_gate(*(self.encode(a) for a in node.args))
+        else:
+            raise TypeError(f"Operador não suportado pela codificação de Tseitin: {type(node).__name__}")
+
+        self._memo[node] = lit
+        return lit
+
+    def assert_lit(self, lit):
+        self.clauses.append([lit])
+
+
+def tseitin_xor(e1, e2, variables=None):
+    """CNF satisfatível exatamente quando e1 e e2 diferem. Retorna o codificador."""
+    if variables is None:
+        variables = get_variables(e1, e2)
+    enc = TseitinEncoder(variables)
+    enc.assert_lit(enc._xor_gate(enc.encode(e1), enc.encode(e2)))
+    return enc
+
+
+# --- SOLVER CDCL ---
+
+def _luby(i):
+    """i-ésimo termo (a partir de 1) da sequência de Luby: 1 1 2 1 1 2 4 ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class CDCLSolver:
+    """
+    Solver CDCL: dois literais observados, aprendizado 1-UIP com backjumping,
+    heurística de atividade (VSIDS), salvamento de fase e reinícios de Luby.
+    """
+
+    RESTART_BASE = 100
+    VAR_DECAY = 0.95
+
+    def __init__(self, num_vars, clauses):
+        self.num_vars = num_vars
+        self.value = [0] * (num_vars + 1)     # 1 = verdadeiro, -1 = falso, 0 = livre
+        self.level = [0] * (num_vars + 1)
+        self.reason = [None] * (num_vars + 1)
+        self.phase = [-1] * (num_vars + 1)    # começa tentando falso
+        self.activity = [0.0] * (num_vars + 1)
+        self.var_inc = 1.0
+        self.watches = {}
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.heap = [(0.0, v) for v in range(1, num_vars + 1)]
+        self.stats = {"decisions": 0, "propagations": 0, "conflicts": 0,
+                      "learned": 0, "restarts": 0}
+        self.ok = True
+
+        for clause in clauses:
+            if not self._add_clause(clause):
+                self.ok = False
+                break
+
+    # -- utilidades --
+
+    def _lit_value(self, lit):
+        v = self.value[abs(lit)]
+        return v if lit > 0 else -v
+
+    def _watch(self, lit, clause):
+        self.watches.setdefault(lit, []).append(clause)
+
+    def _add_clause(self, clause):
+        lits = set(clause)
+        if any(-l in lits for l in lits):
+            return True  # tautologia
+        lits = [l for l in lits if self._lit_value(l) != -1]
+        if any(self._lit_value(l) == 1 for l in lits):
+            return True
+        if not lits:
+            return False
+        if len(lits) == 1:
+            self._enqueue(lits[0], None)
+            return self._propagate() is None
+        self._watch(lits[0], lits)
+        self._watch(lits[1], lits)
+        return True
+
+    def _enqueue(self, lit, reason):
+        v = abs(lit)
+        self.value[v] = 1 if lit > 0 else -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _propagate(self):
+        """Propagação unitária. Retorna a cláusula em conflito ou None."""
+        value = self.value
+        while self.qhead < len(self.trail):
+            p = self.trail[self.qhead]
+            self.qhead += 1
+            self.stats["propagations"] += 1
+            false_lit = -p
+            ws = self.watches.get(false_lit)
+            if not ws:
+                continue
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                c = ws[i]
+                i += 1
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], c[0]
+                first = c[0]
+                fv = value[abs(first)]
+                if (fv if first > 0 else -fv) == 1:
+                    ws[j] = c
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    lk = c[k]
+                    vk = value[abs(lk)]
+                    if (vk if lk > 0 else -vk) != -1:
+                        c[1], c[k] = lk, c[1]
+                        self._watch(lk, c)
+                        break
+                else:
+                    ws[j] = c
+                    j += 1
+                    if (fv if first > 0 else -fv) == -1:
+                        while i < n:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        return c
+                    self._enqueue(first, c)
+            del ws[j:]
+        return None
+
+    def _bump(self, v):
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[u], u) for u in range(1, self.num_vars + 1)
+                         if self.value[u] == 0]
+            heapq.heapify(self.heap)
+        elif self.value[v] == 0:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+    def _analyze(self, confl):
+        """Análise 1-UIP: retorna (cláusula aprendida, nível de backjump)."""
+        seen = set()
+        learnt = [0]
+        counter = 0
+        p = None
+        idx = len(self.trail) - 1
+        cur_level = len(self.trail_lim)
+
+        while True:
+            for q in confl:
+                if q == p:
+                    continue
+                v = abs(q)
+                if v not in seen and self.level[v] > 0:
+                    seen.add(v)
+                    self._bump(v)
+                    if self.level[v] == cur_level:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while abs(self.trail[idx]) not in seen:
+                idx -= 1
+            p = self.trail[idx]
+            idx -= 1
+            confl = self.reason[abs(p)]
+            seen.discard(abs(p))
+            counter -= 1
+            if counter == 0:
+                break
+
+        learnt[0] = -p
+        if len(learnt) == 1:
+            return learnt, 0
+        # O segundo literal observado deve ser o de maior nível (fora o atual)
+        best = max(range(1, len(learnt)), key=lambda k: self.level[abs(learnt[k])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def _backtrack(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        lim = self.trail_lim[level]
+        for lit in self.trail[lim:]:
+            v = abs(lit)
+            self.phase[v] = self.value[v]
+            self.value[v] = 0
+            self.reason[v] = None
+            heapq.heappush(self.heap, (-self.activity[v], v))
+        del self.trail[lim:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch_var(self):
+        while self.heap:
+            act, v = heapq.heappop(self.heap)
+            if self.value[v] == 0 and -act == self.activity[v]:
+                return v
+        for v in range(1, self.num_vars + 1):
+            if self.value[v] == 0:
+                return v
+        return None
+
+    def solve(self):
+        """Retorna o modelo (lista de bools indexada pela variável) ou None se UNSAT."""
+        if not self.ok:
+            return None
+        if self._propagate() is not None:
+            return None
+
+        restart_num = 1
+        conflicts_until_restart = self.RESTART_BASE * _luby(restart_num)
+
+        while True:
+            confl = self._propagate()
+            if confl is not None:
+                self.stats["conflicts"] += 1
+                if not self.trail_lim:
+                    return None
+                learnt, back_level = self._analyze(confl)
+                self._backtrack(back_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._watch(learnt[0], learnt)
+                    self._watch(learnt[1], learnt)
+                    self._enqueue(learnt[0], learnt)
+                    self.stats["learned"] += 1
+                self.var_inc /= self.VAR_DECAY
+                conflicts_until_restart -= 1
+                continue
+
+            if conflicts_until_restart <= 0:
+                self.stats["restarts"] += 1
+                restart_num += 1
+                conflicts_until_restart = self.RESTART_BASE * _luby(restart_num)
+                self._backtrack(0)
+                continue
+
+            v = self._pick_branch_var()
+            if v is None:
+                return [False] + [self.value[u] == 1 for u in range(1, self.num_vars + 1)]
+            self.stats["decisions"] += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(v if self.phase[v] == 1 else -v, None)
+
+
+def solve_cnf(num_vars, clauses):
+    """Resolve uma CNF; retorna (modelo ou None, estatísticas)."""
+    solver = CDCLSolver(num_vars, clauses)
+    model = solver.solve()
+    return model, solver.stats
+
+
+def find_counterexample_sat(e1, e2):
+    """
+    Contraexemplo via SAT: uma atribuição em que e1 e e2 diferem, ou None se
+    forem equivalentes. Diferente da enumeração, não é necessariamente o menor
+    minterm em que elas diferem.
+    """
+    syms = get_variables(e1, e2)
+    enc = tseitin_xor(e1, e2, syms)
+    model, _ = solve_cnf(enc.num_vars, enc.clauses)
+    if model is None:
+        return None
+    return {sym: model[enc.var_map[sym]] for sym in syms}
@@ -0,0 +1,481 @@
+# Arquivo: src/sti/server.py
+# Serviço HTTP/JSON local (asyncio, só biblioteca padrão) com o motor e o tutor.
+#
+# Rotas (corpo e resposta em JSON):
+#   POST /parse          {"expr"}                      forma canônica e variáveis
+#   POST /simplify       {"expr"}
+#   POST /equivalence    {"expr", "expr2"}
+#   POST /truth_table    {"expr", "expr2"?}
+#   POST /tutor/proxima  {"usuario"}                   próxima questão do aluno
+#   POST /tutor/passo    {"usuario", "questao_id", "passo"}
+#   GET  /metrics        latência (p50/p90/p99) por rota, coalescências, fila de escrita
+#   GET  /health
+#
+# As rotas do motor rodam num pool de processos (os mesmos workers do modo em
+# lote, com prazo por job), e requisições idênticas que chegam juntas
+# compartilham um único cálculo. O tutor roda numa thread própria: ele usa o
+# banco e o gerenciador de BDD compartilhado. A expressão atual e os passos de
+# cada (usuário, questão) ficam no servidor, para que o 'fim' só valha para uma
+# cadeia de passos que saiu da própria questão; ao reiniciar o servidor, a
+# questão recomeça da expressão inicial.
+#
+# Uso: python -m src.sti.server [--host 127.0.0.1] [--port 8765] [--workers N] [--timeout S]
+
+import argparse
+import asyncio
+import json
+import math
+import signal
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from . import database
+from .executor import FOLGA_BLOCO, executar_job, iniciar_worker
+
+HOST = '127.0.0.1'
+PORTA = 8765
+TIMEOUT_JOB = 10.0
+CORPO_MAX = 1 << 20
+CABECALHO_MAX = 16 * 1024
+# Conexão keep-alive ociosa por mais que isso é fechada
+OCIOSO_MAX = 30.0
+AMOSTRAS_LATENCIA = 10000
+# Questões em andamento guardadas; acima disso sai a menos usada
+SESSOES_MAX = 10000
+
+ROTAS_MOTOR = {'/parse': 'parse', '/simplify': 'simplify', '/equivalence': 'equivalence',
+               '/truth_table': 'truth_table'}
+ROTAS_TUTOR = ('/tutor/proxima', '/tutor/passo')
+
+STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+          413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+          504: 'Gateway Timeout'}
+# Envios de um mesmo job quando o pool é trocado no meio dele (por causa de outro job)
+TENTATIVAS_POOL = 3
+
+
+class ErroHTTP(Exception):
+    """Erro com status HTTP; vira {"erro": mensagem} na resposta."""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+# --- MÉTRICAS ---
+
+def percentil(ordenados, p):
+    """Percentil `p` (0-100) de uma lista ordenada, pelo método do posto mais próximo."""
+    if not ordenados:
+        return 0.0
+    k = math.ceil(p / 100 * len(ordenados)) - 1
+    return ordenados[max(0, min(k, len(ordenados) - 1))]
+
+
+class Metricas:
+    """Latências das últimas AMOSTRAS_LATENCIA requisições de cada rota, e contadores."""
+
+    def __init__(self):
+        self.inicio = time.monotonic()
+        self.rotas = {}
+        self.em_andamento = 0
+
+    def _rota(self, rota):
+        if rota not in self.rotas:
+            self.rotas[rota] = {"latencias": deque(maxlen=AMOSTRAS_LATENCIA), "total": 0,
+                                "erros": 0, "coalescidas": 0}
+        return self.rotas[rota]
+
+    def registrar(self, rota, segundos, status):
+        r = self._rota(rota)
+        r["latencias"].append(segundos)
+        r["total"] += 1
+        r["erros"] += status >= 400
+
+    def coalescida(self, rota):
+        self._rota(rota)["coalescidas"] += 1
+
+    def resumo(self):
+        rotas = {}
+        for rota, r in sorted(self.rotas.items()):
+            lat = sorted(r["latencias"])
+            rotas[rota] = {"total": r["total"], "erros": r["erros"], "coalescidas": r["coalescidas"],
+                           **{f"p{p}_ms": round(percentil(lat, p) * 1000, 3) for p in (50, 90, 99)},
+                           "max_ms": round(lat[-1] * 1000, 3) if lat else 0.0}
+        return {"uptime_s": round(time.monotonic() - self.inicio, 1), "em_andamento": self.em_andamento,
+                "rotas": rotas}
+
+
+# --- TUTOR (thread própria) ---
+
+def _texto(corpo, campo):
+    valor = corpo.get(campo)
+    if not isinstance(valor, str) or not valor.strip():
+        raise ErroHTTP(400, f"Campo '{campo}' ausente.")
+    return valor
+
+
+def _tutor_proxima(corpo, sessoes):
+    from .tutor import escolher_questao
+
+    usuario_id, _ = database.get_or_create_user(_texto(corpo, 'usuario').strip())
+    # A seleção exclui as questões já feitas: o histórico pendente precisa estar no banco
+    database.aguardar_escritas()
+    nivel = database.get_user_skill(usuario_id)
+    questao = escolher_questao(usuario_id, nivel)
+    if questao is not None:
+        # Questão entregue de novo recomeça do início
+        sessoes.pop((usuario_id, questao["id"]), None)
+        # A solução não sai do servidor
+        questao = {k: questao[k] for k in ("id", "expressao", "dificuldade", "lei")}
+    return {"usuario_id": usuario_id, "nivel_habilidade": nivel, "questao": questao}
+
+
+def _tutor_passo(corpo, sessoes):
+    """
+    Avalia o passo a partir da expressão atual guardada em `sessoes` para
+    (usuário, questão). Roda só na thread do tutor, que serializa os acessos.
+    """
+    from .tutor import avaliar_passo, buscar_questao
+
+    usuario_id, _ = database.get_or_create_user(_texto(corpo, 'usuario').strip())
+    passo = _texto(corpo, 'passo')
+    questao_id = corpo.get('questao_id')
+    if not isinstance(questao_id, int):
+        raise ErroHTTP(400, "Campo 'questao_id' ausente.")
+    questao = buscar_questao(questao_id)
+    if questao is None:
+        raise ErroHTTP(404, f"Questão {questao_id} não existe.")
+    chave = (usuario_id, questao_id)
+    atual, passos = sessoes.get(chave, (questao['expressao'], []))
+
+    res = avaliar_passo(usuario_id, questao, atual, passos, passo)
+    if res["estado"] in ("desistiu", "correto"):
+        sessoes.pop(chave, None)
+    else:
+        sessoes[chave] = (res["atual"], res["passos"])
+        sessoes.move_to_end(chave)
+        if len(sessoes) > SESSOES_MAX:
+            sessoes.popitem(last=False)
+    if "dicas" in res:
+        res["dicas"] = [{"lei": lei, "explicacao": explic} for lei, explic in res["dicas"]]
+    return res
+
+
+# --- SERVIDOR ---
+
+class Servidor:
+    """Servidor asyncio; `await iniciar()` abre a porta (0 = porta livre) e `await encerrar()` fecha."""
+
+    def __init__(self, host=HOST, porta=PORTA, workers=None, timeout=TIMEOUT_JOB):
+        self.host = host
+        self.porta = porta
+        self.workers = workers
+        self.timeout = timeout
+        self.metricas = Metricas()
+        self.reinicios_pool = 0
+        self._pool = None
+        self._vagas = None
+        self._tutor = None
+        self._servidor = None
+        self._encerrando = False
+        self._em_voo = {}  # chave da requisição -> tarefa do cálculo em andamento
+        self._sessoes = OrderedDict()  # (usuário, questão) -> (expressão atual, passos)
+        self._conexoes = {}  # tarefa da conexão -> writer
+
+    async def iniciar(self):
+        database.inicializar_banco()
+        database.iniciar_escrita_assincrona()
+        self._pool = self._novo_pool()
+        # Um job por worker: nada espera na fila do pool, e o prazo conta só a execução
+        self._vagas = asyncio.Semaphore(self._pool._max_workers)
+        self._tutor = ThreadPoolExecutor(1, thread_name_prefix="tutor")
+        self._servidor = await asyncio.start_server(self._conexao, self.host, self.porta, limit=CABECALHO_MAX)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+
+    async def encerrar(self):
+        self._encerrando = True
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        # Fecha as conexões keep-alive; cada uma termina sozinha ao ver o EOF
+        for writer in list(self._conexoes.values()):
+            writer.close()
+        if self._conexoes:
+            await asyncio.wait(list(self._conexoes))
+        if self._tutor is not None:
+            self._tutor.shutdown(wait=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        database.aguardar_escritas()
+
+    def _novo_pool(self):
+        return ProcessPoolExecutor(self.workers, initializer=iniciar_worker, initargs=(False,))
+
+    def _reiniciar_pool(self, pool):
+        """Troca o pool (se ainda for `pool`), matando os workers presos."""
+        if self._pool is not pool:
+            return
+        for p in list((getattr(pool, '_processes', None) or {}).values()):
+            p.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = self._novo_pool()
+        self.reinicios_pool += 1
+
+    # --- ROTAS ---
+
+    async def _motor(self, rota, corpo):
+        op = ROTAS_MOTOR[rota]
+        job = {"op": op}
+        for campo in ("expr", "expr2"):
+            if campo in corpo:
+                job[campo] = corpo[campo]
+        chave = json.dumps(job, sort_keys=True, ensure_ascii=False)
+
+        tarefa = self._em_voo.get(chave)
+        if tarefa is None:
+            tarefa = asyncio.ensure_future(self._calcular(job))
+            self._em_voo[chave] = tarefa
+            tarefa.add_done_callback(lambda _: self._em_voo.pop(chave, None))
+        else:
+            self.metricas.coalescida(rota)
+        # shield: um cliente que desiste não cancela o cálculo dos outros
+        res = dict(await asyncio.shield(tarefa))
+        res.pop("id", None)
+        if res["ok"]:
+            return 200, res
+        erro = res["erro"]
+        if erro.startswith("JobTimeout"):
+            return 504, res
+        if erro.startswith(("JobError", "ParseError")):
+            return 400, res
+        return 500, res
+
+    async def _calcular(self, job):
+        """
+        Roda o job no pool. Se o pool for trocado por causa de outro job (o
+        futuro é cancelado ou o worker morto junto), o job é reenviado ao pool novo.
+        """
+        loop = asyncio.get_running_loop()
+        for _ in range(TENTATIVAS_POOL):
+            async with self._vagas:
+                pool = self._pool
+                futuro = loop.run_in_executor(pool, executar_job, job, False, self.timeout)
+                try:
+                    # O prazo vale dentro do worker; este só pega um worker que não responde
+                    return await asyncio.wait_for(futuro, self.timeout + FOLGA_BLOCO)
+                except asyncio.TimeoutError:
+                    self._reiniciar_pool(pool)
+                    return {"ok": False, "erro": f"JobTimeout: job excedeu o prazo de {self.timeout:g}s."}
+                except asyncio.CancelledError:
+                    # Cancelamento da própria tarefa (encerramento) continua valendo
+                    if pool is self._pool or self._encerrando:
+                        raise
+                except BrokenProcessPool:
+                    if pool is self._pool:
+                        # Foi o worker deste job que morreu
+                        self._reiniciar_pool(pool)
+                        return {"ok": False, "erro": "BrokenProcessPool: o worker terminou inesperadamente."}
+        raise ErroHTTP(503, "Pool de workers reiniciado várias vezes durante o cálculo; tente de novo.")
+
+    async def _rota_tutor(self, rota, corpo):
+        funcao = _tutor_proxima if rota == '/tutor/proxima' else _tutor_passo
+        loop = asyncio.get_running_loop()
+        return 200, await loop.run_in_executor(self._tutor, funcao, corpo, self._sessoes)
+
+    def _info(self):
+        info = self.metricas.resumo()
+        info["pool"] = {"workers": self._pool._max_workers if self._pool else 0,
+                        "reinicios": self.reinicios_pool, "em_voo": len(self._em_voo)}
+        info["escrita"] = database.metricas_escrita()
+        return info
+
+    async def _despachar(self, metodo, caminho, corpo_bruto):
+        if caminho in ('/metrics', '/health'):
+            if metodo != 'GET':
+                raise ErroHTTP(405, "Use GET.")
+            return 200, (self._info() if caminho == '/metrics' else {"ok": True})
+        if caminho not in ROTAS_MOTOR and caminho not in ROTAS_TUTOR:
+            raise ErroHTTP(404, f"Rota desconhecida: {caminho}")
+        if metodo != 'POST':
+            raise ErroHTTP(405, "Use POST.")
+        try:
+            corpo = json.loads(corpo_bruto or b"{}")
+        except ValueError as e:
+            raise ErroHTTP(400, f"JSON inválido: {e}")
+        if not isinstance(corpo, dict):
+            raise ErroHTTP(400, "O corpo deve ser um objeto JSON.")
+        if caminho in ROTAS_MOTOR:
+            return await self._motor(caminho, corpo)
+        return await self._rota_tutor(caminho, corpo)
+
+    # --- HTTP ---
+
+    async def _ler_requisicao(self, reader):
+        """(método, caminho, corpo, manter conexão), ou None se o cliente fechou/ficou ocioso."""
+        try:
+            cabeca = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), OCIOSO_MAX)
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise ErroHTTP(400, "Requisição incompleta.")
+            return None
+        except asyncio.LimitOverrunError:
+            raise ErroHTTP(400, "Cabeçalho grande demais.")
+        except (asyncio.TimeoutError, ConnectionError):
+            return None
+
+        linhas = cabeca.decode('latin-1').split("\r\n")
+        try:
+            metodo, alvo, versao = linhas[0].split(" ", 2)
+        except ValueError:
+            raise ErroHTTP(400, "Linha de requisição inválida.")
+        cabecalhos = {}
+        for linha in linhas[1:]:
+            nome, _, valor = linha.partition(":")
+            if nome:
+                cabecalhos[nome.strip().lower()] = valor.strip()
+        if 'transfer-encoding' in cabecalhos:
+            raise ErroHTTP(400, "Transfer-Encoding não suportado; envie Content-Length.")
+        try:
+            tamanho = int(cabecalhos.get('content-length') or 0)
+        except ValueError:
+            raise ErroHTTP(400, "Content-Length inválido.")
+        if tamanho > CORPO_MAX:
+            raise ErroHTTP(413, f"Corpo maior que {CORPO_MAX} bytes.")
+        corpo = await reader.readexactly(tamanho) if tamanho else b""
+
+        conexao = cabecalhos.get('connection', '').lower()
+        manter = conexao == 'keep-alive' if versao == 'HTTP/1.0' else conexao != 'close'
+        return metodo.upper(), alvo.split('?', 1)[0], corpo, manter
+
+    @staticmethod
+    async def _responder(writer, status, dados, manter):
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        cabeca = (f"HTTP/1.1 {status} {STATUS[status]}\r\n"
+                  f"Content-Type: application/json; charset=utf-8\r\n"
+                  f"Content-Length: {len(corpo)}\r\n"
+                  f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n")
+        writer.write(cabeca.encode('latin-1') + corpo)
+        await writer.drain()
+
+    async def _conexao(self, reader, writer):
+        tarefa = asyncio.current_task()
+        self._conexoes[tarefa] = writer
+        try:
+            while True:
+                try:
+                    requisicao = await self._ler_requisicao(reader)
+                except ErroHTTP as e:
+                    await self._responder(writer, e.status, {"erro": str(e)}, False)
+                    break
+                if requisicao is None:
+                    break
+                metodo, caminho, corpo, manter = requisicao
+
+                inicio = time.perf_counter()
+                self.metricas.em_andamento += 1
+                try:
+                    status, dados = await self._despachar(metodo, caminho, corpo)
+                except ErroHTTP as e:
+                    status, dados = e.status, {"erro": str(e)}
+                except Exception as e:
+                    status, dados = 500, {"erro": f"{type(e).__name__}: {e}"}
+                finally:
+                    self.metricas.em_andamento -= 1
+                rota = caminho if caminho in ROTAS_MOTOR or caminho in ROTAS_TUTOR or caminho in ('/metrics', '/health') else 'outras'
+                self.metricas.registrar(rota, time.perf_counter() - inicio, status)
+
+                await self._responder(writer, status, dados, manter)
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._conexoes[tarefa]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+# --- CLIENTE (loopback) ---
+
+class Cliente:
+    """Cliente HTTP/1.1 mínimo com conexão keep-alive, para testes locais."""
+
+    def __init__(self, host=HOST, porta=PORTA):
+        self.host = host
+        self.porta = porta
+        self._reader = self._writer = None
+
+    async def __aenter__(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.porta)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def requisitar(self, metodo, caminho, corpo=None):
+        """Envia uma requisição e retorna (status, JSON da resposta)."""
+        dados = b"" if corpo is None else json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        cabeca = (f"{metodo} {caminho} HTTP/1.1\r\nHost: {self.host}:{self.porta}\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(dados)}\r\n\r\n")
+        self._writer.write(cabeca.encode('latin-1') + dados)
+        await self._writer.drain()
+
+        resposta = (await self._reader.readuntil(b"\r\n\r\n")).decode('latin-1').split("\r\n")
+        status = int(resposta[0].split(" ", 2)[1])
+        tamanho = 0
+        for linha in resposta[1:]:
+            nome, _, valor = linha.partition(":")
+            if nome.strip().lower() == 'content-length':
+                tamanho = int(valor)
+        return status, json.loads(await self._reader.readexactly(tamanho) or b"null")
+
+    async def post(self, caminho, corpo):
+        return await self.requisitar("POST", caminho, corpo)
+
+    async def get(self, caminho):
+        return await self.requisitar("GET", caminho)
+
+
+# --- EXECUÇÃO ---
+
+async def servir(host=HOST, porta=PORTA, workers=None, timeout=TIMEOUT_JOB):
+    """Serve até SIGINT/SIGTERM e então encerra gravando o que estiver pendente."""
+    servidor = Servidor(host, porta, workers, timeout)
+    await servidor.iniciar()
+    print(f"Servindo em http://{servidor.host}:{servidor.porta} (Ctrl+C para sair)")
+
+    parar = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for nome in ("SIGINT", "SIGTERM"):
+        try:
+            loop.add_signal_handler(getattr(signal, nome), parar.set)
+        except (NotImplementedError, AttributeError):
+            pass  # Windows: Ctrl+C interrompe o asyncio.run
+    try:
+        await parar.wait()
+    finally:
+        await servidor.encerrar()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serviço HTTP/JSON local do motor e do tutor.")
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORTA)
+    ap.add_argument("-w", "--workers", type=int, help="processos do motor (padrão: um por núcleo)")
+    ap.add_argument("--timeout", type=float, default=TIMEOUT_JOB, help="prazo por cálculo, em segundos")
+    args = ap.parse_args(argv)
+    asyncio.run(servir(args.host, args.port, args.workers, args.timeout))
+
+
+if __name__ == '__main__':
+    main()
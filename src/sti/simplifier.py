@@ -6,41 +6,141 @@ from sympy.logic.boolalg import And, Or, Not
 from itertools import combinations, chain
 from collections import defaultdict
 from .formatter import format_expr
+from .bitparallel import get_variables, truth_mask, mask_to_minterms, choose_backend, full_mask, iter_set_bits
+from .covering import solve_cover
+from .espresso import espresso
+from .sop_table import lookup_minimal_sop
+from .npn import NPNCache
+from .consensus import expr_to_cubes, prime_implicants_by_consensus, irredundant_cover, CoverTooLarge
+
+# Métodos de `simplify`: 'exact' (Quine-McCluskey + cobertura mínima),
+# 'heuristic' (Espresso) ou 'consensus' (primos direto dos cubos da expressão,
+# sem minterms). Com 'auto', o heurístico entra a partir destes limites e o
+# consenso é tentado primeiro a partir de CONSENSUS_MIN_VARS variáveis.
+METHODS = ('auto', 'exact', 'heuristic', 'consensus')
+HEURISTIC_MIN_VARS = 14
+HEURISTIC_MIN_MINTERMS = 4096
+CONSENSUS_MIN_VARS = 8
+
+# Versão do resultado produzido pelo `simplify`; mudar invalida o cache persistente
+SIMPLIFIER_VERSION = 1
+
+# Cache LRU das coberturas, indexado pela forma canônica (permutação/negação das
+# entradas). `SIMPLIFY_CACHE.resize(n)` muda o tamanho; `.info()` dá acertos e falhas.
+SIMPLIFY_CACHE_SIZE = 1024
+SIMPLIFY_CACHE = NPNCache(SIMPLIFY_CACHE_SIZE)
 
 # --- FUNÇÕES AUXILIARES PARA O ALGORITMO ---
 
-def get_vars_and_minterms(expr):
+def get_vars_and_minterms(expr, backend='auto'):
     """Extrai as variáveis e os minterms (saídas verdadeiras) da expressão."""
-    try:
-        variables = sorted(list(expr.atoms()), key=str)
-    except Exception:
-        if expr is true: return [], [0]
-        if expr is false: return [], []
-        variables = [expr] if expr.is_Symbol else []
-        
-    minterms = []
-    if not variables:
-        return [], [0] if expr is true else []
+    variables = get_variables(expr)
+    if choose_backend(len(variables), backend) == 'numpy':
+        from .numpy_backend import iter_minterms
+        return variables, list(iter_minterms(expr, variables, workers=None))
+    # Uma única avaliação bit-paralela no lugar de 2^n chamadas a `subs`
+    _, mask = truth_mask(expr, variables)
+    return variables, mask_to_minterms(mask)
 
-    num_vars = len(variables)
-    for i in range(2**num_vars):
-        truth_values = {var: (i >> j) & 1 for j, var in enumerate(reversed(variables))}
-        if expr.subs(truth_values) == True:
-            minterms.append(i)
-            
-    return variables, minterms
-
-def combine_terms(t1, t2):
-    """Compara dois termos binários. Se diferem por um bit, combina-os."""
-    diff = 0
-    pos = -1
-    for i in range(len(t1)):
-        if t1[i] != t2[i]:
-            diff += 1
-            pos = i
-    if diff == 1:
-        return t1[:pos] + '-' + t1[pos+1:]
-    return None
+def get_vars_and_mask(expr, backend='auto'):
+    """Extrai as variáveis e a máscara da tabela-verdade (bit i = minterm i)."""
+    variables = get_variables(expr)
+    if choose_backend(len(variables), backend) == 'numpy':
+        from .numpy_backend import iter_packed_bytes
+        packed = b''.join(iter_packed_bytes(expr, variables, workers=None))
+        return variables, int.from_bytes(packed, 'little')
+    return truth_mask(expr, variables)
+
+def choose_method(num_vars, num_minterms, method='auto'):
+    """Resolve method='auto' para 'exact' ou 'heuristic' conforme o tamanho da função."""
+    if method == 'auto':
+        if num_vars >= HEURISTIC_MIN_VARS or num_minterms >= HEURISTIC_MIN_MINTERMS:
+            return 'heuristic'
+        return 'exact'
+    if method not in METHODS:
+        raise ValueError(f"Método desconhecido: {method!r}")
+    return method
+
+# --- CUBOS INTEIROS (value, mask) ---
+# Um implicante é um par de inteiros: `mask` tem 1 nas posições livres ('-') e
+# `value` tem os bits fixos (zerado onde `mask` é 1). O bit mais significativo é
+# a primeira variável, como nos minterms. Ex.: com 3 variáveis, '1-0' = (0b100, 0b010).
+
+def _popcount(x):
+    return bin(x).count('1')
+
+def cube_to_str(cube, num_vars):
+    """Converte um cubo (value, mask) na string de termo usada no log (ex: '1-0')."""
+    value, mask = cube
+    chars = []
+    for pos in range(num_vars - 1, -1, -1):
+        bit = 1 << pos
+        chars.append('-' if mask & bit else ('1' if value & bit else '0'))
+    return ''.join(chars)
+
+def str_to_cube(term_str):
+    """Converte uma string de termo (ex: '1-0') num cubo (value, mask)."""
+    value = mask = 0
+    for char in term_str:
+        value <<= 1
+        mask <<= 1
+        if char == '1':
+            value |= 1
+        elif char == '-':
+            mask |= 1
+    return value, mask
+
+def generate_prime_implicants(minterms, num_vars, combination_log=None):
+    """
+    Gera os implicantes primos (Quine-McCluskey) sobre cubos inteiros.
+
+    Os cubos ficam em baldes por popcount; para cada cubo só são testados os
+    vizinhos obtidos ligando um bit livre, por busca em conjunto, em vez de
+    comparar todos os pares de grupos adjacentes. Se `combination_log` for uma
+    lista, recebe as combinações no mesmo formato e ordem da versão com strings.
+    """
+    full = (1 << num_vars) - 1
+    groups = defaultdict(set)
+    for mt in minterms:
+        groups[_popcount(mt)].add((mt, 0))
+
+    prime_implicants = set()
+    while groups:
+        next_groups = defaultdict(set)
+        used_terms = set()
+
+        for k in sorted(groups):
+            upper = groups.get(k + 1)
+            if not upper:
+                continue
+            current = groups[k]
+            if combination_log is not None:
+                # Ordem das strings, para o log sair igual ao do algoritmo original
+                current = sorted(current, key=lambda c: cube_to_str(c, num_vars))
+            for cube in current:
+                value, mask = cube
+                free = full & ~(value | mask)
+                # Do bit menos para o mais significativo = ordem crescente das strings vizinhas
+                while free:
+                    bit = free & -free
+                    free ^= bit
+                    other = (value | bit, mask)
+                    if other in upper:
+                        merged = (value, mask | bit)
+                        next_groups[k].add(merged)
+                        used_terms.add(cube)
+                        used_terms.add(other)
+                        if combination_log is not None:
+                            combination_log.append({
+                                'before': [cube_to_str(cube, num_vars), cube_to_str(other, num_vars)],
+                                'after': cube_to_str(merged, num_vars),
+                            })
+
+        for group in groups.values():
+            prime_implicants.update(c for c in group if c not in used_terms)
+        groups = next_groups
+
+    return prime_implicants
 
 def term_to_expr(variables, term_str):
     """Converte uma string de termo (ex: '1-0') de volta para uma expressão sympy."""
@@ -54,122 +154,153 @@ def term_to_expr(variables, term_str):
     if not lits: return true
     return And(*lits) if len(lits) > 1 else lits[0]
 
-def solve_petrick(chart, uncovered_minterms, remaining_pis):
-    """Resolve a cobertura usando o Método de Petrick para garantir a solução mínima."""
-    if not uncovered_minterms:
-        return set()
-        
-    P = []
-    for mt in sorted(list(uncovered_minterms)):
-        # Cria um termo de soma para cada minterm (ex: P1+P2)
-        P.append([pi for pi in remaining_pis if pi in chart[mt]])
-    
-    # Expande a expressão (P1+P2)*(P3+P4) -> P1P3+P1P4+P2P3+P2P4
-    while len(P) > 1:
-        p1 = P.pop(0)
-        p2 = P.pop(0)
-        res = set()
-        for i1 in p1:
-            for i2 in p2:
-                # Usa um conjunto para que A*A=A
-                if isinstance(i1, set):
-                    term = set(i1)
-                else:
-                    term = {i1}
-                if isinstance(i2, set):
-                    term.update(i2)
-                else:
-                    term.add(i2)
-                res.add(frozenset(term)) # Usa frozenset para poder adicionar a um conjunto
-        P.insert(0, list(res))
-
-    # Encontra o termo com o menor número de implicantes
-    min_len = float('inf')
-    best_solution = None
-    for term_set in P[0]:
-        if len(term_set) < min_len:
-            min_len = len(term_set)
-            best_solution = term_set
-            
-    return set(best_solution)
+def build_cover_chart(prime_cubes, minterms):
+    """
+    Tabela de cobertura em bitsets: `pi_rows[j]` tem o bit i ligado se o primo j
+    cobre `minterms[i]`, e `row_pis[i]` tem o bit j ligado se o minterm i é
+    coberto pelo primo j.
+    """
+    index = {mt: i for i, mt in enumerate(minterms)}
+    pi_rows = [0] * len(prime_cubes)
+    row_pis = [0] * len(minterms)
+    for j, (value, mask) in enumerate(prime_cubes):
+        pi_bit = 1 << j
+        rows = 0
+        # Percorre os pontos do cubo: `value` mais cada subconjunto das posições livres
+        sub = mask
+        while True:
+            i = index[value | sub]
+            rows |= 1 << i
+            row_pis[i] |= pi_bit
+            if sub == 0:
+                break
+            sub = (sub - 1) & mask
+        pi_rows[j] = rows
+    return pi_rows, row_pis
+
+def solve_minimum_cover(pi_rows, costs, uncovered_rows, remaining_pis, time_budget=None):
+    """
+    Resolve a cobertura mínima das linhas em `uncovered_rows` (bitset) usando os
+    primos de índices `remaining_pis`, com branch-and-bound (no lugar da expansão
+    de Petrick). Retorna (índices escolhidos, estatísticas).
+    """
+    if not uncovered_rows:
+        return [], None
+    columns = [pi_rows[j] & uncovered_rows for j in remaining_pis]
+    chosen, stats = solve_cover(columns, [costs[j] for j in remaining_pis],
+                                rows=uncovered_rows, time_budget=time_budget)
+    return [remaining_pis[k] for k in chosen], stats
+
+def minimize_exact(minterms, num_vars, combination_log=None, time_budget=None):
+    """
+    Quine-McCluskey + cobertura mínima sobre os minterms, sem sympy.
+    Retorna (cubos da soma de produtos mínima, estatísticas da cobertura).
+    """
+    # 1-2. Agrupar minterms e gerar os implicantes primos (cubos inteiros)
+    prime_cubes = generate_prime_implicants(minterms, num_vars, combination_log)
+    prime_cubes = sorted(prime_cubes)
+
+    # 3. Tabela de Cobertura (um inteiro por primo e um por minterm)
+    pi_rows, row_pis = build_cover_chart(prime_cubes, minterms)
+    costs = [num_vars - _popcount(mask) for _, mask in prime_cubes]
+
+    # 4. Encontrar Implicantes Essenciais: minterms com um único primo
+    essential_pis = 0
+    for pis in row_pis:
+        if pis & (pis - 1) == 0:
+            essential_pis |= pis
+
+    # 5. Cobrir e Resolver o Restante (cobertura mínima por branch-and-bound)
+    covered_rows = 0
+    for j in iter_set_bits(essential_pis):
+        covered_rows |= pi_rows[j]
+    uncovered_rows = ((1 << len(minterms)) - 1) & ~covered_rows
+    final_pis = list(iter_set_bits(essential_pis))
+    remaining_pis = [j for j in range(len(prime_cubes))
+                     if not (essential_pis >> j) & 1 and pi_rows[j] & uncovered_rows]
+    cover_solution, cover_stats = solve_minimum_cover(pi_rows, costs, uncovered_rows, remaining_pis, time_budget)
+    final_pis.extend(cover_solution)
+
+    return [prime_cubes[j] for j in final_pis], cover_stats
+
+def _minimize_cached(minterms, mask, num_vars, combination_log, time_budget=None):
+    """`minimize_exact` passando pelo SIMPLIFY_CACHE; o log de combinações vem junto da entrada."""
+    if SIMPLIFY_CACHE.maxsize <= 0:
+        return minimize_exact(minterms, num_vars, combination_log, time_budget)
+    key, perm, phase = SIMPLIFY_CACHE.key(mask, num_vars, 'exact')
+    cached = SIMPLIFY_CACHE.get(key, perm, phase)
+    if cached is not None:
+        final_cubes, cover_stats, log_pairs = cached
+        for before in log_pairs:
+            # Com a fase trocada o par volta invertido; o log mostra o 0 primeiro
+            combination_log.append(_log_entry(sorted(before, key=lambda c: cube_to_str(c, num_vars)), num_vars))
+        return final_cubes, cover_stats
+    start = len(combination_log)
+    final_cubes, cover_stats = minimize_exact(minterms, num_vars, combination_log, time_budget)
+    # Coberturas de uma busca interrompida pelo tempo não são guardadas
+    if cover_stats is None or cover_stats["optimal"]:
+        log_pairs = [tuple(str_to_cube(t) for t in entry['before']) for entry in combination_log[start:]]
+        SIMPLIFY_CACHE.put(key, perm, phase, final_cubes, cover_stats, log_pairs)
+    return final_cubes, cover_stats
+
+def _log_entry(before, num_vars):
+    """Entrada do log de combinações a partir do par de cubos combinados."""
+    (v0, m0), (v1, _) = before
+    after = (v0, m0 | (v0 ^ v1))
+    return {
+        'before': [cube_to_str(before[0], num_vars), cube_to_str(before[1], num_vars)],
+        'after': cube_to_str(after, num_vars),
+    }
 
 # --- FUNÇÃO PRINCIPAL DO SIMPLIFICADOR ---
-def simplify(expr):
+def simplify(expr, time_budget=None, method='auto'):
     """
     Simplifica a expressão booleana usando Quine-McCluskey e retorna um 
     dicionário com todos os passos intermediários para a impressão didática.
+    `time_budget` (segundos) limita a busca da cobertura; se estourar, fica a
+    melhor cobertura encontrada e `cover_stats["optimal"]` é False.
+    `method` escolhe entre 'exact', 'heuristic' (Espresso), 'consensus' e 'auto';
+    o resultado informa o método usado e se a solução é garantidamente mínima ("exact").
     """
-    variables, minterms = get_vars_and_minterms(expr)
+    if method not in METHODS:
+        raise ValueError(f"Método desconhecido: {method!r}")
+
+    if method == 'consensus' or (method == 'auto' and len(get_variables(expr)) >= CONSENSUS_MIN_VARS):
+        result = simplify_by_consensus(expr)
+        # Sem minterms só dá para garantir o mínimo quando todos os primos da
+        # cobertura são essenciais; fora isso, funções médias ainda vão para o exato
+        if result is not None and (method == 'consensus' or result.get('exact', True)
+                                   or len(result['variables']) >= HEURISTIC_MIN_VARS):
+            return result
+        if method == 'consensus':
+            method = 'auto'
+
+    variables, mask = get_vars_and_mask(expr)
     num_vars = len(variables)
     
     # Casos triviais
-    if not minterms: 
+    if not mask: 
         return {"final_sop": false, "steps": "Expressão resulta em Falso."}
-    if len(minterms) == 2**num_vars: 
+    if mask == full_mask(num_vars): 
         return {"final_sop": true, "steps": "Expressão resulta em Verdadeiro."}
 
-    # 1. Agrupar Minterms
-    groups = defaultdict(list)
-    for mt in minterms:
-        binary_str = format(mt, f'0{num_vars}b')
-        groups[binary_str.count('1')].append(binary_str)
+    minterms = mask_to_minterms(mask)
+    if choose_method(num_vars, len(minterms), method) == 'heuristic':
+        return simplify_heuristic(expr, variables, minterms, mask)
 
-    # --- ADICIONADO 1/3: Inicializa o log de combinações ---
+    # 0. Funções de até 4 variáveis saem prontas da tabela pré-calculada
     combination_log = []
-
-    # 2. Gerar Implicantes Primos
-    prime_implicants_str = set()
-    current_groups = groups
-    while True:
-        next_groups = defaultdict(list)
-        used_terms = set()
-        
-        sorted_keys = sorted(current_groups.keys())
-        for i in range(len(sorted_keys) - 1):
-            for term1 in current_groups[sorted_keys[i]]:
-                for term2 in current_groups[sorted_keys[i+1]]:
-                    combined = combine_terms(term1, term2)
-                    if combined:
-                        next_groups[combined.count('1')].append(combined)
-                        used_terms.add(term1)
-                        used_terms.add(term2)
-                        # --- ADICIONADO 2/3: Registra o passo de combinação no log ---
-                        combination_log.append({'before': sorted([term1, term2]), 'after': combined})
-        
-        for key in current_groups:
-            for term in current_groups[key]:
-                if term not in used_terms:
-                    prime_implicants_str.add(term)
-        
-        if not next_groups: break
-        current_groups = {k: sorted(list(set(v))) for k, v in next_groups.items()}
-
-    # 3. Tabela de Cobertura
-    chart = {mt: [pi for pi in prime_implicants_str if all(pi[i] == '-' or pi[i] == format(mt, f'0{num_vars}b')[i] for i in range(num_vars))] for mt in minterms}
-    
-    # 4. Encontrar Implicantes Essenciais
-    essential_pis_str = set()
-    for mt, pis in chart.items():
-        if len(pis) == 1:
-            essential_pis_str.add(pis[0])
-    
-    # 5. Cobrir e Resolver o Restante (Método de Petrick)
-    covered_minterms = set()
-    for pi in essential_pis_str:
-        for mt in minterms:
-            if pi in chart[mt]:
-                covered_minterms.add(mt)
-    
-    uncovered_minterms = set(minterms) - covered_minterms
-    final_pis_str = set(essential_pis_str)
-    
-    if uncovered_minterms:
-        remaining_pis = prime_implicants_str - essential_pis_str
-        cover_solution = solve_petrick(chart, uncovered_minterms, remaining_pis)
-        final_pis_str.update(cover_solution)
+    cover_stats = None
+    looked_up = lookup_minimal_sop(mask, num_vars)
+    if looked_up is not None:
+        final_cubes, log_pairs = looked_up
+        for before in log_pairs:
+            combination_log.append(_log_entry(before, num_vars))
+    else:
+        final_cubes, cover_stats = _minimize_cached(minterms, mask, num_vars, combination_log, time_budget)
 
     # 6. Construir a Expressão Final
-    final_terms_expr = [term_to_expr(variables, pi) for pi in final_pis_str]
+    final_terms_expr = [term_to_expr(variables, cube_to_str(c, num_vars)) for c in final_cubes]
     final_expr = Or(*final_terms_expr) if len(final_terms_expr) > 1 else (final_terms_expr[0] if final_terms_expr else false)
 
     # 7. Montar o dicionário de resultados
@@ -177,8 +308,83 @@ def simplify(expr):
         "initial_expr": expr,
         "variables": variables,
         "minterms": minterms,
+        "has_minterms": True,
         # --- ADICIONADO 3/3: Inclui o log de combinações no resultado final ---
         "combination_log": combination_log,
         "final_sop": final_expr,
+        "final_cubes": final_cubes,
+        "cover_stats": cover_stats,
+        "method": "exact",
+        "exact": cover_stats is None or cover_stats["optimal"],
     }
-    return result_data
\ No newline at end of file
+    return result_data
+
+def simplify_heuristic(expr, variables, minterms, mask):
+    """Simplificação pelo laço expandir/irredundante/reduzir (Espresso), sem log de combinações."""
+    num_vars = len(variables)
+    cached = None
+    if SIMPLIFY_CACHE.maxsize > 0:
+        key, perm, phase = SIMPLIFY_CACHE.key(mask, num_vars, 'heuristic')
+        cached = SIMPLIFY_CACHE.get(key, perm, phase)
+    if cached is not None:
+        cubes, espresso_stats, _ = cached
+    else:
+        cubes, espresso_stats = espresso(mask, num_vars)
+        if SIMPLIFY_CACHE.maxsize > 0:
+            SIMPLIFY_CACHE.put(key, perm, phase, cubes, espresso_stats)
+    final_terms_expr = [term_to_expr(variables, cube_to_str(c, num_vars)) for c in cubes]
+    final_expr = Or(*final_terms_expr) if len(final_terms_expr) > 1 else final_terms_expr[0]
+
+    return {
+        "initial_expr": expr,
+        "variables": variables,
+        "minterms": minterms,
+        "has_minterms": True,
+        "combination_log": [],
+        "final_sop": final_expr,
+        "final_cubes": cubes,
+        "cover_stats": None,
+        "method": "heuristic",
+        "exact": False,
+        "espresso_stats": espresso_stats,
+    }
+
+def simplify_by_consensus(expr):
+    """
+    Simplificação sem expandir minterms: cobertura de cubos da expressão, primos
+    por consenso iterado e cobertura irredundante. Retorna None se a cobertura
+    passar do limite de cubos.
+    """
+    variables = get_variables(expr)
+    num_vars = len(variables)
+    try:
+        cubes = expr_to_cubes(expr, variables)
+        primes = prime_implicants_by_consensus(cubes)
+    except CoverTooLarge:
+        return None
+
+    if not primes:
+        return {"final_sop": false, "steps": "Expressão resulta em Falso."}
+    if (0, (1 << num_vars) - 1) in primes:
+        return {"final_sop": true, "steps": "Expressão resulta em Verdadeiro."}
+
+    cover, essentials = irredundant_cover(primes, num_vars)
+    cover = sorted(cover)
+    final_terms_expr = [term_to_expr(variables, cube_to_str(c, num_vars)) for c in cover]
+    final_expr = Or(*final_terms_expr) if len(final_terms_expr) > 1 else final_terms_expr[0]
+
+    return {
+        "initial_expr": expr,
+        "variables": variables,
+        # Sem expansão: lista vazia, para quem só conta os minterms
+        "minterms": [],
+        "has_minterms": False,
+        "combination_log": [],
+        "final_sop": final_expr,
+        "final_cubes": cover,
+        "cover_stats": None,
+        "method": "consensus",
+        # Se todo primo da cobertura é essencial, ela é a única cobertura mínima
+        "exact": len(cover) == len(essentials),
+        "consensus_stats": {"input_cubes": len(cubes), "primes": len(primes), "essentials": len(essentials)},
+    }
\ No newline at end of file
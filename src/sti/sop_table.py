@@ -0,0 +1,119 @@
+# Arquivo: src/sti/sop_table.py
+# Tabela pré-calculada com a soma de produtos mínima (e o log de combinações)
+# de todas as funções de 1 a 4 variáveis: 4 + 16 + 256 + 65.536 funções.
+#
+# A função é indexada pela própria máscara da tabela-verdade (bit i = minterm i).
+# Um cubo de até 4 variáveis cabe num byte (value << 4 | mask), e uma entrada
+# do log é só o par de cubos combinados (o resultado sai deles). Formato:
+#   cabeçalho '<4sBB' (magic, versão, máx. de variáveis) + corpo compactado (zlib)
+#   corpo: para n = 1..MAX_VARS, 2^(2^n) + 1 deslocamentos uint32 e os registros
+#   registro: nº de cubos, cubos, nº de entradas do log, pares de cubos
+# Gerada por `python -m scripts.build_sop_table`.
+
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+TABLE_PATH = os.path.join(os.path.dirname(__file__), 'sop_table.bin')
+TABLE_MAGIC = b'STSP'
+TABLE_VERSION = 1
+MAX_VARS = 4
+_HEADER = struct.Struct('<4sBB')
+
+_tables = None
+
+
+def _pack_cube(cube):
+    return (cube[0] << 4) | cube[1]
+
+
+def _unpack_cube(byte):
+    return byte >> 4, byte & 0xF
+
+
+def _load():
+    """Lê o arquivo uma única vez; sem arquivo, a tabela fica vazia."""
+    global _tables
+    if _tables is not None:
+        return _tables
+    _tables = {}
+    if not os.path.exists(TABLE_PATH):
+        return _tables
+
+    with open(TABLE_PATH, 'rb') as f:
+        magic, version, max_vars = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            return _tables
+        body = zlib.decompress(f.read())
+
+    pos = 0
+    for n in range(1, max_vars + 1):
+        count = (1 << (1 << n)) + 1
+        offsets = array('I')
+        offsets.frombytes(body[pos:pos + 4 * count])
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        pos += 4 * count
+        data = body[pos:pos + offsets[-1]]
+        pos += offsets[-1]
+        _tables[n] = (offsets, data)
+    return _tables
+
+
+def lookup_minimal_sop(mask, num_vars):
+    """
+    Retorna (cubos da SOP mínima, pares de cubos do log de combinações) para a
+    função de máscara `mask`, ou None se `num_vars` estiver fora da tabela.
+    """
+    table = _load().get(num_vars)
+    if table is None:
+        return None
+    offsets, data = table
+    pos = offsets[mask]
+    n_cubes = data[pos]
+    cubes = [_unpack_cube(b) for b in data[pos + 1:pos + 1 + n_cubes]]
+    pos += 1 + n_cubes
+    n_log = data[pos]
+    raw = data[pos + 1:pos + 1 + 2 * n_log]
+    log_pairs = [(_unpack_cube(raw[i]), _unpack_cube(raw[i + 1])) for i in range(0, len(raw), 2)]
+    return cubes, log_pairs
+
+
+def build_table(path=TABLE_PATH, max_vars=MAX_VARS):
+    """Calcula todas as funções de 1 a `max_vars` variáveis e grava a tabela."""
+    from .simplifier import minimize_exact, str_to_cube
+
+    if array('I').itemsize != 4:
+        raise RuntimeError("array('I') precisa ter 4 bytes nesta plataforma.")
+    body = bytearray()
+    for n in range(1, max_vars + 1):
+        offsets = array('I')
+        data = bytearray()
+        full = (1 << (1 << n)) - 1
+        for mask in range(full + 1):
+            offsets.append(len(data))
+            minterms = [i for i in range(1 << n) if (mask >> i) & 1]
+            cubes, log = [], []
+            # Constantes (máscara vazia ou cheia) não passam pelo Quine-McCluskey
+            if 0 < mask < full:
+                cubes, _ = minimize_exact(minterms, n, log)
+            data.append(len(cubes))
+            data.extend(_pack_cube(c) for c in cubes)
+            if len(log) > 255:
+                raise ValueError(f"Log grande demais para a tabela: {len(log)} entradas.")
+            data.append(len(log))
+            for entry in log:
+                data.extend(_pack_cube(str_to_cube(t)) for t in entry['before'])
+        offsets.append(len(data))
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        body += offsets.tobytes() + data
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, max_vars))
+        f.write(zlib.compress(bytes(body), 9))
+
+    global _tables
+    _tables = None
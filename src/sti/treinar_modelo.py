@@ -1,62 +1,171 @@
-import sqlite3
+# Arquivo: src/sti/treinar_modelo.py
+# Treinamento incremental do modelo de acerto do tutor.
+#
+# O modelo (padronização + regressão logística por SGD) guarda em
+# `historico_watermark_` o último historico.id já visto. Um modelo novo (ou
+# --completo) é ajustado até convergir com todo o histórico; depois, cada
+# execução lê só as linhas novas, em blocos de CHUNK_SIZE, e dá um passo de
+# partial_fit por bloco.
+# O arquivo é trocado atomicamente (escrita num temporário + os.replace), e o
+# `ModelService` do tutor percebe a troca pelo mtime. Cada execução fica
+# registrada na tabela `treinamentos_modelo`.
+#
+# Uso: python -m src.sti.treinar_modelo [--completo]
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score
-import joblib 
-
-DB_NAME = 'tutor_history.db'
-
-def preparar_dados_treinamento():
-    """Lê o histórico e o transforma em um DataFrame para treinamento."""
-    conn = sqlite3.connect(DB_NAME)
-    # Usamos o pandas para ler o SQL diretamente para um DataFrame, o que é muito prático
-    # Pegamos apenas as tentativas do tutor inteligente que têm um resultado claro
-    query = """
-        SELECT h.dificuldade, u.nivel_habilidade, h.resultado_final
-        FROM historico h
-        JOIN usuarios u ON h.usuario_id = u.id
-        WHERE h.operacao = 'Tutor Inteligente' 
-        AND h.resultado_final IN ('Correto', 'Incorreto')
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from . import database
+from .model_service import FEATURES, MODEL_PATH
+
+CHUNK_SIZE = 5000
+# Linhas mínimas para criar o primeiro modelo
+MIN_LINHAS = 20
+CLASSES = np.array([0, 1])
+
+# Tentativas do tutor inteligente com resultado claro; desistir conta como erro
+QUERY_TREINO = """
+    SELECT h.id, h.dificuldade, u.nivel_habilidade, h.resultado_final
+    FROM historico h
+    JOIN usuarios u ON h.usuario_id = u.id
+    WHERE h.id > ? AND h.operacao = 'Tutor Inteligente'
+    AND h.resultado_final IN ('Correto', 'Incorreto', 'Desistiu')
+    ORDER BY h.id
+"""
+
+
+def novo_modelo():
+    # Regularização e passo que chegam perto da LogisticRegression com poucas
+    # linhas e mantêm estáveis os passos incrementais
+    return make_pipeline(StandardScaler(), SGDClassifier(
+        loss='log_loss', alpha=1e-3, learning_rate='adaptive', eta0=0.1, tol=1e-4, random_state=42))
+
+
+def carregar_modelo(path=MODEL_PATH):
+    """Modelo incremental salvo, ou None se não houver (ou se não for incremental)."""
+    if not os.path.exists(path):
+        return None
+    modelo = joblib.load(path)
+    if not hasattr(modelo, 'historico_watermark_'):
+        return None
+    return modelo
+
+
+def ler_blocos(conn, watermark, chunk_size=CHUNK_SIZE):
+    """Gera (ids, X, y) com as linhas de histórico posteriores a `watermark`."""
+    cursor = conn.execute(QUERY_TREINO, (watermark,))
+    while True:
+        linhas = cursor.fetchmany(chunk_size)
+        if not linhas:
+            return
+        ids, difs, skills, resultados = zip(*linhas)
+        X = pd.DataFrame({FEATURES[0]: difs, FEATURES[1]: skills})
+        y = np.fromiter((r == 'Correto' for r in resultados), dtype=np.int64, count=len(linhas))
+        yield ids, X, y
+
+
+def ajustar_bloco(modelo, X, y):
+    """Um passo (uma época) de partial_fit no pipeline; só para atualizar um modelo já ajustado."""
+    scaler, clf = modelo.steps[0][1], modelo.steps[-1][1]
+    scaler.partial_fit(X)
+    clf.partial_fit(scaler.transform(X), y, classes=CLASSES)
+
+
+def salvar_atomico(modelo, path=MODEL_PATH):
+    """Grava num temporário da mesma pasta e troca de uma vez: quem lê nunca vê meio arquivo."""
+    pasta = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.modelo_', suffix='.tmp', dir=pasta)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            joblib.dump(modelo, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def treinar(model_path=MODEL_PATH, chunk_size=CHUNK_SIZE, completo=False, db_path=None):
+    """
+    Atualiza o modelo com o histórico novo (ou todo, se `completo`) e retorna as
+    estatísticas da execução.
     """
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-
-    if df.empty:
-        return None, None
-
-    # Engenharia de Features: transformar dados em números
-    # Nossa variável alvo (y) é se o aluno acertou ou não
-    df['acertou'] = df['resultado_final'].apply(lambda x: 1 if x == 'Correto' else 0)
-    
-    # Nossas features (X) são as características que usamos para prever
-    # Por enquanto, usaremos a dificuldade da questão e o nível do usuário
-    features = df[['dificuldade', 'nivel_habilidade']]
-    target = df['acertou']
-    
-    return features, target
-
-print("Iniciando o processo de treinamento do modelo...")
-
-# 1. Preparar os dados
-X, y = preparar_dados_treinamento()
-
-if X is None or y is None or len(X) < 20:
-    print("Dados insuficientes para o treinamento. Use mais o tutor para gerar dados.")
-else:
-    # 2. Dividir os dados em conjuntos de treino e teste
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42)
-
-    # 3. Escolher e treinar o modelo
-    # Regressão Logística é um ótimo ponto de partida: simples, rápido e interpretável
-    model = LogisticRegression()
-    model.fit(X_train, y_train)
-
-    # 4. Avaliar o modelo
-    y_pred = model.predict(X_test)
-    acc = accuracy_score(y_test, y_pred)
-    print(f"Modelo treinado! Acurácia no conjunto de teste: {acc:.2f}")
-
-    # 5. Salvar o modelo treinado para ser usado pelo tutor
-    joblib.dump(model, 'modelo_tutor.pkl')
-    print("Modelo salvo como 'modelo_tutor.pkl'. O tutor agora pode usá-lo.")
\ No newline at end of file
+    inicio = time.perf_counter()
+    modelo = None if completo else carregar_modelo(model_path)
+    watermark_inicial = 0 if modelo is None else modelo.historico_watermark_
+    stats = {"linhas": 0, "blocos": 0, "watermark_inicial": watermark_inicial,
+             "watermark_final": watermark_inicial, "modelo_novo": modelo is None, "salvo": False}
+
+    conn = database.abrir_conexao(db_path)
+    try:
+        database.aplicar_migracoes(conn)
+        # Primeiro modelo: só com linhas suficientes, senão a execução não muda nada
+        if modelo is None:
+            total = conn.execute(f"SELECT COUNT(*) FROM ({QUERY_TREINO})", (0,)).fetchone()[0]
+            if total < MIN_LINHAS:
+                stats["motivo"] = f"dados insuficientes ({total} < {MIN_LINHAS} linhas)"
+        if "motivo" not in stats and modelo is None:
+            # Modelo novo: fit completo (várias épocas até convergir) com todo o histórico
+            blocos = list(ler_blocos(conn, 0, chunk_size))
+            X = pd.concat([b[1] for b in blocos], ignore_index=True)
+            y = np.concatenate([b[2] for b in blocos])
+            if len(np.unique(y)) < 2:
+                stats["motivo"] = "o histórico só tem acertos ou só erros"
+            else:
+                candidato = novo_modelo().fit(X, y)
+                stats["linhas"], stats["blocos"] = len(y), len(blocos)
+                stats["watermark_final"] = blocos[-1][0][-1]
+        elif "motivo" not in stats:
+            candidato = modelo
+            for ids, X, y in ler_blocos(conn, watermark_inicial, chunk_size):
+                ajustar_bloco(candidato, X, y)
+                stats["linhas"] += len(ids)
+                stats["blocos"] += 1
+                stats["watermark_final"] = ids[-1]
+        if "motivo" not in stats and stats["linhas"]:
+            candidato.historico_watermark_ = stats["watermark_final"]
+            salvar_atomico(candidato, model_path)
+            stats["salvo"] = True
+
+        stats["segundos"] = time.perf_counter() - inicio
+        with database.transacao(conn):
+            conn.execute(
+                "INSERT INTO treinamentos_modelo (data, watermark_inicial, watermark_final, linhas, blocos, segundos, modelo_novo)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), stats["watermark_inicial"], stats["watermark_final"],
+                 stats["linhas"], stats["blocos"], stats["segundos"], int(stats["modelo_novo"])))
+    finally:
+        conn.close()
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Treina (ou atualiza) o modelo do tutor com o histórico novo.")
+    ap.add_argument("--completo", action="store_true", help="ignora o modelo atual e treina do zero")
+    ap.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="linhas por bloco")
+    args = ap.parse_args()
+
+    print("Iniciando o processo de treinamento do modelo...")
+    stats = treinar(chunk_size=args.chunk, completo=args.completo)
+    if "motivo" in stats:
+        print(f"Nada a fazer: {stats['motivo']}. Use mais o tutor para gerar dados.")
+    elif not stats["salvo"]:
+        print(f"Nenhuma linha nova desde o histórico {stats['watermark_inicial']}.")
+    else:
+        acao = "criado" if stats["modelo_novo"] else "atualizado"
+        print(f"Modelo {acao} com {stats['linhas']} linha(s) em {stats['blocos']} bloco(s) "
+              f"(histórico {stats['watermark_inicial']} → {stats['watermark_final']}) "
+              f"em {stats['segundos']:.2f}s. Salvo em '{MODEL_PATH}'.")
+
+
+if __name__ == '__main__':
+    main()
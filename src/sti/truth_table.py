@@ -1,67 +1,170 @@
-import itertools
-from sympy import true
+import csv
+import json
+import struct
+import sys
+
 from sympy.logic.boolalg import Equivalent
 
 from .formatter import format_expr
+from .bitparallel import get_variables, evaluate_mask, full_mask, row_values, choose_backend
+
+# Formato binário: cabeçalho fixo + JSON com os nomes + uma coluna de bits por saída
+BINARY_MAGIC = b'STTB'
+BINARY_VERSION = 1
+_BINARY_STRUCT = struct.Struct('<4sBBHI')  # magic, versão, nº variáveis, nº saídas, tamanho do JSON
 
 def _get_all_variables(*expressions):
-    variables_set = set()
-    for expr in expressions:
-        variables_set.update(expr.free_symbols)
-    return sorted(list(variables_set), key=str)
+    return get_variables(*expressions)
 
 def _format_value(val):
     return 'V' if val else 'F'
 
+def _build_header(expressions, variables):
+    header = [str(v) for v in variables]
+    header.extend(format_expr(e) for e in expressions)
+
+    if len(expressions) == 2:
+        expr1, expr2 = expressions
+        equiv_str = f"({format_expr(expr1)} ↔ {format_expr(expr2)})"
+        header.append(equiv_str)
+    return header
+
 
-def create_trutable(*expressions):
+def create_trutable(*expressions, backend='auto', page_size=None):
     if not expressions:
         print("Nenhuma expressão fornecida para criar a tabela-verdade.")
         return
 
     print("\nGerando Tabela-Verdade...")
+    print_truth_table(*expressions, backend=backend, page_size=page_size)
 
+
+def iter_truth_table(*expressions, backend='auto'):
+    """
+    Gera a tabela linha a linha (V antes de F), sem montá-la em memória.
+    Cada linha é a lista de bools: valores das variáveis seguidos dos resultados
+    (e da coluna de equivalência, quando há duas expressões).
+    """
     variables = _get_all_variables(*expressions)
-    
-    header = [str(v) for v in variables]
-    header.extend(format_expr(e) for e in expressions)
+    for combo, bool_results in _iter_truth_values(expressions, variables, backend):
+        yield list(combo) + list(bool_results)
+
+def _iter_truth_values(expressions, variables, backend='auto'):
+    """
+    Gera (valores das variáveis, resultados) na ordem da tabela (V antes de F).
+    Com duas expressões, o último resultado é a coluna de equivalência.
+    """
+    n_vars = len(variables)
+    n_rows = 1 << n_vars
+
+    if choose_backend(n_vars, backend) == 'numpy':
+        from .numpy_backend import iter_truth_rows
+        for index, outputs in iter_truth_rows(_output_exprs(expressions), variables, workers=None):
+            yield row_values(index, n_vars), outputs
+        return
+
+    # Cada expressão vira uma máscara de 2^n bits numa única avaliação
+    masks = _output_masks(expressions, variables)
+
+    # Mesma ordem de antes (V antes de F): a linha `r` é o minterm 2^n - 1 - r,
+    # que é justamente o caractere `r` da máscara escrita em binário.
+    columns = [format(m, f'0{n_rows}b') for m in masks]
+    for r in range(n_rows):
+        yield row_values(n_rows - 1 - r, n_vars), [col[r] == '1' for col in columns]
+
+def _output_exprs(expressions):
+    exprs = list(expressions)
+    if len(exprs) == 2:
+        exprs.append(Equivalent(*exprs))
+    return exprs
 
-    equivalence_expr = None
+def _output_masks(expressions, variables):
+    masks = [evaluate_mask(e, variables) for e in expressions]
     if len(expressions) == 2:
-        expr1, expr2 = expressions
-        equivalence_expr = Equivalent(expr1, expr2)
-        equiv_str = f"({format_expr(expr1)} ↔ {format_expr(expr2)})"
-        header.append(equiv_str)
+        masks.append(full_mask(len(variables)) ^ masks[0] ^ masks[1])
+    return masks
 
-    matrix = [header]
 
-    n_vars = len(variables)
-    combinations = itertools.product([True, False], repeat=n_vars)
-
-    for combo in combinations:
-        context = dict(zip(variables, combo))
-        
-        bool_results = [expr.subs(context) is true for expr in expressions]
-        
-        formatted_row = list(map(_format_value, combo)) + list(map(_format_value, bool_results))
-        
-        if equivalence_expr:
-            res_equiv = equivalence_expr.subs(context) is true
-            formatted_row.append(_format_value(res_equiv))
-        
-        matrix.append(formatted_row)
-
-    _print_matrix_formatted(matrix)
-
-def _print_matrix_formatted(matrix):
-    if not matrix:
-        return
-    col_widths = [max(len(str(item)) for item in col) for col in zip(*matrix)]
-    header = matrix[0]
+def truth_table_masks(*expressions):
+    """
+    Retorna (variáveis, cabeçalho, máscaras): uma máscara por coluna de saída
+    (bit i = minterm i), incluindo a de equivalência quando há duas expressões.
+    """
+    variables = _get_all_variables(*expressions)
+    return variables, _build_header(expressions, variables), _output_masks(expressions, variables)
+
+
+# --- SAÍDAS (TERMINAL, CSV E BINÁRIO) ---
+
+def print_truth_table(*expressions, backend='auto', page_size=None, out=None):
+    """
+    Imprime a tabela conforme as linhas são geradas. As larguras vêm só do
+    cabeçalho (os valores têm um caractere). Com `page_size`, pausa a cada página
+    e permite parar digitando 'q'.
+    """
+    out = out or sys.stdout
+    variables = _get_all_variables(*expressions)
+    header = _build_header(expressions, variables)
+    col_widths = [max(len(h), 1) for h in header]
+
     header_line = " | ".join(header[i].center(col_widths[i]) for i in range(len(header)))
-    print(header_line)
+    print(header_line, file=out)
     separator_line = "-+-".join('-' * width for width in col_widths)
-    print(separator_line)
-    for row in matrix[1:]:
-        data_line = " | ".join(str(row[i]).center(col_widths[i]) for i in range(len(row)))
-        print(data_line)
\ No newline at end of file
+    print(separator_line, file=out)
+
+    for count, row in enumerate(iter_truth_table(*expressions, backend=backend), start=1):
+        data_line = " | ".join(_format_value(row[i]).center(col_widths[i]) for i in range(len(row)))
+        print(data_line, file=out)
+        if page_size and count % page_size == 0 and count < (1 << len(variables)):
+            if input("-- Enter para continuar, 'q' para parar --").strip().lower() == 'q':
+                break
+
+def write_truth_table_csv(path, *expressions, backend='auto'):
+    """Grava a tabela em CSV (V/F) linha a linha e retorna o número de linhas."""
+    variables = _get_all_variables(*expressions)
+    n_rows = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(_build_header(expressions, variables))
+        for row in iter_truth_table(*expressions, backend=backend):
+            writer.writerow([_format_value(v) for v in row])
+            n_rows += 1
+    return n_rows
+
+def write_truth_table_binary(path, *expressions, backend='auto'):
+    """
+    Grava a tabela num formato binário compacto: as colunas das variáveis não são
+    guardadas (saem do índice da linha) e cada saída ocupa 2^n bits, com o bit i
+    sendo o minterm i. Com o backend NumPy, cada coluna é escrita em blocos.
+    """
+    variables = _get_all_variables(*expressions)
+    n_vars = len(variables)
+    names = _build_header(expressions, variables)
+    exprs = _output_exprs(expressions)
+    meta = json.dumps({"variables": names[:n_vars], "columns": names[n_vars:]},
+                      ensure_ascii=False).encode('utf-8')
+    n_bytes = ((1 << n_vars) + 7) // 8
+
+    with open(path, 'wb') as f:
+        f.write(_BINARY_STRUCT.pack(BINARY_MAGIC, BINARY_VERSION, n_vars, len(exprs), len(meta)))
+        f.write(meta)
+        if choose_backend(n_vars, backend) == 'numpy':
+            from .numpy_backend import iter_packed_bytes
+            for e in exprs:
+                for chunk in iter_packed_bytes(e, variables, workers=None):
+                    f.write(chunk)
+        else:
+            for m in _output_masks(expressions, variables):
+                f.write(m.to_bytes(n_bytes, 'little'))
+    return 1 << n_vars
+
+def read_truth_table_binary(path):
+    """Lê um arquivo de `write_truth_table_binary` e retorna (metadados, máscaras das saídas)."""
+    with open(path, 'rb') as f:
+        magic, version, n_vars, n_outputs, meta_len = _BINARY_STRUCT.unpack(f.read(_BINARY_STRUCT.size))
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError("Arquivo não é uma tabela-verdade binária do STI.")
+        meta = json.loads(f.read(meta_len).decode('utf-8'))
+        n_bytes = ((1 << n_vars) + 7) // 8
+        masks = [int.from_bytes(f.read(n_bytes), 'little') for _ in range(n_outputs)]
+    return meta, masks
@@ -1,17 +1,19 @@
-import sqlite3
-import joblib
-import pandas as pd 
-import numpy as np
-import os
-
-from sympy import And, Not, Or, factor, sympify # Adicione 'factor para transformar SOP -> factor' 
+import random
+import threading
 
 from . import database
-from .parser import parse_raw
-from .formatter import format_expr
-from .simplifier import simplify, term_to_expr
-from .counterexample import find_counterexample
-from .truth_table import create_trutable
+from .model_service import MODELO
+
+# sympy e o motor de simplificação (que o importa) só são carregados no primeiro
+# uso, para o menu aparecer logo; pandas/joblib só se existir o modelo treinado.
+# `_precarregar_motor` os importa em segundo plano enquanto o usuário digita.
+
+# Equivalência via BDD canônico: o gerenciador compartilhado reaproveita os nós
+# entre os passos do aluno, em vez de reenumerar as atribuições a cada passo
+BACKEND_EQUIVALENCIA = 'bdd'
+
+# Tabelas-verdade maiores que isso são exibidas página por página no terminal
+TABELA_LINHAS_POR_PAGINA = 64
 
 QUESTOES_CALIBRACAO = [
     {"expressao": "A + A", "solucao": "A", "lei": "Idempotência"},
@@ -21,69 +23,76 @@ QUESTOES_CALIBRACAO = [
     {"expressao": "~~A", "solucao": "A", "lei": "Dupla Negação"}
 ]
 
+# Questões do banco que o usuário ainda não fez no tutor (anti-join pelo índice
+# idx_historico_usuario_op_questao)
+SQL_QUESTOES_PENDENTES = """
+    FROM banco_de_questoes q
+    WHERE NOT EXISTS (
+        SELECT 1 FROM historico h
+        WHERE h.usuario_id = ? AND h.operacao = 'Tutor Inteligente' AND h.questao_id = q.id
+    )
+"""
+SQL_CAMPOS_QUESTAO = "q.id, q.expressao, q.solucao_simplificada AS solucao, q.dificuldade, q.lei_principal AS lei"
+
+def _sortear_questao(cursor, filtro, params):
+    """
+    Sorteia uma questão pendente que satisfaz `filtro`: conta as candidatas e
+    lê só a da posição sorteada (OFFSET), sem ordenar o banco por RANDOM().
+    """
+    cursor.execute(f"SELECT COUNT(*) {SQL_QUESTOES_PENDENTES} {filtro}", params)
+    total = cursor.fetchone()[0]
+    if total == 0:
+        return None
+    cursor.execute(f"SELECT {SQL_CAMPOS_QUESTAO} {SQL_QUESTOES_PENDENTES} {filtro} ORDER BY q.id LIMIT 1 OFFSET ?",
+                   params + (random.randrange(total),))
+    return cursor.fetchone()
+
 def select_ideal_question_algoritmica(usuario_id, nivel_habilidade):
     """Seleciona uma questão com base em regras e dificuldade."""
-    conn = sqlite3.connect(database.DB_NAME)
-    cursor = conn.cursor()
-    
     min_diff = int(nivel_habilidade - 1)
     max_diff = int(nivel_habilidade + 2)
 
-    query = """
-        SELECT id, expressao, solucao_simplificada, dificuldade, lei_principal FROM banco_de_questoes
-        WHERE dificuldade BETWEEN ? AND ?
-        AND expressao NOT IN (SELECT expressao_inicial FROM historico WHERE usuario_id = ? AND operacao = 'Tutor Inteligente')
-        ORDER BY RANDOM() LIMIT 1
-    """
-    cursor.execute(query, (min_diff, max_diff, usuario_id))
-    questao = cursor.fetchone()
-    
-    if not questao: # Fallback se não achar na faixa ideal
-        query_fallback = """
-            SELECT id, expressao, solucao_simplificada, dificuldade, lei_principal FROM banco_de_questoes
-            WHERE expressao NOT IN (SELECT expressao_inicial FROM historico WHERE usuario_id = ? AND operacao = 'Tutor Inteligente')
-            ORDER BY RANDOM() LIMIT 1
-        """
-        cursor.execute(query_fallback, (usuario_id,))
-        questao = cursor.fetchone()
-
-    conn.close()
+    # Contagem e leitura na mesma transação, para a posição sorteada continuar válida
+    with database.transacao(modo='DEFERRED') as conn:
+        cursor = conn.cursor()
+        questao = _sortear_questao(cursor, "AND q.dificuldade BETWEEN ? AND ?", (usuario_id, min_diff, max_diff))
+        if not questao: # Fallback se não achar na faixa ideal
+            questao = _sortear_questao(cursor, "", (usuario_id,))
+
     return {"id": questao[0], "expressao": questao[1], "solucao": questao[2], "dificuldade": questao[3], "lei": questao[4]} if questao else None
 
 def select_ideal_question_ml(usuario_id, nivel_habilidade):
     """Seleciona uma questão usando um modelo de ML treinado."""
-    model = joblib.load('modelo_tutor.pkl')
-    
-    conn = sqlite3.connect(database.DB_NAME)
-    query = """
-        SELECT id, expressao, solucao_simplificada, dificuldade, lei_principal FROM banco_de_questoes
-        WHERE expressao NOT IN (SELECT expressao_inicial FROM historico WHERE usuario_id = ? AND operacao = 'Tutor Inteligente')
-    """
-    df_candidatas = pd.read_sql_query(query, conn, params=(usuario_id,))
-    conn.close()
-
-    if df_candidatas.empty:
-        return None
-
-    df_candidatas['nivel_habilidade'] = nivel_habilidade
-    X_prever = df_candidatas[['dificuldade', 'nivel_habilidade']]
-    probabilidades_acerto = model.predict_proba(X_prever)[:, 1]
-    df_candidatas['prob_acerto'] = probabilidades_acerto
-    
-    # Busca questões na "zona ideal" de aprendizado (60% a 80% de chance de acerto)
-    df_ideais = df_candidatas[(df_candidatas['prob_acerto'] >= 0.60) & (df_candidatas['prob_acerto'] <= 0.80)]
-    
-    if not df_ideais.empty:
-        # Pega uma questão aleatória da faixa ideal
-        return df_ideais.sample(n=1).to_dict('records')[0]
-    else:
-        # Fallback: se nenhuma estiver na faixa ideal, pega a mais próxima de 70%
-        df_candidatas['dist_do_ideal'] = abs(df_candidatas['prob_acerto'] - 0.70)
-        return df_candidatas.sort_values('dist_do_ideal').iloc[0].to_dict()
+    with database.transacao(modo='DEFERRED') as conn:
+        cursor = conn.cursor()
+        # Questões da mesma dificuldade têm a mesma probabilidade: basta contar por dificuldade
+        cursor.execute(f"SELECT q.dificuldade, COUNT(*) {SQL_QUESTOES_PENDENTES} GROUP BY q.dificuldade", (usuario_id,))
+        contagem = dict(cursor.fetchall())
+        if not contagem:
+            return None
+        prob = MODELO.probabilidades(nivel_habilidade, max(contagem))
+        if prob is None:
+            return None
+
+        # Busca questões na "zona ideal" de aprendizado (60% a 80% de chance de acerto)
+        ideais = [d for d in contagem if 0.60 <= prob[d] <= 0.80]
+        if not ideais:
+            # Fallback: se nenhuma estiver na faixa ideal, pega a dificuldade mais próxima de 70%
+            ideais = [min(contagem, key=lambda d: abs(prob[d] - 0.70))]
+
+        # Sorteio uniforme entre as questões das dificuldades escolhidas
+        marcadores = ", ".join("?" * len(ideais))
+        questao = _sortear_questao(cursor, f"AND q.dificuldade IN ({marcadores})", (usuario_id, *ideais))
+
+    return {"id": questao[0], "expressao": questao[1], "solucao": questao[2], "dificuldade": questao[3],
+            "lei": questao[4], "prob_acerto": float(prob[questao[3]])}
 
 
 def run_calibration_quiz(usuario_id, nome_usuario):
     """Apresenta 5 questões iniciais para um novo usuário."""
+    from .parser import parse_raw
+    from .counterexample import find_counterexample
+
     print(f"\nOlá, {nome_usuario}! Bem-vindo ao Tutor de Álgebra Booleana.")
     print("Para começar, vamos resolver 5 questões rápidas para conhecermos seu nível.")
     
@@ -98,7 +107,7 @@ def run_calibration_quiz(usuario_id, nome_usuario):
             expr_gabarito = parse_raw(q['solucao'])
             
             # Compara a resposta do aluno com a solução correta
-            if find_counterexample(expr_aluno, expr_gabarito) is None:
+            if find_counterexample(expr_aluno, expr_gabarito, backend=BACKEND_EQUIVALENCIA) is None:
                 print("✓ Correto!")
                 acertos += 1
                 resultado = "Correto"
@@ -139,6 +148,10 @@ def print_didactic_simplification(result):
     Imprime o passo a passo da simplificação de forma didática e correta,
     usando um log de combinações do motor de simplificação.
     """
+    from sympy import Or, factor
+    from .formatter import format_expr
+    from .simplifier import term_to_expr
+
     regras_aplicadas = []
     
     # Lida com casos triviais como A+~A que já vêm simplificados
@@ -154,6 +167,9 @@ def print_didactic_simplification(result):
     print("\n--- Passo a Passo da Simplificação ---")
     print(f"Expressão Inicial: {format_expr(initial_expr)}\n")
 
+    if result.get('method') in ('heuristic', 'consensus'):
+        return _print_heuristic_simplification(result, regras_aplicadas)
+
     # --- PASSO 1: EXPANSÃO CANÔNICA ---
     minterm_exprs = [minterm_to_expr(variables, mt) for mt in minterms_nums]
     current_terms_set = set(minterm_exprs)
@@ -192,6 +208,8 @@ def print_didactic_simplification(result):
     regras_aplicadas.append("Montagem Final (Absorção)")
     print("Combinamos os termos restantes. Termos redundantes (cobertos por outros) são absorvidos implicitamente pelo algoritmo.")
     print(f"Expressão Final (Soma de Produtos): {format_expr(final_sop)}\n")
+    if not result.get('exact', True):
+        print("Atenção: a busca da cobertura mínima parou pelo limite de tempo; o resultado pode não ser mínimo.\n")
     
     # --- PASSO 4: FATORAÇÃO OPCIONAL ---
     print("--- Passo 4 (Opcional): Fatoração Adicional ---")
@@ -205,43 +223,163 @@ def print_didactic_simplification(result):
         
     return regras_aplicadas
 
+def _print_heuristic_simplification(result, regras_aplicadas):
+    """Passos resumidos para funções grandes (métodos heurístico e de consenso)."""
+    from .formatter import format_expr
+
+    if result['method'] == 'consensus':
+        stats = result['consensus_stats']
+        print("--- Passo 1: Soma de Produtos ---")
+        regras_aplicadas.append("Leis de De Morgan e Distributividade")
+        print(f"A expressão foi escrita como soma de {stats['input_cubes']} produtos, sem expandir minterms.\n")
+
+        print("--- Passo 2: Consenso Iterado ---")
+        regras_aplicadas.append("Teorema do Consenso")
+        print("Aplicamos o consenso entre os produtos e absorvemos os termos contidos em outros,")
+        print(f"obtendo {stats['primes']} implicantes primos ({stats['essentials']} essenciais).\n")
+    else:
+        print("--- Passo 1: Expansão para a Forma Canônica ---")
+        regras_aplicadas.append("Expansão Canônica")
+        print(f"A expressão tem {len(result['minterms'])} minterms sobre {len(result['variables'])} variáveis "
+              "(a listagem completa é omitida).\n")
+
+        print("--- Passo 2: Simplificação Heurística (Espresso) ---")
+        regras_aplicadas.append("Lei da Adjacência")
+        print("Os minterms foram agrupados repetindo: expandir cada termo ao máximo,")
+        print("remover os termos redundantes e reduzir os termos para tentar um novo agrupamento.\n")
+
+    print("--- Passo 3: Montagem Final e Absorção ---")
+    regras_aplicadas.append("Montagem Final (Absorção)")
+    print(f"Expressão Final (Soma de Produtos): {format_expr(result['final_sop'])}")
+    if not result['exact']:
+        print("Atenção: resultado heurístico, sem garantia de ser a forma mínima.")
+    print()
+    return regras_aplicadas
+
+LEIS_DIDATICAS = {
+    "Idempotência":    "A + A = A ou A * A = A. Unir o mesmo termo não muda o resultado.",
+    "Complemento":     "A + ~A = 1 e A * ~A = 0. Um termo e seu complemento anulam ou totalizam.",
+    "Absorção":        "A + A*B = A. O termo principal absorve o termo composto.",
+    "Adjacência":      "A*B + A*~B = A. Combina termos com a mesma variável principal.",
+    "Dupla Negação":   "~~A = A. Duas negações cancelam.",
+    "Aniquilação":     "A * 0 = 0 e A + 1 = 1. O neutro destrói o termo.",
+    "Identidade":      "A * 1 = A e A + 0 = A. O neutro mantém o termo.",
+    "De Morgan":       "~(A * B) = ~A + ~B e ~(A + B) = ~A * ~B. Distribui a negação trocando operações.",
+    "Distributiva":    "A*(B+C) = A*B + A*C. Distribui multiplicação sobre soma.",
+    "Consenso":        "A*B + ~A*C + B*C = A*B + ~A*C. Remove termos redundantes.",
+    "Absorção Mista":  "A + (¬A·B) = (A+¬A)·(A+B) → 1·(A+B) → A+B."
+}
+
+SINONIMOS_TRUE  = {'true', '1'}
+SINONIMOS_FALSE = {'false', '0'}
+
+def escolher_questao(usuario_id, nivel_habilidade):
+    """Próxima questão do tutor: a recomendação pré-calculada ou, sem ela, a seleção na hora."""
+    from .recommendations import proxima_questao
+
+    questao = proxima_questao(usuario_id)
+    if questao is None and MODELO.disponivel():
+        questao = select_ideal_question_ml(usuario_id, nivel_habilidade)
+    elif questao is None:
+        questao = select_ideal_question_algoritmica(usuario_id, nivel_habilidade)
+    return questao
+
+def buscar_questao(questao_id):
+    """Questão do banco pelo id, no mesmo formato da seleção, ou None."""
+    linha = database.get_connection().execute(
+        f"SELECT {SQL_CAMPOS_QUESTAO} FROM banco_de_questoes q WHERE q.id = ?", (questao_id,)).fetchone()
+    if linha is None:
+        return None
+    return {"id": linha[0], "expressao": linha[1], "solucao": linha[2], "dificuldade": linha[3], "lei": linha[4]}
+
+def dicas_da_lei(lei):
+    """Pares (lei, explicação) para cada lei da questão ('Absorção/Consenso' vira duas)."""
+    return [(sublei.strip(), LEIS_DIDATICAS.get(sublei.strip(), "(sem explicação)")) for sublei in lei.split("/")]
+
+def e_forma_minima(expr_fmt, solucao_fmt):
+    """Compara a expressão formatada com a solução formatada, aceitando 1/0 para true/false."""
+    fmt_lower = expr_fmt.lower()
+    solucao_lower = solucao_fmt.lower()
+    return (
+        fmt_lower == solucao_lower or
+        (solucao_lower == 'true'  and fmt_lower in SINONIMOS_TRUE) or
+        (solucao_lower == 'false' and fmt_lower in SINONIMOS_FALSE)
+    )
+
+def registrar_resultado(usuario_id, questao, resultado, passos, solucao_usuario):
+    """
+    Grava o fim de uma questão do tutor (habilidade + histórico), atualiza as
+    recomendações e retorna o novo nível de habilidade.
+    """
+    from .recommendations import atualizar_usuario
+
+    acertou = resultado == "Correto"
+    # Habilidade e histórico são gravados juntos (ou nenhum dos dois)
+    with database.lote():
+        novo_skill = database.update_user_skill(usuario_id, acertou, questao['dificuldade'])
+        database.salvar_interacao(
+            usuario_id, "Tutor Inteligente", questao['expressao'],
+            resultado, questao['dificuldade'], len(passos),
+            {"passos": passos, "solucao_usuario": solucao_usuario, "acertou": acertou},
+            questao_id=int(questao['id'])
+        )
+    atualizar_usuario(usuario_id, respondida=int(questao['id']))
+    return novo_skill
+
+def avaliar_passo(usuario_id, questao, expr_str, passos, tentativa):
+    """
+    Avalia uma entrada do aluno (um passo, 'fim' ou 'desisto') a partir da
+    expressão atual `expr_str`, gravando o resultado quando a questão termina.
+    Retorna um dict com o 'estado' ('desistiu', 'correto', 'incompleto',
+    'valido', 'invalido' ou 'erro_sintaxe'), a expressão atual e os passos;
+    quando a questão termina, também o novo 'nivel_habilidade'.
+    """
+    from .parser import parse_raw
+    from .formatter import format_expr
+    from .counterexample import find_counterexample
+
+    solucao_str = format_expr(parse_raw(questao['solucao']))
+    tentativa = tentativa.strip()
+    res = {"atual": expr_str, "passos": list(passos)}
+
+    # desistir
+    if tentativa.lower() == 'desisto':
+        nivel = registrar_resultado(usuario_id, questao, "Desistiu", passos, expr_str)
+        return dict(res, estado="desistiu", solucao=solucao_str, nivel_habilidade=nivel)
+
+    # finalizar
+    if tentativa.lower() == 'fim':
+        if e_forma_minima(format_expr(parse_raw(expr_str)), solucao_str):
+            nivel = registrar_resultado(usuario_id, questao, "Correto", passos, expr_str)
+            return dict(res, estado="correto", nivel_habilidade=nivel)
+        return dict(res, estado="incompleto", dicas=dicas_da_lei(questao['lei']))
+
+    # passo intermediário
+    try:
+        passo_expr = parse_raw(tentativa)
+        if find_counterexample(parse_raw(expr_str), passo_expr, backend=BACKEND_EQUIVALENCIA) is not None:
+            return dict(res, estado="invalido", dicas=dicas_da_lei(questao['lei']))
+    except Exception:
+        return dict(res, estado="erro_sintaxe")
+    fmt = format_expr(passo_expr)
+    return {"estado": "valido", "atual": tentativa, "passos": res["passos"] + [tentativa],
+            "forma": fmt, "minima": e_forma_minima(fmt, solucao_str)}
+
 def run_interactive_tutor(usuario_id):
+    # A seleção exclui as questões já feitas: o histórico pendente precisa estar no banco
+    database.aguardar_escritas()
     nivel_habilidade_atual = database.get_user_skill(usuario_id)
     print(f"\nBuscando uma questão ideal para seu nível de habilidade ({nivel_habilidade_atual:.2f})...")
 
-    MODEL_PATH = 'modelo_tutor.pkl'
-    if os.path.exists(MODEL_PATH):
-        questao = select_ideal_question_ml(usuario_id, nivel_habilidade_atual)
-    else:
-        questao = select_ideal_question_algoritmica(usuario_id, nivel_habilidade_atual)
+    questao = escolher_questao(usuario_id, nivel_habilidade_atual)
 
     if not questao:
         print("\nParabéns! Você já respondeu todas as questões disponíveis.")
         return
 
     s_inicial = questao['expressao']
-    solucao_correta = parse_raw(questao['solucao'])
-    solucao_str = format_expr(solucao_correta)     
-    solucao_lower = solucao_str.lower()
     lei = questao['lei']
 
-    LEIS_DIDATICAS = {
-        "Idempotência":    "A + A = A ou A * A = A. Unir o mesmo termo não muda o resultado.",
-        "Complemento":     "A + ~A = 1 e A * ~A = 0. Um termo e seu complemento anulam ou totalizam.",
-        "Absorção":        "A + A*B = A. O termo principal absorve o termo composto.",
-        "Adjacência":      "A*B + A*~B = A. Combina termos com a mesma variável principal.",
-        "Dupla Negação":   "~~A = A. Duas negações cancelam.",
-        "Aniquilação":     "A * 0 = 0 e A + 1 = 1. O neutro destrói o termo.",
-        "Identidade":      "A * 1 = A e A + 0 = A. O neutro mantém o termo.",
-        "De Morgan":       "~(A * B) = ~A + ~B e ~(A + B) = ~A * ~B. Distribui a negação trocando operações.",
-        "Distributiva":    "A*(B+C) = A*B + A*C. Distribui multiplicação sobre soma.",
-        "Consenso":        "A*B + ~A*C + B*C = A*B + ~A*C. Remove termos redundantes.",
-        "Absorção Mista":  "A + (¬A·B) = (A+¬A)·(A+B) → 1·(A+B) → A+B."
-    }
-
-    SINONIMOS_TRUE  = {'true', '1'}
-    SINONIMOS_FALSE = {'false', '0'}
-
     print("\n" + "-"*40)
     print(f"Questão (Dificuldade: {questao['dificuldade']}, Lei: {lei})")
     print(f"Simplifique: {s_inicial}")
@@ -250,81 +388,57 @@ def run_interactive_tutor(usuario_id):
     print("→ Se quiser desistir, digite 'desisto'.")
     print("-"*40)
 
-    expr_atual = parse_raw(s_inicial)
     expr_str   = s_inicial
     passos     = []
 
     while True:
         tentativa = input(f"Expressão Atual ({expr_str}) → Seu passo: ").strip()
+        res = avaliar_passo(usuario_id, questao, expr_str, passos, tentativa)
+        expr_str, passos = res["atual"], res["passos"]
+        estado = res["estado"]
+        if "nivel_habilidade" in res:
+            print(f"(Nível de habilidade atualizado para: {res['nivel_habilidade']:.2f})")
+
+        if estado == "desistiu":
+            print(f"\nTudo bem. A forma mínima correta é: {res['solucao']}")
+            return
 
-        # desistir
-        if tentativa.lower() == 'desisto':
-            print(f"\nTudo bem. A forma mínima correta é: {solucao_str}")
-            database.update_user_skill(usuario_id, False, questao['dificuldade'])
-            database.salvar_interacao(
-                usuario_id, "Tutor Inteligente", s_inicial,
-                "Desistiu", questao['dificuldade'], len(passos),
-                {"passos": passos, "solucao_usuario": expr_str, "acertou": False}
-            )
+        if estado == "correto":
+            print(f"\n🎉 Parabéns! Você chegou à forma mínima em {len(passos)} passo(s)!")
             return
 
-        # finalizar
-        if tentativa.lower() == 'fim':
-            fmt = format_expr(expr_atual)
-            fmt_lower = fmt.lower()
-            ok_str = (
-                fmt_lower == solucao_lower or
-                (solucao_lower == 'true'  and fmt_lower in SINONIMOS_TRUE) or
-                (solucao_lower == 'false' and fmt_lower in SINONIMOS_FALSE)
-            )
-            if ok_str:
-                print(f"\n🎉 Parabéns! Você chegou à forma mínima em {len(passos)} passo(s)!")
-                database.update_user_skill(usuario_id, True, questao['dificuldade'])
-                database.salvar_interacao(
-                    usuario_id, "Tutor Inteligente", s_inicial,
-                    "Correto", questao['dificuldade'], len(passos),
-                    {"passos": passos, "solucao_usuario": expr_str, "acertou": True}
-                )
-                return
-            else:
-                print("\n😕 Ainda não está na forma mínima esperada.")
-                print("Dica extra: use a(s) lei(s) abaixo para continuar simplificando:")
-                for sublei in lei.split("/"):
-                    explic = LEIS_DIDATICAS.get(sublei.strip(), "(sem explicação)")
-                    print(f" - {sublei.strip()}: {explic}")
-                continue
-
-        # passo intermediário
-        try:
-            passo_expr = parse_raw(tentativa)
-            if find_counterexample(expr_atual, passo_expr) is None:
-                expr_atual = passo_expr
-                expr_str   = tentativa
-                passos.append(tentativa)
-                print("✓ Passo VÁLIDO!")
-
-                # verifica se já atingiu a forma mínima
-                fmt = format_expr(expr_atual)
-                fmt_lower = fmt.lower()
-                is_minimal = (
-                    fmt_lower == solucao_lower or
-                    (solucao_lower == 'true'  and fmt_lower in SINONIMOS_TRUE) or
-                    (solucao_lower == 'false' and fmt_lower in SINONIMOS_FALSE)
-                )
-                if is_minimal:
-                    print(f"⚡ Ótimo! Essa expressão ({fmt}) já é a forma mínima esperada.")
-                    print("   Se quiser finalizar, digite 'fim'.")
-            else:
-                print("✗ Passo INVÁLIDO!")
-                print(f"Dica: esta questão usa a(s) lei(s) de {lei}.")
-                for sublei in lei.split("/"):
-                    explic = LEIS_DIDATICAS.get(sublei.strip(), "(sem explicação)")
-                    print(f" - {sublei.strip()}: {explic}")
-        except Exception:
+        if estado == "incompleto":
+            print("\n😕 Ainda não está na forma mínima esperada.")
+            print("Dica extra: use a(s) lei(s) abaixo para continuar simplificando:")
+            for sublei, explic in res["dicas"]:
+                print(f" - {sublei}: {explic}")
+
+        elif estado == "valido":
+            print("✓ Passo VÁLIDO!")
+            # verifica se já atingiu a forma mínima
+            if res["minima"]:
+                print(f"⚡ Ótimo! Essa expressão ({res['forma']}) já é a forma mínima esperada.")
+                print("   Se quiser finalizar, digite 'fim'.")
+
+        elif estado == "invalido":
+            print("✗ Passo INVÁLIDO!")
+            print(f"Dica: esta questão usa a(s) lei(s) de {lei}.")
+            for sublei, explic in res["dicas"]:
+                print(f" - {sublei}: {explic}")
+
+        else:
             print("✗ Erro de sintaxe. Verifique sua expressão.")
 
+def _precarregar_motor():
+    """Importa o motor em segundo plano; a primeira operação não espera o sympy."""
+    def carregar():
+        from . import parser, formatter, result_cache, truth_table  # noqa: F401
+    threading.Thread(target=carregar, name="precarga-motor", daemon=True).start()
+
 def run_cli():
     database.inicializar_banco()
+    database.iniciar_escrita_assincrona()
+    _precarregar_motor()
 
     print("="*40)
     print(" Tutor Interativo de Álgebra Booleana ")
@@ -333,6 +447,12 @@ def run_cli():
 
     usuario_id, is_new = database.get_or_create_user(nome)
 
+    from sympy import Or
+    from .parser import parse_raw
+    from .formatter import format_expr
+    from .truth_table import create_trutable
+    from .result_cache import simplify_cached, find_counterexample_cached
+
     if is_new:
         run_calibration_quiz(usuario_id, nome)
     else:
@@ -346,7 +466,7 @@ def run_cli():
             s = input('Digite expressão: ')
             expr = parse_raw(s)
 
-            result_data = simplify(expr)
+            result_data = simplify_cached(expr)
             regras_aplicadas = print_didactic_simplification(result_data)
 
             simp_expr = result_data['final_sop']
@@ -375,7 +495,7 @@ def run_cli():
 
             choosen = input('Deseja criar a tabela verdade? [Y/N] ')
             if(choosen.strip().upper() == 'Y'):
-                create_trutable(expr, simp_expr)
+                create_trutable(expr, simp_expr, page_size=TABELA_LINHAS_POR_PAGINA)
             pass
 
         elif op == '2':
@@ -384,12 +504,12 @@ def run_cli():
             expr1 = parse_raw(s1)
             expr2 = parse_raw(s2)
 
-            result_data1 = simplify(expr1)
-            result_data2 = simplify(expr2)
+            result_data1 = simplify_cached(expr1)
+            result_data2 = simplify_cached(expr2)
             result1_expr = result_data1['final_sop']
             result2_expr = result_data2['final_sop']
 
-            ce = find_counterexample(result1_expr, result2_expr)
+            ce = find_counterexample_cached(result1_expr, result2_expr, backend=BACKEND_EQUIVALENCIA)
             veredicto = "Equivalentes" if ce is None else "Não Equivalentes"
             
             print(f'\n✓ {veredicto}.')
@@ -425,7 +545,7 @@ def run_cli():
             
             choosen = input('\nDeseja criar a tabela verdade? [Y/N] ')
             if(choosen.strip().upper() == 'Y'):
-                create_trutable(expr1, expr2)
+                create_trutable(expr1, expr2, page_size=TABELA_LINHAS_POR_PAGINA)
             pass
         
         elif op == '3':
@@ -0,0 +1,203 @@
+# Arquivo: src/sti/write_behind.py
+# Fila de escrita em segundo plano para o histórico e a habilidade do aluno.
+#
+# Quem grava só enfileira (sql, parâmetros) e segue; uma thread escritora junta
+# o que chegou numa janela de FLUSH_INTERVAL segundos (ou até BATCH_MAX_ITEMS
+# itens) e grava tudo numa única transação. A fila é limitada: se o disco não
+# acompanhar, quem enfileira espera em vez de a memória crescer sem limite.
+# A habilidade recém-calculada fica num mapa em memória até ser gravada, para
+# que as leituras do próprio aluno já a enxerguem.
+
+import queue
+import signal
+import sys
+import threading
+import time
+
+from . import database
+
+QUEUE_MAXSIZE = 1000
+FLUSH_INTERVAL = 0.2
+BATCH_MAX_ITEMS = 200
+# Tentativas de gravar um lote (banco ocupado, disco cheio...) antes de ir item a item
+TENTATIVAS_GRAVACAO = 3
+ESPERA_TENTATIVA = 0.1
+
+# Marcadores internos da fila
+_FLUSH = object()
+_FIM = object()
+
+
+class WriteBehindQueue:
+    """
+    Escritora em segundo plano. Cada item é uma lista de comandos gravada
+    inteira no mesmo lote (assim, habilidade e histórico de um passo entram
+    juntos no banco ou não entram).
+    """
+
+    def __init__(self, db_path=None, maxsize=QUEUE_MAXSIZE, intervalo=FLUSH_INTERVAL,
+                 lote_max=BATCH_MAX_ITEMS):
+        self.db_path = db_path
+        self.intervalo = intervalo
+        self.lote_max = lote_max
+        self._fila = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._skills = {}  # usuario_id -> (seq do item, habilidade ainda não gravada)
+        self._fechada = False
+        self.lotes = 0
+        self.itens = 0
+        self.erros = 0
+        self._latencias = []
+        self._thread = threading.Thread(target=self._run, name="escrita-historico", daemon=True)
+        self._thread.start()
+
+    # --- PRODUTOR ---
+
+    def put(self, comandos, skills=None):
+        """Enfileira os comandos (sql, params); `skills` = {usuario_id: nova habilidade}."""
+        if self._fechada:
+            raise RuntimeError("Fila de escrita já fechada.")
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            for usuario_id, valor in (skills or {}).items():
+                self._skills[usuario_id] = (seq, valor)
+        self._fila.put((seq, comandos, skills or {}))
+
+    @property
+    def fechada(self):
+        return self._fechada
+
+    def skill_pendente(self, usuario_id):
+        """Habilidade enfileirada e ainda não gravada, ou None."""
+        with self._lock:
+            entry = self._skills.get(usuario_id)
+        return None if entry is None else entry[1]
+
+    def flush(self):
+        """Espera tudo o que já foi enfileirado chegar ao banco."""
+        if self._thread.is_alive():
+            self._fila.put(_FLUSH)
+            self._fila.join()
+
+    def close(self):
+        """Grava o que falta e encerra a thread escritora."""
+        if self._fechada:
+            return
+        self._fechada = True
+        if self._thread.is_alive():
+            self._fila.put(_FIM)
+            self._thread.join()
+
+    def info(self):
+        lat = self._latencias
+        return {
+            "profundidade": self._fila.qsize(),
+            "skills_pendentes": len(self._skills),
+            "lotes": self.lotes,
+            "itens": self.itens,
+            "erros": self.erros,
+            "flush_ultimo_ms": lat[-1] * 1000 if lat else 0.0,
+            "flush_medio_ms": sum(lat) / len(lat) * 1000 if lat else 0.0,
+            "flush_max_ms": max(lat) * 1000 if lat else 0.0,
+        }
+
+    # --- ESCRITORA ---
+
+    def _run(self):
+        conn = database.abrir_conexao(self.db_path)
+        try:
+            parar = False
+            while not parar:
+                item = self._fila.get()
+                tomados = 1
+                lote = []
+                # Abre a janela no primeiro item; flush e fim a fecham na hora
+                fim_janela = time.monotonic() + self.intervalo
+                while True:
+                    if item is _FIM:
+                        parar = True
+                        break
+                    if item is _FLUSH:
+                        break
+                    lote.append(item)
+                    espera = fim_janela - time.monotonic()
+                    if len(lote) >= self.lote_max or espera <= 0:
+                        break
+                    try:
+                        item = self._fila.get(timeout=espera)
+                    except queue.Empty:
+                        break
+                    tomados += 1
+                if lote:
+                    self._gravar(conn, lote)
+                for _ in range(tomados):
+                    self._fila.task_done()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _transacao(conn, itens):
+        with database.transacao(conn):
+            for _, comandos, _ in itens:
+                for sql, params in comandos:
+                    conn.execute(sql, params)
+
+    def _gravar(self, conn, lote):
+        inicio = time.perf_counter()
+        for tentativa in range(TENTATIVAS_GRAVACAO):
+            try:
+                self._transacao(conn, lote)
+                break
+            except Exception:
+                time.sleep(ESPERA_TENTATIVA * 2 ** tentativa)
+        else:
+            # O lote inteiro não entra: item a item, só o que falhar de novo se perde
+            gravados = []
+            for item in lote:
+                try:
+                    self._transacao(conn, [item])
+                    gravados.append(item)
+                except Exception as e:
+                    self.erros += 1
+                    print(f"[ERRO] Falha ao gravar um registro do histórico: {e}", file=sys.stderr)
+            lote = gravados
+        if lote:
+            self.lotes += 1
+            self.itens += len(lote)
+            self._latencias.append(time.perf_counter() - inicio)
+            del self._latencias[:-1000]
+        with self._lock:
+            # Sai do mapa só o que foi gravado e não foi sobrescrito por um item
+            # mais novo; a habilidade de um item perdido continua valendo em memória
+            for seq, _, skills in lote:
+                for usuario_id in skills:
+                    if self._skills.get(usuario_id, (None,))[0] == seq:
+                        del self._skills[usuario_id]
+
+
+def instalar_sinais(escritora, sinais=("SIGTERM", "SIGHUP")):
+    """
+    Nos sinais de término, grava a fila antes de seguir com o tratamento
+    anterior (ou sair); se o sinal era ignorado, só grava e continua. Só pode
+    ser chamada da thread principal.
+    """
+    for nome in sinais:
+        sig = getattr(signal, nome, None)
+        if sig is None:
+            continue
+        anterior = signal.getsignal(sig)
+
+        def tratar(signum, frame, anterior=anterior):
+            if anterior == signal.SIG_IGN:
+                # Sinal ignorado antes (ex.: SIGHUP sob nohup): só grava e segue
+                escritora.flush()
+                return
+            escritora.close()
+            if callable(anterior):
+                anterior(signum, frame)
+            else:
+                sys.exit(128 + signum)
+
+        signal.signal(sig, tratar)